@@ -0,0 +1 @@
+# Benchmarks do projeto (python -m benchmarks.<nome> a partir da raiz)
@@ -0,0 +1,42 @@
+"""Executa toda a suíte de benchmarks e grava um JSON por benchmark em um diretório
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks [--output-dir benchmark-results] [--quick]
+
+Para comparar dois commits: rode a suíte em cada um (com --output-dir diferentes)
+e use `python -m benchmarks.compare antes/<nome>.json depois/<nome>.json`.
+"""
+import argparse
+from pathlib import Path
+
+from . import async_load, codec, http_load, memory, microbench, write_behind
+
+# (módulo, argumentos completos, argumentos do modo --quick)
+SUITE = {
+    "microbench": (microbench, [], ["--sizes", "10", "1000", "10000", "--budget", "0.2"]),
+    "http_load": (http_load, [], ["--requests", "500"]),
+    "async_load": (async_load, [], ["--requests", "500", "--concurrency", "64"]),
+    "write_behind": (write_behind, [], ["--signups", "500"]),
+    "memory": (memory, [], ["--activities", "1000", "--cohort", "2000"]),
+    "codec": (codec, [], ["--sizes", "1000", "--budget", "0.2"]),
+}
+
+
+def main(argv: list | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output-dir", default="benchmark-results")
+    parser.add_argument("--quick", action="store_true", help="datasets e cargas menores")
+    parser.add_argument("--only", nargs="+", choices=list(SUITE), default=list(SUITE))
+    args = parser.parse_args(argv)
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for name in args.only:
+        module, full, quick = SUITE[name]
+        output = output_dir / f"{name}.json"
+        print(f"Running {name} -> {output}")
+        module.main([*(quick if args.quick else full), "--output", str(output)])
+
+
+if __name__ == "__main__":
+    main()
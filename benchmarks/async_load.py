@@ -0,0 +1,95 @@
+"""Teste de carga HTTP em processo: endpoints síncronos (threadpool) x API assíncrona
+
+Compara o caminho antigo (endpoints `def` chamando o DataManager, um arquivo
+gravado por inscrição) com os endpoints `async def` de src/app.py, que leem da
+memória e juntam as gravações na tarefa gravadora do AsyncDataManager.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.async_load [--activities 500] [--participants 20]
+                                    [--requests 2000] [--concurrency 256]
+                                    [--write-ratio 0.5] [--output out.json]
+"""
+import argparse
+import asyncio
+import random
+import tempfile
+from pathlib import Path
+
+from fastapi import FastAPI, Response
+
+from src.data_manager import DataManager
+from src.storage import JSONStorage
+
+from .common import BENCH_USERS, make_activities, patched_app, run_plan, write_results
+
+
+def build_sync_app(manager: DataManager) -> FastAPI:
+    """Os mesmos endpoints no estilo anterior: `def` executado no threadpool"""
+    app = FastAPI()
+
+    @app.get("/activities")
+    def get_activities():
+        return Response(content=manager.get_activities_payload().body, media_type="application/json")
+
+    @app.post("/activities/{activity_name}/signup")
+    def signup_for_activity(activity_name: str, name: str, email: str):
+        manager.get_user_permissions()
+        return {"status": manager.try_enroll(activity_name, name, email).status.value}
+
+    return app
+
+
+def make_plan(names: list, args: argparse.Namespace) -> list:
+    rng = random.Random(42)
+    return [
+        ("signup", "POST", f"/activities/{rng.choice(names)}/signup",
+         {"name": f"Load {i}", "email": f"load{i}@example.com"})
+        if rng.random() < args.write_ratio else ("list", "GET", "/activities", None)
+        for i in range(args.requests)
+    ]
+
+
+async def run_mode(mode: str, args: argparse.Namespace) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        storage = JSONStorage(data_dir)
+        storage.save_activities(make_activities(args.activities, args.participants))
+        storage.save_users(BENCH_USERS)
+        manager = DataManager(data_dir, storage=JSONStorage(data_dir), multiprocess=False)
+        plan = make_plan(list(manager.load_activities()), args)
+
+        if mode == "sync":
+            result = await run_plan(build_sync_app(manager), plan, args.concurrency)
+        else:
+            # Os endpoints reais, apontando para o diretório temporário
+            with patched_app(manager) as (app, store):
+                result = await run_plan(app, plan, args.concurrency)
+                await store.close()
+            result["writer"] = store.writer_stats()
+
+    return {"mode": mode, **result}
+
+
+def main(argv: list | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--activities", type=int, default=500)
+    parser.add_argument("--participants", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=256)
+    parser.add_argument("--write-ratio", type=float, default=0.5)
+    parser.add_argument("--modes", nargs="+", default=["sync", "async"])
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args(argv)
+
+    results = [asyncio.run(run_mode(mode, args)) for mode in args.modes]
+    write_results("async_load", {
+        "activities": args.activities,
+        "participants": args.participants,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "write_ratio": args.write_ratio
+    }, results, args.output)
+
+
+if __name__ == "__main__":
+    main()
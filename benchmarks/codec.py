@@ -0,0 +1,74 @@
+"""Codecs JSON (src/codec.py): carga, gravação e serialização de respostas, compacto x indentado
+
+Para cada codec instalado (orjson, msgspec, json) mede a leitura e a gravação do
+catálogo pelo JSONStorage nos formatos compacto (padrão) e indentado, o tamanho
+do arquivo e a serialização de uma página de 500 atividades: o caminho padrão do
+FastAPI (jsonable_encoder + JSONResponse) contra os bytes gerados pelo codec.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.codec [--sizes 1000 10000] [--participants 10]
+                               [--budget 0.5] [--output out.json]
+"""
+import argparse
+import tempfile
+from pathlib import Path
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from src.codec import available_codecs, get_codec
+from src.records import Activity, ActivitiesView, ParticipantStore
+from src.storage import JSONStorage
+
+from .common import make_activities, measure, write_results
+
+PAGE_SIZE = 500
+
+
+def bench_size(size: int, args: argparse.Namespace) -> dict:
+    catalog = make_activities(size, args.participants)
+    store = ParticipantStore()
+    # O DataManager grava a partir da visão dos registros, não de dicts prontos
+    view = ActivitiesView({name: Activity.from_dict(a, store) for name, a in catalog.items()}, store)
+    page = {"activities": {name: catalog[name] for name in list(catalog)[:PAGE_SIZE]}, "next_cursor": None}
+    heavy = {"budget_s": args.budget, "max_iterations": 50}
+
+    results = {"response": {"fastapi_default": measure(
+        lambda i: JSONResponse(jsonable_encoder(page)).body, args.budget
+    )}}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in available_codecs():
+            codec = get_codec(name)
+            results["response"][name] = measure(lambda i: codec.dumps(page), args.budget)
+            for pretty in (False, True):
+                storage = JSONStorage(Path(tmp) / f"{name}-{pretty}", codec=codec, pretty=pretty)
+                save = measure(lambda i: storage.save_activities(view), **heavy)
+                results[f"{name}/{'pretty' if pretty else 'compact'}"] = {
+                    "file_bytes": storage.activities_file.stat().st_size,
+                    "save": save,
+                    "load": measure(lambda i: storage.load_activities(), **heavy)
+                }
+    return results
+
+
+def main(argv: list | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--participants", type=int, default=10, help="participantes por atividade")
+    parser.add_argument("--budget", type=float, default=0.5, help="segundos por operação")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args(argv)
+
+    results = {}
+    for size in args.sizes:
+        results[str(size)] = bench_size(size, args)
+    write_results("codec", {
+        "sizes": args.sizes,
+        "participants": args.participants,
+        "budget_s": args.budget,
+        "codecs": available_codecs()
+    }, results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Utilitários compartilhados pelos benchmarks: datasets sintéticos, medição, carga HTTP e saída em JSON"""
+import asyncio
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Any, Iterator, List, Tuple
+
+BENCH_USERS = {
+    "profiles": {"coordenadora": {"permissions": ["create", "read", "update", "delete", "manage_participants"]}},
+    "users": {},
+    "current_user": {"name": "Bench", "email": "bench@example.com", "profile": "coordenadora"}
+}
+
+WEEKDAYS = ["Segundas", "Terças", "Quartas", "Quintas", "Sextas", "Sábados", "Domingos"]
+
+
+def make_activities(n_activities: int, participants_per_activity: int) -> Dict[str, Any]:
+    """Gera um catálogo sintético com participantes distintos em cada atividade"""
+    activities = {}
+    for i in range(n_activities):
+        activities[f"Mentoria {i:06d}"] = {
+            "description": f"Mentoria sintética número {i} para benchmarks.",
+            "schedule": f"{WEEKDAYS[i % 7]}-feiras, {8 + i % 12}:00 - {9 + i % 12}:30",
+            "max_participants": participants_per_activity * 2 + 10,
+            "participants": [
+                {"name": f"Participante {i}-{j}", "email": f"p{i}-{j}@example.com"}
+                for j in range(participants_per_activity)
+            ]
+        }
+    return activities
+
+
+def latency_summary(samples: List[float]) -> Dict[str, float]:
+    """Resumo de latências (em milissegundos)"""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def pct(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000
+
+    return {
+        "count": len(ordered),
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "p50_ms": pct(0.50),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+        "max_ms": ordered[-1] * 1000
+    }
+
+
+def measure(fn: Callable[[int], Any], budget_s: float = 0.5, max_iterations: int = 10000,
+            min_iterations: int = 3) -> Dict[str, float]:
+    """Chama fn(i) até esgotar o orçamento de tempo (ou max_iterations) e resume as latências"""
+    samples = []
+    deadline = time.perf_counter() + budget_s
+    i = 0
+    while i < max_iterations and (i < min_iterations or time.perf_counter() < deadline):
+        start = time.perf_counter()
+        fn(i)
+        samples.append(time.perf_counter() - start)
+        i += 1
+    return latency_summary(samples)
+
+
+@contextmanager
+def patched_app(manager) -> Iterator[Any]:
+    """Os endpoints reais de src/app.py apontando para outro DataManager (ex.: em um diretório temporário)"""
+    import src.app as app_module
+    from src.async_manager import AsyncDataManager
+
+    store = AsyncDataManager(manager)
+    saved = app_module.data_manager, app_module.store
+    app_module.data_manager, app_module.store = manager, store
+    try:
+        yield app_module.app, store
+    finally:
+        app_module.data_manager, app_module.store = saved
+
+
+async def run_plan(app, plan: List[Tuple], concurrency: int) -> Dict[str, Any]:
+    """Executa (rótulo, método, url, params[, headers]) em `concurrency` clientes simultâneos via ASGI em processo"""
+    import httpx
+
+    latencies: Dict[str, List[float]] = {}
+    statuses: Dict[str, int] = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        async def worker(worker_id: int) -> None:
+            for label, method, url, params, *headers in plan[worker_id::concurrency]:
+                start = time.perf_counter()
+                response = await client.request(method, url, params=params, headers=headers[0] if headers else None)
+                latencies.setdefault(label, []).append(time.perf_counter() - start)
+                statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "elapsed_s": elapsed,
+        "requests_per_s": len(plan) / elapsed,
+        "status_codes": statuses,
+        "latency": latency_summary([s for samples in latencies.values() for s in samples]),
+        "latency_by_request": {label: latency_summary(samples) for label, samples in latencies.items()}
+    }
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True, cwd=Path(__file__).parent
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_results(benchmark: str, params: Dict[str, Any], results: Any, output: str | None) -> None:
+    """Grava os resultados em JSON (arquivo ou stdout) para comparação entre commits"""
+    payload = {
+        "benchmark": benchmark,
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "params": params,
+        "results": results
+    }
+    text = json.dumps(payload, ensure_ascii=False, indent=2)
+    if output:
+        Path(output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
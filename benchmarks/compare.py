@@ -0,0 +1,50 @@
+"""Compara dois arquivos de resultados (ex.: do commit anterior e do atual)
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.compare antes.json depois.json [--metrics p50_ms p99_ms requests_per_s]
+"""
+import argparse
+import json
+from pathlib import Path
+from typing import Dict, Any
+
+DEFAULT_METRICS = ("p50_ms", "p99_ms", "requests_per_s", "signups_per_s", "load_s")
+# Campos usados para identificar cada entrada das listas de resultados
+ENTRY_KEYS = ("mode", "scenario", "activities")
+
+
+def flatten(value: Any, prefix: str = "") -> Dict[str, float]:
+    flat = {}
+    if isinstance(value, dict):
+        for key, item in value.items():
+            flat.update(flatten(item, f"{prefix}.{key}" if prefix else key))
+    elif isinstance(value, list):
+        for i, item in enumerate(value):
+            label = next((f"{k}={item[k]}" for k in ENTRY_KEYS if isinstance(item, dict) and k in item), str(i))
+            flat.update(flatten(item, f"{prefix}[{label}]"))
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        flat[prefix] = float(value)
+    return flat
+
+
+def main(argv: list | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("--metrics", nargs="+", default=list(DEFAULT_METRICS))
+    args = parser.parse_args(argv)
+
+    before, after = (json.loads(Path(path).read_text(encoding="utf-8")) for path in (args.before, args.after))
+    if before.get("benchmark") != after.get("benchmark"):
+        parser.error(f"different benchmarks: {before.get('benchmark')} x {after.get('benchmark')}")
+    print(f"{before.get('benchmark')}: {before.get('commit')} -> {after.get('commit')}")
+
+    old, new = flatten(before["results"]), flatten(after["results"])
+    for key in old:
+        if key in new and key.rsplit(".", 1)[-1] in args.metrics:
+            change = (new[key] - old[key]) / old[key] * 100 if old[key] else 0.0
+            print(f"  {key:<70} {old[key]:>12.3f} {new[key]:>12.3f} {change:>+8.1f}%")
+
+
+if __name__ == "__main__":
+    main()
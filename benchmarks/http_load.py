@@ -0,0 +1,104 @@
+"""Teste de carga HTTP em processo dos endpoints de src/app.py
+
+Cenários:
+    signup_storm  muitas inscrições simultâneas concentradas em poucas atividades
+    listing_poll  navegadores consultando GET /activities (metade com If-None-Match)
+    mixed         tráfego misto: leituras, listagens filtradas, inscrições e cancelamentos
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.http_load [--scenarios signup_storm listing_poll mixed]
+                                   [--activities 500] [--participants 20] [--requests 2000]
+                                   [--concurrency 128] [--output out.json]
+"""
+import argparse
+import asyncio
+import random
+import tempfile
+from pathlib import Path
+
+from src.data_manager import DataManager
+from src.storage import JSONStorage
+
+from .common import BENCH_USERS, make_activities, patched_app, run_plan, write_results
+
+SCENARIOS = ("signup_storm", "listing_poll", "mixed")
+
+# Sem rede no meio, descomprimir no cliente só mediria o próprio benchmark
+IDENTITY = {"Accept-Encoding": "identity"}
+
+
+def signup(names: list, i: int) -> tuple:
+    return ("signup", "POST", f"/activities/{names[0] if len(names) == 1 else random.choice(names)}/signup",
+            {"name": f"Load {i}", "email": f"load{i}@example.com"})
+
+
+def make_plan(scenario: str, manager: DataManager, args: argparse.Namespace) -> list:
+    random.seed(42)
+    names = list(manager.load_activities())
+    if scenario == "signup_storm":
+        hot = names[:10]
+        return [signup(hot, i) for i in range(args.requests)]
+
+    etag = manager.get_activities_payload().etag
+    if scenario == "listing_poll":
+        return [
+            ("list_etag", "GET", "/activities", None, {**IDENTITY, "If-None-Match": etag}) if i % 2
+            else ("list", "GET", "/activities", None, IDENTITY)
+            for i in range(args.requests)
+        ]
+
+    plan = []
+    for i in range(args.requests):
+        roll = random.random()
+        if roll < 0.6:
+            plan.append(("list", "GET", "/activities", None, IDENTITY))
+        elif roll < 0.8:
+            plan.append(("list_filtered", "GET", "/activities",
+                         {"day": "quarta", "available": "true", "fields": "schedule,participants_count", "limit": "50"}))
+        elif roll < 0.95:
+            plan.append(signup(names, i))
+        else:
+            activity = random.choice(names)
+            email = manager.get_activity(activity)["participants"][0]["email"]
+            plan.append(("cancel", "DELETE", f"/activities/{activity}/cancel", {"email": email}))
+    return plan
+
+
+async def run_scenario(scenario: str, args: argparse.Namespace) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        storage = JSONStorage(data_dir)
+        storage.save_activities(make_activities(args.activities, args.participants))
+        storage.save_users(BENCH_USERS)
+        manager = DataManager(data_dir, storage=JSONStorage(data_dir), multiprocess=False)
+        plan = make_plan(scenario, manager, args)
+
+        with patched_app(manager) as (app, store):
+            result = await run_plan(app, plan, args.concurrency)
+            await store.close()
+        result["writer"] = store.writer_stats()
+
+    return {"scenario": scenario, **result}
+
+
+def main(argv: list | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--activities", type=int, default=500)
+    parser.add_argument("--participants", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=128)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args(argv)
+
+    results = [asyncio.run(run_scenario(scenario, args)) for scenario in args.scenarios]
+    write_results("http_load", {
+        "activities": args.activities,
+        "participants": args.participants,
+        "requests": args.requests,
+        "concurrency": args.concurrency
+    }, results, args.output)
+
+
+if __name__ == "__main__":
+    main()
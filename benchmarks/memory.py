@@ -0,0 +1,87 @@
+"""Memória ocupada pelo catálogo em memória: dicts do json.load x registros compactos (records.py)
+
+Mede, com tracemalloc, o que fica retido depois de carregar o catálogo em cada
+representação. Com --cohort, as inscrições são distribuídas entre um grupo
+menor de pessoas (cada uma em várias mentorias), como acontece em turmas reais.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.memory [--activities 10000] [--participants 10]
+                                [--cohort 20000] [--output out.json]
+"""
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+from src.records import Activity, ParticipantStore
+
+from .common import make_activities, write_results
+
+
+def make_catalog_text(args: argparse.Namespace, cohort: int | None) -> str:
+    activities = make_activities(args.activities, args.participants)
+    if cohort:
+        for i, activity in enumerate(activities.values()):
+            for j, participant in enumerate(activity["participants"]):
+                k = (i * args.participants + j * 7919) % cohort
+                participant.update(name=f"Pessoa {k}", email=f"pessoa{k}@example.com")
+    return json.dumps(activities, ensure_ascii=False)
+
+
+def retained(build, text: str) -> dict:
+    """Bytes retidos pelo resultado de build(text) e tempo de construção"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build(text)
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return {"retained_mb": current / 2**20, "peak_mb": peak / 2**20, "build_s": elapsed}
+
+
+def build_dicts(text: str):
+    return json.loads(text)
+
+
+def build_records(text: str):
+    store = ParticipantStore()
+    return store, {name: Activity.from_dict(data, store) for name, data in json.loads(text).items()}
+
+
+def main(argv: list | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--activities", type=int, default=10000)
+    parser.add_argument("--participants", type=int, default=10, help="participantes por atividade")
+    parser.add_argument("--cohort", type=int, default=20000,
+                        help="pessoas distintas no cenário compartilhado (0 desativa)")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args(argv)
+
+    results = []
+    for scenario, cohort in (("distinct", None), ("cohort", args.cohort or None)):
+        if scenario == "cohort" and cohort is None:
+            continue
+        text = make_catalog_text(args, cohort)
+        dicts = retained(build_dicts, text)
+        records = retained(build_records, text)
+        results.append({
+            "scenario": scenario,
+            "enrollments": args.activities * args.participants,
+            "people": cohort or args.activities * args.participants,
+            "dicts": dicts,
+            "records": records,
+            "saving": 1 - records["retained_mb"] / dicts["retained_mb"]
+        })
+    write_results("memory", {
+        "activities": args.activities,
+        "participants": args.participants,
+        "cohort": args.cohort
+    }, results, args.output)
+
+
+if __name__ == "__main__":
+    main()
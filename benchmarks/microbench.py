@@ -0,0 +1,93 @@
+"""Microbenchmarks das operações do DataManager sobre catálogos sintéticos de 10 a 100 mil atividades
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.microbench [--sizes 10 100 1000 10000 100000] [--participants 3]
+                                    [--storage json] [--budget 0.5] [--output out.json]
+"""
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from src.data_manager import DataManager
+from src.journal import JournaledStorage
+from src.storage import JSONStorage, ShardedJSONStorage, SQLiteStorage
+
+from .common import make_activities, measure, write_results
+
+STORAGES = ("json", "sharded", "sqlite", "journal")
+
+
+def make_storage(kind: str, data_dir: Path):
+    if kind == "sqlite":
+        return SQLiteStorage(data_dir / "mentoria.db")
+    if kind == "journal":
+        return JournaledStorage(JSONStorage(data_dir), data_dir / "activities.journal")
+    if kind == "sharded":
+        return ShardedJSONStorage(data_dir)
+    return JSONStorage(data_dir)
+
+
+def bench_size(size: int, args: argparse.Namespace) -> dict:
+    rng = random.Random(size)
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        activities = make_activities(size, args.participants)
+        make_storage(args.storage, data_dir).save_activities(activities)
+        names = list(activities)
+        emails = [p["email"] for a in activities.values() for p in a["participants"]]
+
+        storage = make_storage(args.storage, data_dir)
+        manager = DataManager(data_dir, storage=storage, multiprocess=False)
+        start = time.perf_counter()
+        manager.load_activities()
+        load_s = time.perf_counter() - start
+
+        # Operações caras (gravam o catálogo inteiro) ganham menos iterações
+        heavy = {"budget_s": args.budget, "max_iterations": 50}
+        results = {
+            "load_s": load_s,
+            "add_participant": measure(
+                lambda i: manager.add_participant(rng.choice(names), f"Nova {i}", f"nova{i}@example.com"), **heavy
+            ),
+            "try_enroll": measure(
+                lambda i: manager.try_enroll(rng.choice(names), f"Outra {i}", f"outra{i}@example.com"), **heavy
+            ),
+            "is_participant_registered": measure(
+                lambda i: manager.is_participant_registered(rng.choice(names), rng.choice(emails)), args.budget
+            ),
+            "get_participant_activities_by_day": measure(
+                lambda i: manager.get_participant_activities_by_day(rng.choice(emails)), args.budget
+            ),
+            "query_activities_by_day": measure(
+                lambda i: manager.query_activities(day=manager.normalize_day("quarta"), limit=50), args.budget
+            ),
+            "save_activities": measure(lambda i: manager.save_activities(), **heavy)
+        }
+        if isinstance(storage, JournaledStorage):
+            storage.close()
+
+    return {"activities": size, "enrollments": size * args.participants, **results}
+
+
+def main(argv: list | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000, 100000])
+    parser.add_argument("--participants", type=int, default=3, help="participantes por atividade")
+    parser.add_argument("--storage", choices=STORAGES, default="json")
+    parser.add_argument("--budget", type=float, default=0.5, help="segundos por operação medida")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args(argv)
+
+    results = [bench_size(size, args) for size in args.sizes]
+    write_results("microbench", {
+        "sizes": args.sizes,
+        "participants": args.participants,
+        "storage": args.storage,
+        "budget_s": args.budget
+    }, results, args.output)
+
+
+if __name__ == "__main__":
+    main()
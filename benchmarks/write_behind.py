@@ -0,0 +1,77 @@
+"""Vazão de inscrições: gravação síncrona do snapshot x journal write-behind
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.write_behind [--activities 500] [--participants 20]
+                                      [--signups 2000] [--threads 16] [--output out.json]
+"""
+import argparse
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from src.data_manager import DataManager
+from src.journal import JournaledStorage, DURABILITY_MODES
+from src.storage import JSONStorage
+
+from .common import make_activities, latency_summary, write_results
+
+
+def run_mode(mode: str, args: argparse.Namespace) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        JSONStorage(data_dir).save_activities(make_activities(args.activities, args.participants))
+        if mode == "sync":
+            storage = JSONStorage(data_dir)
+        else:
+            storage = JournaledStorage(JSONStorage(data_dir), data_dir / "activities.journal", durability=mode)
+        manager = DataManager(data_dir, storage=storage)
+        names = list(manager.load_activities())
+
+        def signup(i: int) -> float:
+            start = time.perf_counter()
+            manager.try_enroll(names[i % len(names)], f"Bench {i}", f"bench{i}@example.com")
+            return time.perf_counter() - start
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.threads) as pool:
+            latencies = list(pool.map(signup, range(args.signups)))
+        elapsed = time.perf_counter() - start
+
+        if isinstance(storage, JournaledStorage):
+            compact_start = time.perf_counter()
+            storage.close()
+            compaction_s = time.perf_counter() - compact_start
+        else:
+            compaction_s = 0.0
+
+    return {
+        "mode": mode,
+        "elapsed_s": elapsed,
+        "signups_per_s": args.signups / elapsed,
+        "final_compaction_s": compaction_s,
+        "latency": latency_summary(latencies)
+    }
+
+
+def main(argv: list | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--activities", type=int, default=500)
+    parser.add_argument("--participants", type=int, default=20)
+    parser.add_argument("--signups", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--modes", nargs="+", default=["sync", *DURABILITY_MODES])
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args(argv)
+
+    results = [run_mode(mode, args) for mode in args.modes]
+    write_results("write_behind", {
+        "activities": args.activities,
+        "participants": args.participants,
+        "signups": args.signups,
+        "threads": args.threads
+    }, results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,137 +1,454 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import RedirectResponse
+from fastapi.responses import JSONResponse, RedirectResponse, Response, StreamingResponse
 from pydantic import BaseModel
+from contextlib import asynccontextmanager
+import asyncio
+import csv
+import io
+import json
 import os
 from pathlib import Path
-from .data_manager import data_manager
+from typing import Any, Dict, List
+from .async_manager import AsyncDataManager
+from .data_manager import data_manager, EnrollmentStatus, validate_new_activity
+from .events import EventBroadcaster
+from .metrics import REGISTRY, MetricsMiddleware, SamplingProfiler
+from .sessions import SESSION_COOKIE, SessionSigner, load_secret
+from .users import Identity
+
+# Async API: reads from memory, writes coalesced by a single writer task
+store = AsyncDataManager(data_manager)
+
+
+class CodecJSONResponse(JSONResponse):
+    """JSON response rendered with the data layer's codec (orjson/msgspec when installed)
+
+    Endpoints on hot paths return it directly, which also skips FastAPI's
+    jsonable_encoder pass over plain dict/list content.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return data_manager.codec.dumps(content)
+
+
+# Opt-in sampling profiler: MENTORIA_PROFILE_DIR=<dir> writes per-route folded stacks on shutdown
+PROFILE_DIR = os.environ.get("MENTORIA_PROFILE_DIR")
+profiler = SamplingProfiler(float(os.environ.get("MENTORIA_PROFILE_INTERVAL", "0.005"))) if PROFILE_DIR else None
+
+
+# Opt-in periodic check of the per-user projection (seconds); the result is exported on /metrics
+PROJECTION_CHECK_INTERVAL = float(os.environ.get("MENTORIA_PROJECTION_CHECK_INTERVAL", "0"))
+
+
+async def check_projection_periodically():
+    while True:
+        await asyncio.sleep(PROJECTION_CHECK_INTERVAL)
+        try:
+            problems = await run_in_threadpool(data_manager.check_projection)
+        except Exception as e:
+            print(f"Error checking the enrollment projection: {str(e)}")
+            continue
+        if problems:
+            print(f"Enrollment projection has {len(problems)} inconsistencies: {problems[:5]}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if profiler is not None:
+        profiler.register_routes(app.routes)
+        profiler.start()
+    checker = asyncio.create_task(check_projection_periodically()) if PROJECTION_CHECK_INTERVAL > 0 else None
+    yield
+    if checker is not None:
+        checker.cancel()
+    # Persist mutations still queued before the server exits
+    await store.close()
+    if profiler is not None:
+        profiler.stop()
+        profiler.dump(Path(PROFILE_DIR))
+
 
 app = FastAPI(title="WoMakersCode", 
-              description="API for organizing soft skills mentoring classes")
+              description="API for organizing soft skills mentoring classes",
+              lifespan=lifespan,
+              default_response_class=CodecJSONResponse)
+app.add_middleware(MetricsMiddleware)
 
 # Mount the static files directory
 current_dir = Path(__file__).parent
 app.mount("/static", StaticFiles(directory=os.path.join(Path(__file__).parent,
           "static")), name="static")
 
+# Live seat-count updates pushed to browsers over Server-Sent Events
+broadcaster = EventBroadcaster()
+data_manager.subscribe(broadcaster.publish)
+
+def collect_store_metrics() -> list:
+    """Cache and writer counters kept by the data layer, read at scrape time"""
+    cache = data_manager.cache_stats()
+    writer = store.writer_stats()
+    return [
+        ("mentoria_activities_cache_total", "counter", "Activities cache lookups by result",
+         {(("result", result),): value for result, value in cache.items()}),
+        ("mentoria_writer_batches_total", "counter", "Batches persisted by the writer task",
+         {(): writer["batches"]}),
+        ("mentoria_writer_mutations_total", "counter", "Mutations applied by the writer task",
+         {(): writer["mutations"]}),
+        ("mentoria_data_version", "gauge", "Current version of the in-memory activities",
+         {(): data_manager.data_version}),
+        ("mentoria_sse_subscribers", "gauge", "Open Server-Sent Events streams",
+         {(): broadcaster.subscriber_count}),
+        ("mentoria_projection_inconsistencies", "gauge",
+         "Inconsistencies found by the last enrollment projection check",
+         {} if data_manager.projection_problems is None else {(): data_manager.projection_problems}),
+    ]
+
+
+REGISTRY.register_collector(collect_store_metrics)
+
+# Per-request identity: signed session cookie (or Bearer token) set by /users/switch-profile
+signer = SessionSigner(load_secret(data_manager.multiprocess))
+
+
+async def current_identity(request: Request) -> Identity:
+    """Resolves the user of this request from its session (default user when there is none)"""
+    token = request.cookies.get(SESSION_COOKIE)
+    authorization = request.headers.get("authorization", "")
+    if authorization.lower().startswith("bearer "):
+        token = authorization[7:].strip()
+    user_key = signer.unsign(token) if token else None
+    directory = await store.user_directory()
+    return directory.identity(user_key)
+
+
 @app.get("/")
-def root():
+async def root():
     return RedirectResponse(url="/static/index.html")
 
 
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus metrics (text exposition format)"""
+    return Response(content=REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.get("/admin/projection-check")
+async def check_projection(identity: Identity = Depends(current_identity)):
+    """Verifies this worker's per-user enrollment projection against its in-memory activities"""
+    if not identity.has_permission("manage_participants"):
+        raise HTTPException(status_code=403, detail="No permission to check the enrollment projection")
+    # Mutations still queued are applied first, so the check sees a settled state
+    await store.flush()
+    problems = await run_in_threadpool(data_manager.check_projection)
+    return {"consistent": not problems, "problems": problems}
+
 @app.get("/users/current")
-def get_current_user():
+async def get_current_user(identity: Identity = Depends(current_identity)):
     """Gets current user information"""
-    current_user = data_manager.get_current_user()
-    users_data = data_manager.load_users()
-    profile_name = current_user.get("profile", "participant")
-    profile_info = users_data.get("profiles", {}).get(profile_name, {})
+    directory = await store.user_directory()
+    profile_name = identity.user.get("profile", "participant")
+    profile_info = directory.profiles.get(profile_name, {})
     
     return {
-        "user": current_user,
-        "profile_info": profile_info,
-        "permissions": data_manager.get_user_permissions()
+        "user": dict(identity.user),
+        "profile_info": dict(profile_info),
+        "permissions": sorted(identity.permissions)
     }
 
 @app.post("/users/switch-profile")
-def switch_profile(profile_name: str):
-    """Switch user profile (simulation)"""
-    try:
-        result = data_manager.switch_user_profile(profile_name)
-        
-        if result:
-            new_user = data_manager.get_current_user()
-            return {"message": f"Profile changed to {profile_name}", "user": new_user}
-        else:
-            raise HTTPException(status_code=400, detail="Failed to change profile")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
+async def switch_profile(profile_name: str, response: Response):
+    """Switch user profile (simulation): issues a signed session for that profile's user"""
+    directory = await store.user_directory()
+    user_key = directory.user_key_for_profile(profile_name)
+    if user_key is None:
+        raise HTTPException(status_code=400, detail="Failed to change profile")
+
+    token = signer.sign(user_key)
+    response.set_cookie(
+        SESSION_COOKIE, token, max_age=signer.max_age, httponly=True, samesite="lax"
+    )
+    new_user = dict(directory.identity(user_key).user)
+    return {"message": f"Profile changed to {profile_name}", "user": new_user, "token": token}
 
 @app.get("/users/profiles")
-def get_profiles():
+async def get_profiles():
     """Gets all available profiles"""
-    users_data = data_manager.load_users()
-    return users_data.get("profiles", {})
+    directory = await store.user_directory()
+    return {name: dict(profile) for name, profile in directory.profiles.items()}
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Checks an If-None-Match header (list of ETags, weak or strong, or *) against an ETag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def choose_encoding(accept_encoding: str | None, available: dict) -> str | None:
+    """Picks the best precomputed Content-Encoding accepted by the client (br > gzip)"""
+    accepted = set()
+    for item in (accept_encoding or "").split(","):
+        coding, _, params = item.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(coding.strip().lower())
+    for coding in ("br", "gzip"):
+        if coding in available and (coding in accepted or "*" in accepted):
+            return coding
+    return None
+
 
 @app.get("/activities")
-def get_activities():
-    return data_manager.refresh_activities()
+async def get_activities(
+    request: Request,
+    day: str | None = None,
+    available: bool | None = None,
+    q: str | None = None,
+    fields: str | None = None,
+    cursor: str | None = None,
+    limit: int | None = Query(None, ge=1, le=500)
+):
+    """Lists all mentorships (supports conditional requests via ETag/If-None-Match)
+
+    Any of the query parameters switches to a filtered, cursor-paginated listing:
+    `{"activities": {...}, "next_cursor": "..."}`.
+    """
+    if any(param is not None for param in (day, available, q, fields, cursor, limit)):
+        return await query_activities(day, available, q, fields, cursor, limit)
+
+    payload = await store.activities_payload()
+    headers = {
+        "ETag": payload.etag,
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+        "X-Data-Version": str(payload.version)
+    }
+
+    if etag_matches(request.headers.get("if-none-match"), payload.etag):
+        return Response(status_code=304, headers=headers)
+
+    body = payload.body
+    encoding = choose_encoding(request.headers.get("accept-encoding"), payload.encoded)
+    if encoding:
+        body = payload.encoded[encoding]
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+async def query_activities(day, available, q, fields, cursor, limit):
+    """Filtered/paginated variant of GET /activities"""
+    day_key = None
+    if day is not None:
+        day_key = data_manager.normalize_day(day)
+        if day_key is None:
+            raise HTTPException(status_code=400, detail=f"Invalid day: {day}")
+    field_list = None
+    if fields is not None:
+        field_list = [f.strip() for f in fields.split(",") if f.strip()]
+
+    try:
+        activities, next_cursor = await store.query(
+            day=day_key, available=available, search=q,
+            fields=field_list, cursor=cursor, limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return CodecJSONResponse({"activities": activities, "next_cursor": next_cursor})
+
+
+@app.get("/activities/stream")
+async def stream_activity_changes():
+    """Streams compact change events (seat counts, enrollments, updates) as Server-Sent Events"""
+    await store.load()
+    hello = {"type": "hello", "version": data_manager.data_version}
+    return StreamingResponse(
+        broadcaster.stream(hello),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+# Status code and message for each enrollment failure (single and bulk signup)
+ENROLLMENT_ERRORS = {
+    EnrollmentStatus.ACTIVITY_NOT_FOUND: (404, "Activity not found"),
+    EnrollmentStatus.ALREADY_REGISTERED: (400, "Student is already registered for this activity"),
+    EnrollmentStatus.ACTIVITY_FULL: (400, "Activity is full. Join the waitlist to be enrolled when a seat opens"),
+    EnrollmentStatus.SAME_DAY_CONFLICT: (
+        400,
+        "You already have a mentorship on the same day: '{conflicting_activity}'. "
+        "It is not possible to enroll in more than one mentorship per week."
+    ),
+    EnrollmentStatus.INVALID: (400, "Activity, name and email are required"),
+    EnrollmentStatus.ALREADY_WAITLISTED: (400, "Student is already on the waitlist for this activity"),
+    EnrollmentStatus.NOT_WAITLISTED: (400, "Student is not on the waitlist for this activity"),
+}
+
+# Upper bound on rows accepted by the bulk endpoints in a single request
+MAX_BULK_ROWS = 5000
+
+
+def enrollment_error(result) -> tuple:
+    """Maps a failed EnrollmentResult to (status code, message)"""
+    status_code, message = ENROLLMENT_ERRORS[result.status]
+    return status_code, message.format(conflicting_activity=result.conflicting_activity)
 
 
 @app.post("/activities/{activity_name}/signup")
-def signup_for_activity(activity_name: str, name: str = None, email: str = None):
+async def signup_for_activity(activity_name: str, name: str = None, email: str = None,
+                              identity: Identity = Depends(current_identity)):
     """Enroll a student in a mentorship"""
-    current_user = data_manager.get_current_user()
+    current_user = identity.user
+    permissions = identity.permissions
 
     # If participant, use own user data
-    if "self_manage" in data_manager.get_user_permissions():
+    if "self_manage" in permissions:
         name = current_user.get("name", "")
         email = current_user.get("email", "")
         if not name or not email:
             raise HTTPException(status_code=400, detail="User data is incomplete")
     else:
         # For other profiles, check permissions
-        if not data_manager.has_permission("manage_participants") and not data_manager.has_permission("create"):
+        if "manage_participants" not in permissions and "create" not in permissions:
             raise HTTPException(status_code=403, detail="No permission to enroll participants")
 
         if not name or not email:
             raise HTTPException(status_code=400, detail="Name and email are required")
 
-    # Validate activity exists
-    if not data_manager.activity_exists(activity_name):
-        raise HTTPException(status_code=404, detail="Activity not found")
+    # Validate (activity exists, not registered, not full, no same-day conflict) and add student
+    result = await store.enroll(activity_name, name, email)
+    if not result.ok:
+        status_code, detail = enrollment_error(result)
+        raise HTTPException(status_code=status_code, detail=detail)
 
-    # Check if student is already registered
-    if data_manager.is_participant_registered(activity_name, email):
-        raise HTTPException(status_code=400, detail="Student is already registered for this activity")
+    return {"message": f"Student {name} has been registered for the activity: {activity_name}"}
 
-    # Check if activity is full
-    if data_manager.is_activity_full(activity_name):
-        raise HTTPException(status_code=400, detail="Activity is full")
 
-    # Check if student has another activity on the same day
-    if data_manager.has_activity_on_same_day(activity_name, email):
-        existing_activity = data_manager.get_user_activity_same_day(activity_name, email)
-        raise HTTPException(
-            status_code=400, 
-            detail=f"You already have a mentorship on the same day: '{existing_activity}'. It is not possible to enroll in more than one mentorship per week."
-        )
+@app.post("/activities/{activity_name}/waitlist")
+async def join_waitlist(activity_name: str, name: str = None, email: str = None,
+                        identity: Identity = Depends(current_identity)):
+    """Join the waitlist of a full mentorship (enrolls right away if a seat is free)
 
-    # Add student
-    data_manager.add_participant(activity_name, name, email)
-    return {"message": f"Student {name} has been registered for the activity: {activity_name}"}
+    Waiters are promoted in arrival order when a seat is released or the
+    capacity grows, so there is no need to poll the signup endpoint.
+    """
+    current_user = identity.user
+    permissions = identity.permissions
+
+    if "self_manage" in permissions:
+        name = current_user.get("name", "")
+        email = current_user.get("email", "")
+        if not name or not email:
+            raise HTTPException(status_code=400, detail="User data is incomplete")
+    else:
+        if "manage_participants" not in permissions and "create" not in permissions:
+            raise HTTPException(status_code=403, detail="No permission to enroll participants")
+
+        if not name or not email:
+            raise HTTPException(status_code=400, detail="Name and email are required")
+
+    result = await store.join_waitlist(activity_name, name, email)
+    if result.ok:
+        return {"message": f"Student {name} has been registered for the activity: {activity_name}",
+                "status": "enrolled"}
+    if result.status is not EnrollmentStatus.WAITLISTED:
+        status_code, detail = enrollment_error(result)
+        raise HTTPException(status_code=status_code, detail=detail)
+
+    return {"message": f"Student {name} is number {result.position} on the waitlist for: {activity_name}",
+            "status": "waitlisted", "position": result.position}
+
+
+@app.delete("/activities/{activity_name}/waitlist")
+async def leave_waitlist(activity_name: str, email: str = None,
+                         identity: Identity = Depends(current_identity)):
+    """Leave the waitlist of a mentorship"""
+    current_user = identity.user
+    permissions = identity.permissions
+
+    if "self_manage" in permissions:
+        email = current_user.get("email", "")
+        if not email:
+            raise HTTPException(status_code=400, detail="User email not found")
+    else:
+        if "manage_participants" not in permissions and "delete" not in permissions:
+            raise HTTPException(status_code=403, detail="No permission to remove participants")
+
+        if not email:
+            raise HTTPException(status_code=400, detail="Email is required")
+
+    result = await store.leave_waitlist(activity_name, email)
+    if not result.ok:
+        status_code, detail = enrollment_error(result)
+        raise HTTPException(status_code=status_code, detail=detail)
+
+    return {"message": f"Removed from the waitlist of the activity: {activity_name}"}
+
+
+class BulkSignupRow(BaseModel):
+    activity: str
+    name: str
+    email: str
+
+class BulkSignup(BaseModel):
+    signups: List[BulkSignupRow]
+
+@app.post("/activities/bulk-signup")
+async def bulk_signup(request: BulkSignup, identity: Identity = Depends(current_identity)):
+    """Enroll many students (in one or more mentorships) with a single write
+
+    Every row is validated like a single signup; the response lists the outcome of each row.
+    """
+    permissions = identity.permissions
+    if "manage_participants" not in permissions and "create" not in permissions:
+        raise HTTPException(status_code=403, detail="No permission to enroll participants")
+    if len(request.signups) > MAX_BULK_ROWS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_ROWS} rows per request")
+
+    rows = [(row.activity.strip(), row.name.strip(), row.email.strip()) for row in request.signups]
+    # Already a single coalesced write: run it off the event loop, after queued mutations
+    await store.flush()
+    outcomes = await run_in_threadpool(data_manager.bulk_enroll, rows)
+    results = []
+    for i, (row, result) in enumerate(zip(request.signups, outcomes)):
+        item = {"row": i, "activity": row.activity, "email": row.email, "status": result.status.value}
+        if not result.ok:
+            item["detail"] = enrollment_error(result)[1]
+        results.append(item)
+    enrolled = sum(result.ok for result in outcomes)
+    return {"enrolled": enrolled, "failed": len(outcomes) - enrolled, "results": results}
 
 
 @app.delete("/activities/{activity_name}/cancel")
-def cancel_activity_signup(activity_name: str, email: str = None):
+async def cancel_activity_signup(activity_name: str, email: str = None,
+                                 identity: Identity = Depends(current_identity)):
     """Cancel a student's registration for a mentorship"""
-    current_user = data_manager.get_current_user()
+    current_user = identity.user
+    permissions = identity.permissions
 
     # If participant, can only cancel own registration
-    if "self_manage" in data_manager.get_user_permissions():
+    if "self_manage" in permissions:
         email = current_user.get("email", "")
         if not email:
             raise HTTPException(status_code=400, detail="User email not found")
     else:
         # For other profiles, check permissions
-        if not data_manager.has_permission("manage_participants") and not data_manager.has_permission("delete"):
+        if "manage_participants" not in permissions and "delete" not in permissions:
             raise HTTPException(status_code=403, detail="No permission to remove participants")
         
         if not email:
             raise HTTPException(status_code=400, detail="Email is required")
         
-    # Validate activity exists
-    if not data_manager.activity_exists(activity_name):
+    # Validate (activity exists, student registered) and remove student
+    result = await store.cancel(activity_name, email)
+    if result.status is EnrollmentStatus.ACTIVITY_NOT_FOUND:
         raise HTTPException(status_code=404, detail="Activity not found")
-
-    # Check if student is registered
-    if not data_manager.is_participant_registered(activity_name, email):
+    if result.status is EnrollmentStatus.NOT_REGISTERED:
         raise HTTPException(status_code=400, detail="Student is not registered for this activity")
 
-    # Remove student
-    data_manager.remove_participant(activity_name, email)
     return {"message": f"Registration has been canceled from the activity: {activity_name}"}
 
 
@@ -142,46 +459,122 @@ class NewActivity(BaseModel):
     max_participants: int
 
 @app.post("/activities")
-def create_activity(activity: NewActivity):
+async def create_activity(activity: NewActivity, identity: Identity = Depends(current_identity)):
     """Create a new mentorship"""
     # Check permissions
-    if not data_manager.has_permission("create"):
+    if not identity.has_permission("create"):
         raise HTTPException(status_code=403, detail="No permission to create mentorship")
 
-    activities = data_manager.load_activities()
-    
-    # Check if activity already exists
-    if activity.name in activities:
-        raise HTTPException(status_code=400, detail="Mentorship with this name already exists")
-
-    # Add new activity
-    activities[activity.name] = {
+    # Add new activity (fails if it already exists)
+    created = await store.create(activity.name, {
         "description": activity.description,
         "schedule": activity.schedule,
         "max_participants": activity.max_participants,
         "participants": []
-    }
-    
-    # Update the data manager's activities and save
-    data_manager._activities = activities
-    data_manager.save_activities()
+    })
+    if not created:
+        raise HTTPException(status_code=400, detail="Mentorship with this name already exists")
     
     return {"message": f"Mentorship '{activity.name}' successfully created"}
 
+def parse_activity_rows(body: bytes, content_type: str) -> List[Dict[str, Any]]:
+    """Reads activities to import from a CSV or JSON body
+
+    JSON may be a list of objects with a "name" key or an object keyed by name
+    (the same shape as GET /activities). CSV needs a header row with
+    name, description, schedule and max_participants.
+    """
+    text = body.decode("utf-8-sig")
+    if "csv" in content_type:
+        return list(csv.DictReader(io.StringIO(text)))
+    data = json.loads(text)
+    if isinstance(data, dict):
+        return [{"name": name, **activity} for name, activity in data.items() if isinstance(activity, dict)]
+    if isinstance(data, list) and all(isinstance(row, dict) for row in data):
+        return data
+    raise ValueError("Expected a list of activities or an object keyed by activity name")
+
+
+def validate_activity_row(row: Dict[str, Any]) -> tuple:
+    """Returns (name, activity) for a valid import row, or raises ValueError"""
+    name = str(row.get("name") or "").strip()
+    schedule = str(row.get("schedule") or "").strip()
+    if not name or not schedule:
+        raise ValueError("Name and schedule are required")
+    try:
+        max_participants = int(row.get("max_participants"))
+    except (TypeError, ValueError):
+        raise ValueError("max_participants must be an integer")
+    if max_participants < 1:
+        raise ValueError("max_participants must be at least 1")
+    activity = {
+        "description": str(row.get("description") or ""),
+        "schedule": schedule,
+        "max_participants": max_participants
+    }
+    if row.get("participants") is not None:
+        activity["participants"] = row["participants"]
+    validate_new_activity(activity)
+    return name, activity
+
+
+@app.post("/activities/import")
+async def import_activities(request: Request, upsert: bool = False,
+                            identity: Identity = Depends(current_identity)):
+    """Create (or, with upsert=true, update) many mentorships from a JSON or CSV body with a single write"""
+    if not identity.has_permission("create"):
+        raise HTTPException(status_code=403, detail="No permission to create mentorship")
+
+    try:
+        rows = parse_activity_rows(await request.body(), request.headers.get("content-type", ""))
+    except (ValueError, csv.Error) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid import file: {str(e)}")
+    if len(rows) > MAX_BULK_ROWS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_ROWS} rows per request")
+
+    results = []
+    valid = {}
+    for i, row in enumerate(rows):
+        try:
+            name, activity = validate_activity_row(row)
+        except ValueError as e:
+            results.append({"row": i, "name": row.get("name"), "status": "invalid", "detail": str(e)})
+            continue
+        if name in valid:
+            results.append({"row": i, "name": name, "status": "duplicate", "detail": "Repeated in this import"})
+            continue
+        valid[name] = activity
+        results.append({"row": i, "name": name, "status": None})
+
+    # The write is blocking file I/O: keep it off the event loop
+    await store.flush()
+    outcomes = await run_in_threadpool(data_manager.import_activities, valid, upsert)
+    for item in results:
+        if item["status"] is None:
+            item["status"], detail = outcomes[item["name"]]
+            if detail:
+                item["detail"] = detail
+
+    summary = {}
+    for item in results:
+        summary[item["status"]] = summary.get(item["status"], 0) + 1
+    return {"summary": summary, "results": results}
+
 class ActivityUpdate(BaseModel):
     max_participants: int | None = None
     description: str | None = None
     schedule: str | None = None
 
 @app.put("/activities/{activity_name}")
-def update_activity(activity_name: str, updates: ActivityUpdate):
+async def update_activity(activity_name: str, updates: ActivityUpdate,
+                          identity: Identity = Depends(current_identity)):
     """Update an existing mentorship"""
     # Check permissions
-    if not data_manager.has_permission("create") and not data_manager.has_permission("manage_participants"):
+    if not identity.has_permission("create") and not identity.has_permission("manage_participants"):
         raise HTTPException(status_code=403, detail="No permission to update mentorship")
 
     # Check if activity exists
-    if not data_manager.activity_exists(activity_name):
+    if activity_name not in await store.load():
         raise HTTPException(status_code=404, detail="Mentorship not found")
 
     # Prepare updates dict (only include non-None values)
@@ -197,39 +590,31 @@ def update_activity(activity_name: str, updates: ActivityUpdate):
         raise HTTPException(status_code=400, detail="No updates provided")
     
     # Update activity
-    success = data_manager.update_activity(activity_name, update_dict)
+    success = await store.update(activity_name, update_dict)
     if success:
         return {"message": f"Mentorship '{activity_name}' successfully updated"}
     else:
-        raise HTTPException(status_code=500, detail="Error updating mentorship")
+        raise HTTPException(status_code=404, detail="Mentorship not found")
 
 @app.delete("/activities/{activity_name}")
-def delete_activity(activity_name: str):
+async def delete_activity(activity_name: str, identity: Identity = Depends(current_identity)):
     """Delete a mentorship"""
     # Check permissions
-    if not data_manager.has_permission("delete"):
+    if not identity.has_permission("delete"):
         raise HTTPException(status_code=403, detail="No permission to delete mentorship")
 
-    activities = data_manager.load_activities()
-    
-    # Check if activity exists
-    if activity_name not in activities:
-        raise HTTPException(status_code=404, detail="Mentorship not found")
-    
     # Remove activity
-    del activities[activity_name]
-    
-    # Update the data manager's activities
-    data_manager._activities = activities
-    data_manager.save_activities()
+    if not await store.delete(activity_name):
+        raise HTTPException(status_code=404, detail="Mentorship not found")
 
     return {"message": f"Mentorship '{activity_name}' successfully deleted"}
 
 @app.get("/users/activities")
-def get_current_user_activities():
+async def get_current_user_activities(identity: Identity = Depends(current_identity)):
     """Gets the activities the current user is subscribed to"""
-    activities = data_manager.get_current_user_activities()
-    return {"activities": activities}
+    await store.load()
+    activities = data_manager.get_current_user_activities(identity.key)
+    return CodecJSONResponse({"activities": activities})
 
 if __name__ == "__main__":
     import uvicorn
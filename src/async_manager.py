@@ -0,0 +1,142 @@
+import asyncio
+import time
+from typing import Dict, Any, Tuple
+
+from .data_manager import DataManager, ActivitiesPayload, EnrollmentResult
+from .users import UserDirectory
+
+
+class AsyncDataManager:
+    """API assíncrona sobre o DataManager para os endpoints `async def`
+
+    Leituras vêm da cópia em memória, sem I/O; o armazenamento é revalidado no
+    máximo a cada `revalidate_interval` segundos (em uma thread). Escritas vão
+    para uma fila consumida por uma única tarefa gravadora, que junta as mutações
+    pendentes em um lote e o persiste com uma única gravação fora do event loop.
+    """
+
+    def __init__(self, manager: DataManager, revalidate_interval: float = 1.0, max_batch: int = 256):
+        self.manager = manager
+        self.revalidate_interval = revalidate_interval
+        self.max_batch = max_batch
+        self._last_revalidation = float("-inf")
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queue: asyncio.Queue | None = None
+        self._writer: asyncio.Task | None = None
+        self._batches = 0
+        self._mutations = 0
+
+    # -- Leituras --------------------------------------------------------
+
+    def _fresh(self) -> bool:
+        return (self.manager.is_loaded
+                and time.monotonic() - self._last_revalidation < self.revalidate_interval)
+
+    async def load(self) -> Dict[str, Any]:
+        """Atividades em memória (carrega ou revalida em uma thread quando necessário)"""
+        if self._fresh():
+            return self.manager.get_activities(revalidate=False)
+        activities = await asyncio.to_thread(self.manager.get_activities)
+        self._last_revalidation = time.monotonic()
+        return activities
+
+    async def activities_payload(self) -> ActivitiesPayload:
+        """Listagem pré-serializada; a serialização (quando a versão muda) roda em uma thread"""
+        await self.load()
+        payload = self.manager.cached_activities_payload()
+        if payload is not None:
+            return payload
+        return await asyncio.to_thread(self.manager.get_activities_payload, False)
+
+    async def query(self, **filters) -> Tuple[Dict[str, Any], str | None]:
+        """Listagem filtrada/paginada (ver DataManager.query_activities)"""
+        await self.load()
+        return self.manager.query_activities(**filters, revalidate=False)
+
+    async def user_directory(self) -> UserDirectory:
+        """Tabela de usuários e permissões (lida em uma thread só na primeira vez)"""
+        if self.manager.users_loaded:
+            return self.manager.get_user_directory()
+        return await asyncio.to_thread(self.manager.get_user_directory)
+
+    # -- Escritas --------------------------------------------------------
+
+    async def enroll(self, activity_name: str, name: str, email: str) -> EnrollmentResult:
+        return await self._submit("enroll", activity_name, name, email)
+
+    async def cancel(self, activity_name: str, email: str) -> EnrollmentResult:
+        return await self._submit("cancel", activity_name, email)
+
+    async def join_waitlist(self, activity_name: str, name: str, email: str) -> EnrollmentResult:
+        return await self._submit("join_waitlist", activity_name, name, email)
+
+    async def leave_waitlist(self, activity_name: str, email: str) -> EnrollmentResult:
+        return await self._submit("leave_waitlist", activity_name, email)
+
+    async def create(self, activity_name: str, activity: Dict[str, Any]) -> bool:
+        return await self._submit("create", activity_name, activity)
+
+    async def update(self, activity_name: str, updates: Dict[str, Any]) -> bool:
+        return await self._submit("update", activity_name, updates)
+
+    async def delete(self, activity_name: str) -> bool:
+        return await self._submit("delete", activity_name)
+
+    async def save(self) -> None:
+        """Grava um snapshot completo (depois das mutações já enfileiradas)"""
+        await self.flush()
+        await asyncio.to_thread(self.manager.save_activities)
+
+    async def flush(self) -> None:
+        """Espera a gravação de tudo o que já foi enfileirado"""
+        if self._queue is not None and self._loop is asyncio.get_running_loop():
+            await self._queue.join()
+
+    async def _submit(self, op: str, *args) -> Any:
+        queue = self._ensure_writer()
+        future = asyncio.get_running_loop().create_future()
+        queue.put_nowait((op, args, future))
+        return await future
+
+    def _ensure_writer(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._writer is None or self._writer.done():
+            # Primeiro uso (ou um novo event loop, como nos testes): nova fila e nova tarefa
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._writer = loop.create_task(self._run_writer(self._queue), name="data-writer")
+        return self._queue
+
+    async def _run_writer(self, queue: asyncio.Queue) -> None:
+        while True:
+            batch = [await queue.get()]
+            # Junta tudo o que chegou enquanto o lote anterior era gravado
+            while len(batch) < self.max_batch and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                results = await asyncio.to_thread(
+                    self.manager.apply_mutations, [(op, args) for op, args, _ in batch]
+                )
+            except Exception as e:
+                results = [e] * len(batch)
+            self._batches += 1
+            self._mutations += len(batch)
+            for (_, _, future), result in zip(batch, results):
+                if not future.done():
+                    if isinstance(result, Exception):
+                        future.set_exception(result)
+                    else:
+                        future.set_result(result)
+                queue.task_done()
+
+    async def close(self) -> None:
+        """Grava o que está na fila e encerra a tarefa gravadora"""
+        await self.flush()
+        if self._writer is not None:
+            self._writer.cancel()
+            await asyncio.gather(self._writer, return_exceptions=True)
+            self._writer = None
+
+    def writer_stats(self) -> Dict[str, int]:
+        """Lotes gravados e mutações aplicadas pela tarefa gravadora"""
+        return {"batches": self._batches, "mutations": self._mutations}
@@ -0,0 +1,85 @@
+import json
+import os
+from typing import Any
+
+from .records import to_jsonable
+
+try:
+    import orjson
+except ImportError:  # dependência opcional: sem ela o codec automático tenta msgspec e depois json
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # dependência opcional
+    msgspec = None
+
+
+class JSONCodec:
+    """Codifica/decodifica JSON com o módulo json da biblioteca padrão
+
+    Subclasses trocam a implementação (orjson, msgspec) mantendo o mesmo contrato:
+    dumps devolve bytes UTF-8 sem escapes de não-ASCII, compactos por padrão
+    (pretty=True indenta), e loads levanta ValueError para JSON inválido.
+    """
+
+    name = "json"
+
+    def dumps(self, obj: Any, pretty: bool = False) -> bytes:
+        if pretty:
+            text = json.dumps(obj, ensure_ascii=False, indent=4, default=to_jsonable)
+        else:
+            text = json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=to_jsonable)
+        return text.encode("utf-8")
+
+    def loads(self, data: bytes | str) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    # O orjson só indenta com 2 espaços
+    name = "orjson"
+
+    def dumps(self, obj: Any, pretty: bool = False) -> bytes:
+        return orjson.dumps(obj, default=to_jsonable, option=orjson.OPT_INDENT_2 if pretty else 0)
+
+    def loads(self, data: bytes | str) -> Any:
+        return orjson.loads(data)
+
+
+class MsgspecCodec(JSONCodec):
+    name = "msgspec"
+
+    def dumps(self, obj: Any, pretty: bool = False) -> bytes:
+        data = msgspec.json.encode(obj, enc_hook=to_jsonable)
+        return msgspec.json.format(data, indent=4) if pretty else data
+
+    def loads(self, data: bytes | str) -> Any:
+        try:
+            return msgspec.json.decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+
+CODECS = {"orjson": (OrjsonCodec, orjson), "msgspec": (MsgspecCodec, msgspec), "json": (JSONCodec, json)}
+
+
+def get_codec(name: str | None = None) -> JSONCodec:
+    """Codec escolhido por nome ou por MENTORIA_JSON_CODEC (auto, orjson, msgspec, json)
+
+    auto (padrão) usa o primeiro instalado entre orjson, msgspec e json.
+    """
+    name = (name or os.environ.get("MENTORIA_JSON_CODEC", "auto")).lower()
+    if name == "auto":
+        return next(cls() for cls, module in CODECS.values() if module is not None)
+    if name not in CODECS:
+        raise ValueError(f"Unknown JSON codec: {name}")
+    cls, module = CODECS[name]
+    if module is None:
+        raise ValueError(f"JSON codec {name} is not installed")
+    return cls()
+
+
+def available_codecs() -> list:
+    """Nomes dos codecs instalados (usado nos benchmarks)"""
+    return [name for name, (cls, module) in CODECS.items() if module is not None]
@@ -1,67 +1,746 @@
-import json
+import base64
+import binascii
+import gzip
+import hashlib
 import os
+import threading
+from array import array
+from bisect import bisect_right, insort
+from collections import Counter
+from contextlib import contextmanager, suppress
+from enum import Enum
 from pathlib import Path
-from typing import Dict, Any
+from typing import Callable, Dict, Any, FrozenSet, Iterable, Iterator, List, Mapping, NamedTuple, Set, Tuple
+
+try:
+    import brotli
+except ImportError:  # dependência opcional: sem ela só há as variantes identity e gzip
+    brotli = None
+
+from .codec import JSONCodec, get_codec
+from .journal import JournaledStorage
+from .metrics import LOCK_WAIT_SECONDS, timed, wait_timed
+from .records import Activity, ActivitiesView, ParticipantStore
+from .schedule import ScheduleIndex, Slot, Weekday, parse_schedule, parse_weekday
+from .users import Identity, UserDirectory
+from .locks import ReadWriteLock, StripedLock
+from .storage import (
+    StorageBackend, JSONStorage, ShardedJSONStorage, SQLiteStorage, Change, MEMBER_LISTS,
+    ADD_PARTICIPANT, REMOVE_PARTICIPANT, PUT_ACTIVITY, DELETE_ACTIVITY, ADD_WAITER, REMOVE_WAITER
+)
+
+# Séries do tempo de espera por lock (resolvidas uma vez, fora do caminho quente)
+_PROCESS_LOCK_WAIT = LOCK_WAIT_SECONDS.labels("process")
+_ENROLLMENT_LOCK_WAIT = LOCK_WAIT_SECONDS.labels("enrollment")
+_CATALOG_LOCK_WAIT = LOCK_WAIT_SECONDS.labels("catalog")
+_WRITE_LOCK_WAIT = LOCK_WAIT_SECONDS.labels("write")
+
+
+def create_storage(data_dir: Path) -> StorageBackend:
+    """Cria o backend de armazenamento configurado por variáveis de ambiente
+
+    MENTORIA_STORAGE=json (padrão) usa data/*.json;
+    MENTORIA_STORAGE=sharded usa um arquivo por atividade em data/activities/;
+    MENTORIA_STORAGE=sqlite usa MENTORIA_DB_PATH (padrão: data/mentoria.db).
+    MENTORIA_WRITE_BEHIND=1 envolve o backend em um journal append-only
+    (durabilidade em MENTORIA_JOURNAL_DURABILITY: op, batch ou periodic).
+    MENTORIA_JSON_PRETTY=1 grava os arquivos JSON indentados (o padrão é compacto).
+    """
+    engine = os.environ.get("MENTORIA_STORAGE", "json").lower()
+    pretty = os.environ.get("MENTORIA_JSON_PRETTY", "").lower() in ("1", "true", "yes")
+    if engine == "sqlite":
+        db_path = Path(os.environ.get("MENTORIA_DB_PATH", str(data_dir / "mentoria.db")))
+        storage = SQLiteStorage(db_path)
+        journal_path = db_path.with_name(db_path.name + ".journal")
+    elif engine == "json":
+        storage = JSONStorage(data_dir, pretty=pretty)
+        journal_path = data_dir / "activities.journal"
+    elif engine == "sharded":
+        storage = ShardedJSONStorage(data_dir, pretty=pretty)
+        journal_path = data_dir / "activities.journal"
+    else:
+        raise ValueError(f"Unknown storage engine: {engine}")
+    
+    if os.environ.get("MENTORIA_WRITE_BEHIND", "").lower() in ("1", "true", "yes"):
+        storage = JournaledStorage(
+            storage,
+            journal_path,
+            durability=os.environ.get("MENTORIA_JOURNAL_DURABILITY", "batch"),
+            compact_interval=float(os.environ.get("MENTORIA_JOURNAL_COMPACT_INTERVAL", "30")),
+            max_bytes=int(os.environ.get("MENTORIA_JOURNAL_MAX_BYTES", str(1024 * 1024)))
+        )
+    return storage
+
+
+class EnrollmentStatus(Enum):
+    """Resultado de uma tentativa de inscrição ou cancelamento"""
+    OK = "ok"
+    ACTIVITY_NOT_FOUND = "activity_not_found"
+    ALREADY_REGISTERED = "already_registered"
+    NOT_REGISTERED = "not_registered"
+    ACTIVITY_FULL = "activity_full"
+    SAME_DAY_CONFLICT = "same_day_conflict"
+    INVALID = "invalid"
+    WAITLISTED = "waitlisted"
+    ALREADY_WAITLISTED = "already_waitlisted"
+    NOT_WAITLISTED = "not_waitlisted"
+
+
+class EnrollmentResult(NamedTuple):
+    status: EnrollmentStatus
+    # Atividade já inscrita no mesmo dia (apenas para SAME_DAY_CONFLICT)
+    conflicting_activity: str = ""
+    # Posição na fila de espera, a partir de 1 (WAITLISTED e ALREADY_WAITLISTED)
+    position: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return self.status is EnrollmentStatus.OK
+
+
+# Acima disso (atividades distintas), um lote gravado vira um único evento "resync"
+MAX_EVENTS_PER_BATCH = 32
+
+# Mutações aceitas por DataManager.apply_mutations (operação -> método sem lock)
+MUTATIONS = {
+    "enroll": "_enroll_mutation",
+    "cancel": "_cancel_mutation",
+    "create": "_create_mutation",
+    "update": "_update_mutation",
+    "delete": "_delete_mutation",
+    "join_waitlist": "_join_waitlist_mutation",
+    "leave_waitlist": "_leave_waitlist_mutation",
+}
+
+# Campos aceitos na projeção da listagem (?fields=)
+ACTIVITY_FIELDS = (
+    "description", "schedule", "slot", "max_participants", "participants", "participants_count",
+    "waitlist_count"
+)
+
+
+def encode_cursor(activity_name: str) -> str:
+    """Cursor opaco de paginação: a última atividade da página anterior"""
+    return base64.urlsafe_b64encode(activity_name.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> str:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return base64.b64decode(padded.encode("ascii"), altchars=b"-_", validate=True).decode("utf-8")
+    except (binascii.Error, UnicodeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+
+def validate_new_activity(activity: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """Confere o formato de uma atividade a criar e devolve os participantes como (nome, e-mail)
+
+    Levanta ValueError se max_participants não for inteiro ou se algum
+    participante não for um objeto {name, email} com textos não vazios.
+    """
+    max_participants = activity.get("max_participants", 0)
+    if not isinstance(max_participants, int) or isinstance(max_participants, bool):
+        raise ValueError("max_participants must be an integer")
+    participants = activity.get("participants")
+    if participants is None:
+        return []
+    if not isinstance(participants, list):
+        raise ValueError("participants must be a list")
+    pairs = []
+    for participant in participants:
+        if not isinstance(participant, dict) or not all(
+            isinstance(participant.get(key), str) and participant[key].strip() for key in ("name", "email")
+        ):
+            raise ValueError("Each participant must be an object with non-empty name and email")
+        pairs.append((participant["name"].strip(), participant["email"].strip()))
+    return pairs
+
+
+class ActivitiesPayload(NamedTuple):
+    """Listagem de atividades já serializada para uma versão dos dados"""
+    version: int
+    etag: str
+    body: bytes
+    # Variantes comprimidas por Content-Encoding ("gzip", "br")
+    encoded: Dict[str, bytes]
+
 
 class DataManager:
-    def __init__(self):
-        self.data_dir = Path(__file__).parent / "data"
+    def __init__(self, data_dir: Path | None = None, storage: StorageBackend | None = None,
+                 multiprocess: bool | None = None, codec: JSONCodec | None = None):
+        self.data_dir = Path(data_dir) if data_dir else Path(__file__).parent / "data"
         self.activities_file = self.data_dir / "activities.json"
         self.users_file = self.data_dir / "users.json"
-        self._activities = None
+        self.storage = storage or create_storage(self.data_dir)
+        # Serializa a listagem pré-codificada (orjson/msgspec quando instalados, ver codec.py)
+        self.codec = codec or getattr(self.storage, "codec", None) or get_codec()
+        # Vários workers do uvicorn compartilhando o mesmo diretório de dados
+        if multiprocess is None:
+            multiprocess = os.environ.get("MENTORIA_MULTIPROCESS", "").lower() in ("1", "true", "yes")
+        self.multiprocess = multiprocess
+        # Registros compactos (ver records.py); _view os expõe no formato de dict
+        self._activities: Dict[str, Activity] | None = None
+        self._participants = ParticipantStore()
+        self._view: ActivitiesView | None = None
         self._users = None
+        self._directory: UserDirectory | None = None
+        self._signature = None  # versão do armazenamento refletida em memória
+        self._cache_stats = {"hits": 0, "misses": 0, "reloads": 0}
+        # Versão monotônica dos dados em memória: muda a cada mutação ou recarga
+        self._version = 0
+        self._payload: ActivitiesPayload | None = None
+        self._payload_lock = threading.Lock()
+        # Ouvintes de eventos de mudança (ex.: stream SSE da API)
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+        # Inscrições usam o lock global em modo leitura + o lock da atividade (e do e-mail);
+        # criação/remoção/recarga usam o lock global em modo escrita
+        self._rwlock = ReadWriteLock()
+        self._activity_locks = StripedLock()
+        self._email_locks = StripedLock()
+        self._write_lock = threading.Lock()
+        # Índices em memória, reconstruídos a cada carga e mantidos a cada mutação
+        self._participant_emails: Dict[str, Set[str]] = {}  # atividade -> e-mails inscritos
+        self._waitlist_emails: Dict[str, Set[str]] = {}  # atividade -> e-mails na fila de espera
+        # Projeção por usuário, mantida a cada mutação (ver check_projection)
+        self._enrollments: Dict[str, Dict[str, Weekday | None]] = {}  # e-mail -> {atividade: dia}
+        self._activity_days: Dict[str, Weekday | None] = {}  # atividade -> dia da semana
+        self._slots: Dict[str, Slot | None] = {}  # atividade -> horário estruturado
+        self._user_schedules: Dict[str, ScheduleIndex] = {}  # e-mail -> horários inscritos
+        # Índices da listagem filtrada/paginada
+        self._day_index: Dict[Weekday | None, Set[str]] = {}  # dia da semana -> atividades
+        self._available: Set[str] = set()  # atividades com vagas
+        self._search_text: Dict[str, str] = {}  # atividade -> "nome\ndescrição" em minúsculas
+        self._sorted_names: List[str] = []  # ordem estável dos cursores
+        self._projection_problems: int | None = None  # divergências na última check_projection
     
+    @timed("load_activities")
     def load_activities(self) -> Dict[str, Any]:
-        """Carrega as atividades do arquivo JSON"""
+        """Carrega as atividades do backend de armazenamento"""
+        if self._activities is None:
+            with self._rwlock.write():
+                if self._activities is None:
+                    self._cache_stats["misses"] += 1
+                    self._reload()
+        return self._view
+    
+    def get_activities(self, revalidate: bool = True) -> Mapping[str, Dict[str, Any]]:
+        """Retorna as atividades em memória, relendo o armazenamento só se ele mudou
+
+        A cópia em memória é a fonte da verdade após as gravações deste processo;
+        a revalidação compara apenas a assinatura (mtime/tamanho/inode no JSON).
+        Com revalidate=False, devolve a cópia em memória sem nenhum I/O.
+        """
         if self._activities is None:
+            return self.load_activities()
+        if not revalidate:
+            self._cache_stats["hits"] += 1
+            return self._view
+        if self.storage.signature() == self._signature:
+            self._cache_stats["hits"] += 1
+            return self._view
+        with self._rwlock.write():
+            if self.storage.signature() != self._signature:
+                self._cache_stats["reloads"] += 1
+                self._reload()
+        return self._view
+    
+    @property
+    def is_loaded(self) -> bool:
+        """Indica se as atividades já estão em memória"""
+        return self._activities is not None
+    
+    @property
+    def users_loaded(self) -> bool:
+        """Indica se os dados de usuários já estão em memória"""
+        return self._users is not None
+    
+    @property
+    def data_version(self) -> int:
+        """Versão atual dos dados de atividades em memória"""
+        return self._version
+    
+    @timed("get_activities_payload")
+    def get_activities_payload(self, revalidate: bool = True) -> ActivitiesPayload:
+        """Retorna a listagem pré-serializada (e comprimida), refeita só quando a versão muda"""
+        self.get_activities(revalidate)
+        payload = self.cached_activities_payload()
+        if payload is not None:
+            return payload
+        with self._payload_lock:
+            version = self._version
+            if self._payload is not None and self._payload.version == version:
+                return self._payload
+            # Mesmo formato do JSONResponse do FastAPI
+            store = self._participants
+            activities = {name: activity.to_public_dict(store) for name, activity in list(self._activities.items())}
+            body = self.codec.dumps(activities)
+            encoded = {"gzip": gzip.compress(body, compresslevel=6)}
+            if brotli is not None:
+                encoded["br"] = brotli.compress(body, quality=5)
+            etag = '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+            self._payload = ActivitiesPayload(version, etag, body, encoded)
+            return self._payload
+    
+    def cached_activities_payload(self) -> ActivitiesPayload | None:
+        """A listagem pré-serializada da versão atual, se já estiver pronta"""
+        payload = self._payload
+        if payload is not None and payload.version == self._version:
+            return payload
+        return None
+    
+    def subscribe(self, listener: Callable[[Dict[str, Any]], None]) -> None:
+        """Registra um ouvinte chamado com um evento compacto a cada mutação"""
+        self._listeners.append(listener)
+    
+    def unsubscribe(self, listener: Callable[[Dict[str, Any]], None]) -> None:
+        """Remove um ouvinte registrado com subscribe"""
+        with suppress(ValueError):
+            self._listeners.remove(listener)
+    
+    def _emit(self, event: Dict[str, Any]) -> None:
+        for listener in list(self._listeners):
             try:
-                with open(self.activities_file, 'r', encoding='utf-8') as f:
-                    self._activities = json.load(f)
-            except FileNotFoundError:
-                self._activities = {}
-        return self._activities
+                listener(event)
+            except Exception as e:
+                print(f"Error in change listener: {str(e)}")
     
-    def refresh_activities(self) -> Dict[str, Any]:
+    def _change_events(self, changes: List[Change]) -> List[Dict[str, Any]] | None:
+        """Eventos de um lote, cada um com as contagens logo após a sua mudança
+
+        As contagens partem do estado final e são desfeitas de trás para frente.
+        Retorna None quando não dá para reconstruí-las (atividade removida e
+        alterada no mesmo lote): os clientes recebem um "resync".
+        """
+        counts: Dict[str, List[int] | None] = {}
+        events = []
+        for change in reversed(changes):
+            op, activity_name, *args = change
+            if op == DELETE_ACTIVITY:
+                # Antes da remoção as contagens não estão mais em memória
+                counts[activity_name] = None
+                events.append({"type": "deleted", "activity": activity_name, "version": self._version})
+                continue
+            if activity_name not in counts:
+                activity = self._activities.get(activity_name) or Activity()
+                counts[activity_name] = [len(activity.participants), len(activity.waitlist)]
+            current = counts[activity_name]
+            if current is None:
+                return None
+            events.append(self._change_event(change, *current))
+            if op == ADD_PARTICIPANT:
+                current[0] -= 1
+            elif op == REMOVE_PARTICIPANT:
+                current[0] += 1
+            elif op == ADD_WAITER:
+                current[1] -= 1
+            elif op == REMOVE_WAITER:
+                current[1] += 1
+        events.reverse()
+        return events
+
+    def _change_event(self, change: Change, participants_count: int, waitlist_count: int) -> Dict[str, Any]:
+        """Converte uma mudança persistida no evento enviado aos clientes"""
+        op, activity_name, *args = change
+        activity = self._activities.get(activity_name) or Activity()
+        if op == ADD_PARTICIPANT:
+            return {
+                "type": "enrolled", "activity": activity_name, "participant": args[0],
+                "participants_count": participants_count, "version": self._version
+            }
+        if op == REMOVE_PARTICIPANT:
+            return {
+                "type": "canceled", "activity": activity_name, "email": args[0],
+                "participants_count": participants_count, "version": self._version
+            }
+        if op in (ADD_WAITER, REMOVE_WAITER):
+            return {
+                "type": "waitlist", "activity": activity_name,
+                "waitlist_count": waitlist_count,
+                "participants_count": participants_count, "version": self._version
+            }
+        return {
+            "type": "activity", "activity": activity_name,
+            "description": activity.description,
+            "schedule": activity.schedule,
+            "max_participants": activity.max_participants,
+            "participants_count": participants_count, "version": self._version
+        }
+    
+    def cache_stats(self) -> Dict[str, int]:
+        """Contadores do cache de atividades (acertos, primeiras cargas e recargas)"""
+        return dict(self._cache_stats)
+    
+    @timed("_reload")
+    def _reload(self) -> None:
+        """Lê o armazenamento e reconstrói os índices (chamado com o lock global em escrita)"""
+        signature = self.storage.signature()
+        store = ParticipantStore()
+        activities = {
+            name: Activity.from_dict(data, store) for name, data in self.storage.load_activities().items()
+        }
+        self._participants = store
+        self._build_indexes(activities)
+        self._activities = activities
+        self._view = ActivitiesView(activities, store)
+        self._signature = signature
+        self._version += 1
+        self._emit({"type": "resync", "version": self._version})
+    
+    @contextmanager
+    def _process_lock(self) -> Iterator[None]:
+        """Lock entre processos; recarrega os dados se outro worker gravou desde a última leitura"""
+        if not self.multiprocess:
+            yield
+            return
+        with wait_timed(_PROCESS_LOCK_WAIT, self.storage.lock()):
+            if self._activities is None or self.storage.signature() != self._signature:
+                with self._rwlock.write():
+                    self._reload()
+            yield
+    
+    @contextmanager
+    def _enrollment_lock(self, activity_name: str, email: str | None = None) -> Iterator[Dict[str, Any]]:
+        """Seção crítica de inscrição/cancelamento em uma única atividade"""
+        with self._process_lock():
+            self.load_activities()
+            with wait_timed(_ENROLLMENT_LOCK_WAIT, self._enrollment_locks(activity_name, email)):
+                yield self._activities
+    
+    @contextmanager
+    def _enrollment_locks(self, activity_name: str, email: str | None) -> Iterator[None]:
+        with self._rwlock.read(), self._activity_locks(activity_name), self._email_locks(email):
+            yield
+
+    @contextmanager
+    def _release_lock(self, activity_name: str, email: str) -> Iterator[Dict[str, Any]]:
+        """Seção crítica de um cancelamento: exclusiva se houver fila de espera
+
+        A promoção inscreve outros e-mails (cujos locks não temos), então só é
+        feita sob o lock exclusivo. Quem entra na fila usa o lock da atividade,
+        por isso a verificação é refeita depois de obtido o lock.
+        """
+        while True:
+            waiting = bool(self._waitlist_emails.get(activity_name))
+            lock = self._catalog_lock() if waiting else self._enrollment_lock(activity_name, email)
+            with lock as activities:
+                if waiting or not self._waitlist_emails.get(activity_name):
+                    yield activities
+                    return
+
+    @contextmanager
+    def _catalog_lock(self) -> Iterator[Dict[str, Any]]:
+        """Seção crítica exclusiva (criação, alteração e remoção de atividades)"""
+        with self._process_lock():
+            self.load_activities()
+            with wait_timed(_CATALOG_LOCK_WAIT, self._rwlock.write()):
+                yield self._activities
+    
+    def _build_indexes(self, activities: Dict[str, Activity]) -> None:
+        """Reconstrói os índices de inscrições a partir dos dados carregados"""
+        self._participant_emails = {}
+        self._waitlist_emails = {}
+        self._enrollments = {}
+        self._user_schedules = {}
+        self._activity_days = {}
+        self._slots = {}
+        self._day_index = {}
+        self._available = set()
+        self._search_text = {}
+        email_of = self._participants.email
+        for activity_name, activity in activities.items():
+            self._index_activity(activity_name, activity)
+            day = self._activity_days[activity_name]
+            slot = self._slots[activity_name]
+            emails = self._participant_emails[activity_name] = set()
+            for pid in activity.participants:
+                email = email_of(pid)
+                emails.add(email)
+                self._enrollments.setdefault(email, {})[activity_name] = day
+                if slot is not None:
+                    self._user_schedules.setdefault(email, ScheduleIndex()).add(activity_name, slot)
+            self._waitlist_emails[activity_name] = {email_of(pid) for pid in activity.waitlist}
+        self._sorted_names = sorted(activities)
+    
+    def _index_activity(self, activity_name: str, activity: Activity) -> None:
+        """Indexa os metadados de uma atividade (horário, vagas e texto de busca)"""
+        # O horário é interpretado uma única vez, aqui, e não a cada inscrição
+        slot = parse_schedule(activity.schedule)
+        day = slot.weekday if slot is not None else None
+        self._slots[activity_name] = slot
+        self._activity_days[activity_name] = day
+        self._day_index.setdefault(day, set()).add(activity_name)
+        self._search_text[activity_name] = f"{activity_name}\n{activity.description}".lower()
+        self._refresh_availability(activity_name, activity)
+    
+    def _unindex_activity(self, activity_name: str) -> None:
+        day = self._activity_days.pop(activity_name)
+        self._slots.pop(activity_name, None)
+        names = self._day_index.get(day)
+        if names is not None:
+            names.discard(activity_name)
+            if not names:
+                del self._day_index[day]
+        self._search_text.pop(activity_name, None)
+        self._available.discard(activity_name)
+    
+    def _refresh_availability(self, activity_name: str, activity: Activity) -> None:
+        if len(activity.participants) < activity.max_participants:
+            self._available.add(activity_name)
+        else:
+            self._available.discard(activity_name)
+    
+    def _index_enrollment(self, activity_name: str, email: str) -> None:
+        self._participant_emails[activity_name].add(email)
+        self._enrollments.setdefault(email, {})[activity_name] = self._activity_days[activity_name]
+        slot = self._slots[activity_name]
+        if slot is not None:
+            self._user_schedules.setdefault(email, ScheduleIndex()).add(activity_name, slot)
+        self._refresh_availability(activity_name, self._activities[activity_name])
+    
+    def _unindex_enrollment(self, activity_name: str, email: str) -> None:
+        self._participant_emails[activity_name].discard(email)
+        user_enrollments = self._enrollments.get(email)
+        if user_enrollments is not None:
+            user_enrollments.pop(activity_name, None)
+            if not user_enrollments:
+                del self._enrollments[email]
+        slot = self._slots.get(activity_name)
+        schedule = self._user_schedules.get(email)
+        if slot is not None and schedule is not None:
+            schedule.remove(activity_name, slot)
+            if not len(schedule):
+                del self._user_schedules[email]
+        if activity_name in self._activities:
+            self._refresh_availability(activity_name, self._activities[activity_name])
+    
+    def _reindex_user_slot(self, email: str, activity_name: str, old_slot: Slot | None, slot: Slot | None) -> None:
+        self._enrollments[email][activity_name] = slot.weekday if slot is not None else None
+        schedule = self._user_schedules.setdefault(email, ScheduleIndex())
+        if old_slot is not None:
+            schedule.remove(activity_name, old_slot)
+        if slot is not None:
+            schedule.add(activity_name, slot)
+        if not len(schedule):
+            del self._user_schedules[email]
+    
+    def refresh_activities(self) -> Mapping[str, Dict[str, Any]]:
         """Force refresh activities from file"""
-        self._activities = None
-        return self.load_activities()
+        with self._rwlock.write():
+            self._cache_stats["reloads"] += 1
+            self._reload()
+        return self._view
     
     def update_activity(self, activity_name: str, updates: Dict[str, Any]) -> bool:
         """Update an existing activity with new data"""
-        activities = self.load_activities()
-        if activity_name in activities:
-            activities[activity_name].update(updates)
-            self._activities = activities
-            self.save_activities()
-            return True
-        return False
+        with self._catalog_lock():
+            updated, changes = self._update_mutation(activity_name, updates)
+            if changes:
+                self._persist(changes)
+            return updated
+    
+    def _update_mutation(self, activity_name: str, updates: Dict[str, Any]) -> Tuple[bool, List[Change]]:
+        if activity_name not in self._activities:
+            return False, []
+        # Mais vagas (ou outro horário) podem liberar quem está na fila
+        return True, [self._modify_activity(activity_name, updates), *self._promote_waiters(activity_name)]
+    
+    def _modify_activity(self, activity_name: str, updates: Dict[str, Any]) -> Change:
+        activity = self._activities[activity_name]
+        activity.update(updates)
+        old_slot = self._slots[activity_name]
+        self._unindex_activity(activity_name)
+        self._index_activity(activity_name, activity)
+        slot = self._slots[activity_name]
+        if slot != old_slot:
+            # Mantém o horário de cada inscrição em sincronia com o novo horário
+            for email in self._participant_emails[activity_name]:
+                self._reindex_user_slot(email, activity_name, old_slot, slot)
+        return (PUT_ACTIVITY, activity_name, activity.metadata())
+    
+    def create_activity(self, activity_name: str, activity: Dict[str, Any]) -> bool:
+        """Cria uma nova atividade (retorna False se o nome já existe)"""
+        with self._catalog_lock():
+            created, changes = self._create_mutation(activity_name, activity)
+            if changes:
+                self._persist(changes)
+            return created
+    
+    def _create_mutation(self, activity_name: str, activity: Dict[str, Any]) -> Tuple[bool, List[Change]]:
+        if activity_name in self._activities:
+            return False, []
+        return True, self._insert_activity(activity_name, activity)
+    
+    def _insert_activity(self, activity_name: str, activity: Dict[str, Any]) -> List[Change]:
+        """Cria a atividade e inscreve os participantes informados como inscrições comuns
+
+        Cada participante passa por _check_enrollment (repetido, vagas, mesmo dia).
+        Formato inválido levanta ValueError antes de qualquer alteração; um
+        participante recusado desfaz a criação e levanta ValueError com o motivo.
+        """
+        participants = validate_new_activity(activity)
+        metadata = {k: v for k, v in activity.items() if k not in MEMBER_LISTS}
+        record = self._activities[activity_name] = Activity.from_dict(metadata, self._participants)
+        self._index_activity(activity_name, record)
+        insort(self._sorted_names, activity_name)
+        self._participant_emails[activity_name] = set()
+        self._waitlist_emails[activity_name] = set()
+        changes = [(PUT_ACTIVITY, activity_name, record.metadata())]
+        for name, email in participants:
+            result = self._check_enrollment(activity_name, email)
+            if not result.ok:
+                self._delete_mutation(activity_name)
+                detail = f" ('{result.conflicting_activity}')" if result.conflicting_activity else ""
+                raise ValueError(f"Participant {email} cannot be enrolled: {result.status.value}{detail}")
+            changes.append(self._insert_participant(activity_name, name, email))
+        return changes
+    
+    def delete_activity(self, activity_name: str) -> bool:
+        """Remove uma atividade e todas as suas inscrições"""
+        with self._catalog_lock():
+            deleted, changes = self._delete_mutation(activity_name)
+            if changes:
+                self._persist(changes)
+            return deleted
     
+    def _delete_mutation(self, activity_name: str) -> Tuple[bool, List[Change]]:
+        activities = self._activities
+        if activity_name not in activities:
+            return False, []
+        for email in list(self._participant_emails[activity_name]):
+            self._unindex_enrollment(activity_name, email)
+        del activities[activity_name]
+        del self._participant_emails[activity_name]
+        del self._waitlist_emails[activity_name]
+        self._unindex_activity(activity_name)
+        self._sorted_names.remove(activity_name)
+        return True, [(DELETE_ACTIVITY, activity_name)]
+    
+    @timed("save_activities")
     def save_activities(self) -> None:
-        """Salva as atividades no arquivo JSON"""
+        """Salva o snapshot completo das atividades"""
         if self._activities is not None:
-            # Certifica que o diretório existe
-            self.data_dir.mkdir(exist_ok=True)
-            with open(self.activities_file, 'w', encoding='utf-8') as f:
-                json.dump(self._activities, f, ensure_ascii=False, indent=4)
-            # Clear cache to force reload on next access
-            self._activities = None
+            # O cache em memória continua válido: descartá-lo aqui obrigaria quem
+            # está dentro de uma seção crítica a recarregar o arquivo
+            with self._catalog_lock():
+                with self._write_lock:
+                    self.storage.save_activities(self._view)
+                    self._signature = self.storage.signature()
+                    self._version += 1
+                    self._emit({"type": "resync", "version": self._version})
+    
+    @timed("_persist")
+    def _persist(self, changes: List[Change]) -> None:
+        """Persiste apenas as mudanças informadas; o cache em memória continua válido"""
+        with wait_timed(_WRITE_LOCK_WAIT, self._write_lock):
+            self._version += 1
+            self.storage.apply_changes(self._view, changes)
+            self._signature = self.storage.signature()
+            if self._listeners:
+                events = None
+                if len({change[1] for change in changes}) <= MAX_EVENTS_PER_BATCH:
+                    events = self._change_events(changes)
+                if events is None:
+                    self._emit({"type": "resync", "version": self._version})
+                    return
+                for event in events:
+                    self._emit(event)
+    
+    def _persist_batch(self, changes: List[Change]) -> None:
+        """Persiste um lote aplicado sob o lock exclusivo; se a gravação falhar, volta ao estado gravado
+
+        Sem isso, as mutações do lote ficariam só em memória (índices, versão e
+        listagem) enquanto todos os chamadores recebem o erro.
+        """
+        try:
+            self._persist(changes)
+        except Exception:
+            try:
+                self._reload()
+            except Exception as e:
+                # Armazenamento ainda indisponível: a próxima leitura recarrega
+                print(f"Error reloading activities after a failed write: {str(e)}")
+                self._activities = None
+            raise
     
     def load_users(self) -> Dict[str, Any]:
-        """Carrega os dados de usuários do arquivo JSON"""
+        """Carrega os dados de usuários do backend de armazenamento"""
         if self._users is None:
-            try:
-                with open(self.users_file, 'r', encoding='utf-8') as f:
-                    self._users = json.load(f)
-            except FileNotFoundError:
-                self._users = {"profiles": {}, "current_user": {}}
+            self._users = self.storage.load_users()
         return self._users
     
     def save_users(self) -> None:
-        """Salva os dados de usuários no arquivo JSON"""
+        """Salva os dados de usuários"""
         if self._users is not None:
-            self.data_dir.mkdir(exist_ok=True)
-            with open(self.users_file, 'w', encoding='utf-8') as f:
-                json.dump(self._users, f, ensure_ascii=False, indent=4)
+            self.storage.save_users(self._users)
+            self._directory = None
+    
+    @timed("query_activities")
+    def query_activities(self, day: str | None = None, available: bool | None = None,
+                         search: str | None = None, fields: Iterable[str] | None = None,
+                         cursor: str | None = None, limit: int | None = None,
+                         revalidate: bool = True) -> Tuple[Dict[str, Any], str | None]:
+        """Lista atividades filtradas por dia/vagas/texto, paginadas por cursor e com projeção
+
+        Os filtros de dia e de vagas partem dos índices pré-calculados; só a busca
+        textual percorre os candidatos restantes. Retorna (página, próximo cursor).
+        """
+        self.get_activities(revalidate)
+        activities = self._activities
+        fields = list(fields) if fields is not None else None
+        if fields is not None and any(f not in ACTIVITY_FIELDS for f in fields):
+            raise ValueError(f"Invalid fields (allowed: {', '.join(ACTIVITY_FIELDS)})")
+        
+        candidates = None
+        if day is not None:
+            candidates = set(self._day_index.get(day, ()))
+        if available is not None:
+            with_seats = set(self._available)
+            if available:
+                candidates = with_seats if candidates is None else candidates & with_seats
+            else:
+                candidates = (set(activities) if candidates is None else candidates) - with_seats
+        names = list(self._sorted_names) if candidates is None else sorted(candidates)
+        
+        start = bisect_right(names, decode_cursor(cursor)) if cursor else 0
+        needle = search.lower() if search else None
+        page = {}
+        next_cursor = None
+        for name in names[start:]:
+            if needle and needle not in self._search_text.get(name, ""):
+                continue
+            activity = activities.get(name)
+            if activity is None:
+                continue
+            if limit is not None and len(page) >= limit:
+                # Só há próxima página se mais uma atividade passa pelos filtros
+                next_cursor = encode_cursor(next(reversed(page)))
+                break
+            if fields is None:
+                page[name] = activity.to_public_dict(self._participants)
+            else:
+                page[name] = self._project(name, activity, fields)
+        return page, next_cursor
+    
+    def _project(self, activity_name: str, activity: Activity, fields: List[str]) -> Dict[str, Any]:
+        store = self._participants
+        projected = {}
+        for field in fields:
+            if field == "participants_count":
+                projected[field] = len(activity.participants)
+            elif field == "waitlist_count":
+                projected[field] = len(activity.waitlist)
+            elif field == "slot":
+                slot = self._slots.get(activity_name)
+                projected[field] = slot.to_dict() if slot is not None else None
+            elif field == "participants":
+                projected[field] = [store.to_dict(pid) for pid in activity.participants]
+            else:
+                projected[field] = getattr(activity, field)
+        return projected
+    
+    def normalize_day(self, day: str) -> Weekday | None:
+        """Converte um nome de dia da semana (ex.: "Quarta", "monday") na chave usada pelos índices"""
+        return parse_weekday(day)
     
     def get_activity(self, activity_name: str) -> Dict[str, Any] | None:
         """Obtém uma atividade específica"""
@@ -75,190 +754,410 @@ class DataManager:
     
     def add_participant(self, activity_name: str, name: str, email: str) -> bool:
         """Adiciona um participante a uma atividade"""
-        activities = self.load_activities()
-        if activity_name in activities:
-            activity = activities[activity_name]
-            # Verifica se já existe um participante com este email
-            existing_participant = next((
-                p for p in activity["participants"] 
-                if (p.get("email") == email if isinstance(p, dict) else p == email)
-            ), None)
-            if not existing_participant:
-                activity["participants"].append({"name": name, "email": email})
-                self.save_activities()
-                return True
-        return False
+        with self._enrollment_lock(activity_name, email) as activities:
+            if activity_name in activities:
+                # Verifica se já existe um participante com este email
+                if email not in self._participant_emails[activity_name]:
+                    self._add_participant(activity_name, name, email)
+                    return True
+            return False
     
     def remove_participant(self, activity_name: str, email: str) -> bool:
-        """Remove um participante de uma atividade"""
-        activities = self.load_activities()
-        if activity_name in activities:
-            activity = activities[activity_name]
-            activity["participants"] = [
-                p for p in activity["participants"] 
-                if not (p.get("email") == email if isinstance(p, dict) else p == email)
-            ]
-            self.save_activities()
-            return True
-        return False
+        """Remove um participante de uma atividade (promovendo quem está na fila de espera)"""
+        with self._release_lock(activity_name, email) as activities:
+            if activity_name in activities:
+                self._persist([
+                    self._delete_participant(activity_name, email), *self._promote_waiters(activity_name)
+                ])
+                return True
+            return False
+    
+    def _add_participant(self, activity_name: str, name: str, email: str) -> None:
+        self._persist([self._insert_participant(activity_name, name, email)])
+    
+    def _insert_participant(self, activity_name: str, name: str, email: str) -> Change:
+        self._activities[activity_name].participants.append(self._participants.intern(name, email))
+        self._index_enrollment(activity_name, email)
+        return (ADD_PARTICIPANT, activity_name, {"name": name, "email": email})
+    
+    def _delete_participant(self, activity_name: str, email: str) -> Change:
+        if email in self._participant_emails[activity_name]:
+            activity = self._activities[activity_name]
+            email_of = self._participants.email
+            activity.participants = array("I", (pid for pid in activity.participants if email_of(pid) != email))
+            self._unindex_enrollment(activity_name, email)
+        return (REMOVE_PARTICIPANT, activity_name, email)
+    
+    @timed("try_enroll")
+    def try_enroll(self, activity_name: str, name: str, email: str) -> EnrollmentResult:
+        """Valida e inscreve um participante em uma única passada pelos índices"""
+        with self._enrollment_lock(activity_name, email):
+            result, changes = self._enroll_mutation(activity_name, name, email)
+            if changes:
+                self._persist(changes)
+            return result
+    
+    def _enroll_mutation(self, activity_name: str, name: str, email: str) -> Tuple[EnrollmentResult, List[Change]]:
+        result = self._check_enrollment(activity_name, email)
+        if not result.ok:
+            return result, []
+        changes = [self._insert_participant(activity_name, name, email)]
+        if email in self._waitlist_emails[activity_name]:
+            changes.append(self._dequeue_waiter(activity_name, email))
+        return result, changes
+    
+    def _check_enrollment(self, activity_name: str, email: str) -> EnrollmentResult:
+        activity = self._activities.get(activity_name)
+        if activity is None:
+            return EnrollmentResult(EnrollmentStatus.ACTIVITY_NOT_FOUND)
+        
+        if email in self._participant_emails[activity_name]:
+            return EnrollmentResult(EnrollmentStatus.ALREADY_REGISTERED)
+        
+        if len(activity.participants) >= activity.max_participants:
+            return EnrollmentResult(EnrollmentStatus.ACTIVITY_FULL)
+        
+        conflict = self._same_day_conflict(activity_name, email)
+        if conflict:
+            return EnrollmentResult(EnrollmentStatus.SAME_DAY_CONFLICT, conflict)
+        return EnrollmentResult(EnrollmentStatus.OK)
+    
+    @timed("bulk_enroll")
+    def bulk_enroll(self, rows: Iterable[Tuple[str, str, str]]) -> List[EnrollmentResult]:
+        """Inscreve vários (atividade, nome, e-mail) com uma única gravação
+
+        Cada linha é validada contra os índices já atualizados pelas linhas
+        anteriores do lote (duplicatas, vagas e conflitos de dia dentro do próprio
+        lote também são detectados). Retorna um resultado por linha, na ordem.
+        """
+        results = []
+        changes = []
+        with self._catalog_lock():
+            for activity_name, name, email in rows:
+                if not activity_name or not name or not email:
+                    results.append(EnrollmentResult(EnrollmentStatus.INVALID))
+                    continue
+                result, row_changes = self._enroll_mutation(activity_name, name, email)
+                changes.extend(row_changes)
+                results.append(result)
+            if changes:
+                self._persist_batch(changes)
+        return results
+    
+    @timed("import_activities")
+    def import_activities(self, activities: Dict[str, Dict[str, Any]],
+                          upsert: bool = False) -> Dict[str, Tuple[str, str]]:
+        """Cria (ou, com upsert, atualiza) várias atividades com uma única gravação
+
+        Retorna (resultado, detalhe) por atividade, com resultado "created",
+        "updated", "exists" ou "rejected" (algum participante recusado; a atividade
+        não é criada). Participantes informados só são considerados na criação.
+        Um lote com formato inválido levanta ValueError sem alterar nada.
+        """
+        for activity in activities.values():
+            validate_new_activity(activity)
+        results = {}
+        changes = []
+        with self._catalog_lock() as current:
+            for activity_name, activity in activities.items():
+                if activity_name not in current:
+                    try:
+                        changes.extend(self._insert_activity(activity_name, activity))
+                    except ValueError as e:
+                        results[activity_name] = ("rejected", str(e))
+                        continue
+                    results[activity_name] = ("created", "")
+                elif upsert:
+                    updates = {k: v for k, v in activity.items() if k not in ("participants", "waitlist")}
+                    changes.append(self._modify_activity(activity_name, updates))
+                    changes.extend(self._promote_waiters(activity_name))
+                    results[activity_name] = ("updated", "")
+                else:
+                    results[activity_name] = ("exists", "Mentorship with this name already exists")
+            if changes:
+                self._persist_batch(changes)
+        return results
+    
+    @timed("try_cancel")
+    def try_cancel(self, activity_name: str, email: str) -> EnrollmentResult:
+        """Valida e cancela a inscrição de um participante em uma única passada"""
+        with self._release_lock(activity_name, email):
+            result, changes = self._cancel_mutation(activity_name, email)
+            if changes:
+                self._persist(changes)
+            return result
+    
+    def _cancel_mutation(self, activity_name: str, email: str) -> Tuple[EnrollmentResult, List[Change]]:
+        emails = self._participant_emails.get(activity_name)
+        if emails is None:
+            return EnrollmentResult(EnrollmentStatus.ACTIVITY_NOT_FOUND), []
+        if email not in emails:
+            return EnrollmentResult(EnrollmentStatus.NOT_REGISTERED), []
+        changes = [self._delete_participant(activity_name, email), *self._promote_waiters(activity_name)]
+        return EnrollmentResult(EnrollmentStatus.OK), changes
+    
+    def join_waitlist(self, activity_name: str, name: str, email: str) -> EnrollmentResult:
+        """Entra na fila de espera de uma atividade lotada (ou inscreve, se houver vaga)"""
+        with self._enrollment_lock(activity_name, email):
+            result, changes = self._join_waitlist_mutation(activity_name, name, email)
+            if changes:
+                self._persist(changes)
+            return result
+    
+    def _join_waitlist_mutation(self, activity_name: str, name: str, email: str) -> Tuple[EnrollmentResult, List[Change]]:
+        result, changes = self._enroll_mutation(activity_name, name, email)
+        if result.status is not EnrollmentStatus.ACTIVITY_FULL:
+            return result, changes
+        waitlist = self._activities[activity_name].waitlist
+        if email in self._waitlist_emails[activity_name]:
+            position = self._waitlist_position(waitlist, email)
+            return EnrollmentResult(EnrollmentStatus.ALREADY_WAITLISTED, position=position), []
+        # Quem não poderia ser promovido (mesmo dia) não entra na fila
+        conflict = self._same_day_conflict(activity_name, email)
+        if conflict:
+            return EnrollmentResult(EnrollmentStatus.SAME_DAY_CONFLICT, conflict), []
+        waitlist.append(self._participants.intern(name, email))
+        self._waitlist_emails[activity_name].add(email)
+        result = EnrollmentResult(EnrollmentStatus.WAITLISTED, position=len(waitlist))
+        return result, [(ADD_WAITER, activity_name, {"name": name, "email": email})]
+    
+    def leave_waitlist(self, activity_name: str, email: str) -> EnrollmentResult:
+        """Sai da fila de espera de uma atividade"""
+        with self._enrollment_lock(activity_name, email):
+            result, changes = self._leave_waitlist_mutation(activity_name, email)
+            if changes:
+                self._persist(changes)
+            return result
+    
+    def _leave_waitlist_mutation(self, activity_name: str, email: str) -> Tuple[EnrollmentResult, List[Change]]:
+        waiting = self._waitlist_emails.get(activity_name)
+        if waiting is None:
+            return EnrollmentResult(EnrollmentStatus.ACTIVITY_NOT_FOUND), []
+        if email not in waiting:
+            return EnrollmentResult(EnrollmentStatus.NOT_WAITLISTED), []
+        return EnrollmentResult(EnrollmentStatus.OK), [self._dequeue_waiter(activity_name, email)]
+    
+    def _dequeue_waiter(self, activity_name: str, email: str) -> Change:
+        waitlist = self._activities[activity_name].waitlist
+        email_of = self._participants.email
+        waitlist.remove(next(pid for pid in waitlist if email_of(pid) == email))
+        self._waitlist_emails[activity_name].discard(email)
+        return (REMOVE_WAITER, activity_name, email)
+    
+    def _promote_waiters(self, activity_name: str) -> List[Change]:
+        """Inscreve, em ordem de chegada, quem está na fila enquanto houver vagas
+
+        Chamado com o lock exclusivo. Quem já tem outra atividade no mesmo dia é
+        pulado (e continua na fila, na mesma posição).
+        """
+        activity = self._activities[activity_name]
+        store = self._participants
+        changes = []
+        for pid in list(activity.waitlist):
+            if len(activity.participants) >= activity.max_participants:
+                break
+            waiter = store.get(pid)
+            if waiter.email in self._participant_emails[activity_name]:
+                # Já inscrita por outro caminho: só sai da fila
+                changes.append(self._dequeue_waiter(activity_name, waiter.email))
+                continue
+            if self._same_day_conflict(activity_name, waiter.email):
+                continue
+            changes.append(self._dequeue_waiter(activity_name, waiter.email))
+            changes.append(self._insert_participant(activity_name, waiter.name, waiter.email))
+        return changes
+    
+    def _waitlist_position(self, waitlist: Iterable[int], email: str) -> int:
+        email_of = self._participants.email
+        return next((i for i, pid in enumerate(waitlist, 1) if email_of(pid) == email), 0)
+    
+    def get_waitlist_position(self, activity_name: str, email: str) -> int:
+        """Posição do e-mail na fila de espera da atividade (0 se não estiver na fila)"""
+        self.load_activities()
+        if email not in self._waitlist_emails.get(activity_name, ()):
+            return 0
+        return self._waitlist_position(list(self._activities[activity_name].waitlist), email)
+    
+    @timed("apply_mutations")
+    def apply_mutations(self, mutations: List[Tuple[str, tuple]]) -> List[Any]:
+        """Aplica várias mutações sob um único lock exclusivo, com uma única gravação
+
+        Cada mutação é (operação, argumentos), com operação em MUTATIONS. Retorna
+        o resultado de cada uma, na ordem; uma mutação que falha devolve a exceção
+        no lugar do resultado, sem impedir as demais.
+        """
+        results = []
+        changes = []
+        with self._catalog_lock():
+            for op, args in mutations:
+                try:
+                    result, op_changes = getattr(self, MUTATIONS[op])(*args)
+                except Exception as e:
+                    results.append(e)
+                    continue
+                results.append(result)
+                changes.extend(op_changes)
+            if changes:
+                self._persist_batch(changes)
+        return results
     
     def is_participant_registered(self, activity_name: str, email: str) -> bool:
         """Verifica se um participante está registrado em uma atividade"""
-        activity = self.get_activity(activity_name)
-        if activity:
-            return any(
-                (p.get("email") == email if isinstance(p, dict) else p == email)
-                for p in activity["participants"]
-            )
-        return False
+        self.load_activities()
+        return email in self._participant_emails.get(activity_name, ())
     
     def is_activity_full(self, activity_name: str) -> bool:
         """Verifica se uma atividade está lotada"""
-        activity = self.get_activity(activity_name)
+        self.load_activities()
+        activity = self._activities.get(activity_name)
         if activity:
-            return len(activity["participants"]) >= activity["max_participants"]
+            return len(activity.participants) >= activity.max_participants
         return False
     
+    @timed("get_participant_activities_by_day")
     def get_participant_activities_by_day(self, email: str) -> Dict[str, list]:
         """Obtém todas as atividades de um participante agrupadas por dia da semana"""
-        activities = self.load_activities()
+        self.load_activities()
         participant_activities_by_day = {}
         
-        for activity_name, activity_data in activities.items():
-            # Verifica se o participante está inscrito (compatível com ambos os formatos)
-            is_registered = any(
-                (p.get("email") == email if isinstance(p, dict) else p == email)
-                for p in activity_data["participants"]
-            )
-            if is_registered:
-                day = self._extract_day_from_schedule(activity_data["schedule"])
-                if day:
-                    if day not in participant_activities_by_day:
-                        participant_activities_by_day[day] = []
-                    participant_activities_by_day[day].append(activity_name)
+        # Cópia atômica (sob o GIL): outras threads podem inscrever este e-mail em paralelo
+        for activity_name, day in list(self._enrollments.get(email, {}).items()):
+            if day is not None:
+                participant_activities_by_day.setdefault(day.key, []).append(activity_name)
         
         return participant_activities_by_day
     
-    def _extract_day_from_schedule(self, schedule: str) -> str | None:
+    def _extract_day_from_schedule(self, schedule: str) -> Weekday | None:
         """Extrai o dia da semana do horário"""
-        schedule_lower = schedule.lower()
-        days = {
-            'segunda': 'segunda',
-            'segund': 'segunda',
-            'terça': 'terca',
-            'terç': 'terca',
-            'quarta': 'quarta',
-            'quart': 'quarta',
-            'quinta': 'quinta',
-            'quint': 'quinta',
-            'sexta': 'sexta',
-            'sext': 'sexta',
-            'sábado': 'sabado',
-            'sabad': 'sabado',
-            'domingo': 'domingo',
-            'doming': 'domingo'
-        }
-        
-        for day_key, day_value in days.items():
-            if day_key in schedule_lower:
-                return day_value
-        return None
+        return parse_weekday(schedule)
+    
+    def _same_day_conflict(self, activity_name: str, email: str) -> str:
+        """Atividade do participante no mesmo dia da semana ("" se não houver)
+
+        Consulta o índice de horários do participante: prefere uma atividade com
+        sobreposição real de horário e, se não houver, qualquer uma do mesmo dia.
+        """
+        slot = self._slots.get(activity_name)
+        schedule = self._user_schedules.get(email)
+        if slot is None or schedule is None:
+            return ""
+        for existing_activity in schedule.overlapping(slot) + schedule.on_day(slot.weekday):
+            if existing_activity != activity_name:
+                return existing_activity
+        return ""
     
     def has_activity_on_same_day(self, activity_name: str, email: str) -> bool:
         """Verifica se o participante já tem uma atividade no mesmo dia"""
-        activity = self.get_activity(activity_name)
-        if not activity:
-            return False
-            
-        activity_day = self._extract_day_from_schedule(activity["schedule"])
-        if not activity_day:
-            return False
-            
-        participant_activities_by_day = self.get_participant_activities_by_day(email)
-        
-        # Verifica se já tem alguma atividade no mesmo dia
-        return activity_day in participant_activities_by_day and len(participant_activities_by_day[activity_day]) > 0
-    
-    def get_current_user(self) -> Dict[str, Any]:
-        """Obtém o usuário atual"""
-        users_data = self.load_users()
-        return users_data.get("current_user", {})
-    
-    def get_user_permissions(self) -> list:
-        """Obtém as permissões do usuário atual"""
-        users_data = self.load_users()
-        current_user = users_data.get("current_user", {})
-        profile_name = current_user.get("profile", "participant")
-        profiles = users_data.get("profiles", {})
-        profile = profiles.get(profile_name, {})
-        return profile.get("permissions", ["read"])
-    
-    def has_permission(self, permission: str) -> bool:
-        """Verifica se o usuário atual tem uma permissão específica"""
-        permissions = self.get_user_permissions()
-        return permission in permissions
-    
-    def switch_user_profile(self, profile_name: str) -> bool:
-        """Alterna o perfil do usuário atual (simulação) e muda o usuário"""
-        try:
-            # Recarrega os dados do arquivo
-            with open(self.users_file, 'r', encoding='utf-8') as f:
-                users_data = json.load(f)
-            
-            profiles = users_data.get("profiles", {})
-            users = users_data.get("users", {})
-            
-            if profile_name in profiles and profile_name in users:
-                # Muda para o usuário específico deste perfil
-                users_data["current_user"] = users[profile_name].copy()
-                
-                # Salva as alterações
-                with open(self.users_file, 'w', encoding='utf-8') as f:
-                    json.dump(users_data, f, ensure_ascii=False, indent=4)
-                
-                # Limpa o cache
-                self._users = None
-                return True
-            return False
-        except Exception as e:
-            print(f"Error in switch_user_profile: {str(e)}")
-            return False
+        self.load_activities()
+        return bool(self._same_day_conflict(activity_name, email))
+    
+    def get_user_directory(self) -> UserDirectory:
+        """Tabela imutável de usuários e permissões, montada uma única vez"""
+        directory = self._directory
+        if directory is None:
+            directory = self._directory = UserDirectory.from_data(self.load_users())
+        return directory
+    
+    def get_identity(self, user_key: str | None = None) -> Identity:
+        """Identidade de um usuário (a padrão quando não há sessão)"""
+        return self.get_user_directory().identity(user_key)
+    
+    def get_current_user(self, user_key: str | None = None) -> Dict[str, Any]:
+        """Obtém o usuário da sessão"""
+        return dict(self.get_identity(user_key).user)
+    
+    def get_user_permissions(self, user_key: str | None = None) -> FrozenSet[str]:
+        """Obtém as permissões do usuário da sessão"""
+        return self.get_identity(user_key).permissions
     
-    def get_current_user_activities(self) -> list:
-        """Obtém as atividades em que o usuário atual está inscrito"""
-        current_user = self.get_current_user()
-        email = current_user.get("email", "")
+    def has_permission(self, permission: str, user_key: str | None = None) -> bool:
+        """Verifica se o usuário da sessão tem uma permissão específica"""
+        return permission in self.get_identity(user_key).permissions
+    
+    def get_current_user_activities(self, user_key: str | None = None) -> list:
+        """Obtém as atividades em que o usuário da sessão está inscrito"""
+        email = self.get_identity(user_key).user.get("email", "")
         
         if not email:
             return []
             
-        activities = self.load_activities()
-        user_activities = []
-        
-        for activity_name, activity_data in activities.items():
-            is_registered = any(
-                (p.get("email") == email if isinstance(p, dict) else p == email)
-                for p in activity_data["participants"]
-            )
-            if is_registered:
-                user_activities.append(activity_name)
-                
-        return user_activities
+        self.load_activities()
+        return list(self._enrollments.get(email, {}))
+    
+    def check_projection(self, activities: Mapping[str, Dict[str, Any]] | None = None) -> List[str]:
+        """Confere a projeção por usuário com uma varredura completa dos dados primários
+
+        A projeção (e-mail -> atividades com dia e horário, mais os e-mails
+        inscritos e na fila de cada atividade) é montada na carga e depois só
+        atualizada incrementalmente. Por padrão a varredura usa as atividades em
+        memória do processo (GET /admin/projection-check na API); o comando
+        `python -m src.manage check-projection` sem --url passa as lidas do
+        armazenamento. Inscrições repetidas também contam como divergência.
+        Retorna as divergências (vazia se estiver consistente).
+        """
+        self.load_activities()
+        with self._rwlock.write():
+            source = self._view if activities is None else activities
+            problems = []
+            for activity_name in sorted(set(source) ^ set(self._activities)):
+                where = "memory" if activity_name in self._activities else "the primary data"
+                problems.append(f"{activity_name}: only in {where}")
+
+            def email(participant: Any) -> str:
+                return participant.get("email", "") if isinstance(participant, dict) else participant
+
+            enrollments: Dict[str, Dict[str, Weekday | None]] = {}
+            schedules: Dict[str, Set[Tuple[str, Slot]]] = {}
+            for activity_name, activity in source.items():
+                slot = parse_schedule(activity.get("schedule", ""))
+                participants = Counter(email(p) for p in activity.get("participants", ()))
+                waiting = Counter(email(w) for w in activity.get("waitlist", ()))
+                for participant_email, count in sorted(participants.items()):
+                    if count > 1:
+                        problems.append(f"{activity_name}: {participant_email} enrolled {count} times")
+                for participant_email, count in sorted(waiting.items()):
+                    if count > 1:
+                        problems.append(f"{activity_name}: {participant_email} queued {count} times")
+                for participant_email in sorted(participants.keys() & waiting.keys()):
+                    problems.append(f"{activity_name}: {participant_email} both enrolled and queued")
+                emails = set(participants)
+                for participant_email in emails:
+                    enrollments.setdefault(participant_email, {})[activity_name] = slot.weekday if slot else None
+                    if slot is not None:
+                        schedules.setdefault(participant_email, set()).add((activity_name, slot))
+                if activity_name not in self._activities:
+                    continue
+                if self._slots.get(activity_name) != slot:
+                    problems.append(f"{activity_name}: indexed slot {self._slots.get(activity_name)} != {slot}")
+                if self._participant_emails.get(activity_name) != emails:
+                    problems.append(f"{activity_name}: indexed participants differ")
+                if self._waitlist_emails.get(activity_name) != set(waiting):
+                    problems.append(f"{activity_name}: indexed waitlist differs")
+
+            for participant_email in sorted(set(enrollments) | set(self._enrollments)):
+                projected = self._enrollments.get(participant_email, {})
+                if projected != enrollments.get(participant_email, {}):
+                    problems.append(
+                        f"{participant_email}: projection {sorted(projected)} != data "
+                        f"{sorted(enrollments.get(participant_email, {}))}"
+                    )
+            for participant_email in sorted(set(schedules) | set(self._user_schedules)):
+                schedule = self._user_schedules.get(participant_email)
+                if (schedule.entries() if schedule else set()) != schedules.get(participant_email, set()):
+                    problems.append(f"{participant_email}: projected time slots differ")
+            if activities is None:
+                self._projection_problems = len(problems)
+            return problems
+    
+    @property
+    def projection_problems(self) -> int | None:
+        """Divergências encontradas na última verificação em memória (None se nunca rodou)"""
+        return self._projection_problems
     
     def get_user_activity_same_day(self, activity_name: str, user_email: str) -> str:
         """Retorna o nome da atividade que o usuário já tem no mesmo dia"""
-        activities_by_day = self.get_participant_activities_by_day(user_email)
-        activity = self.get_activity(activity_name)
-        
-        if not activity:
-            return ""
-            
-        activity_day = self._extract_day_from_schedule(activity["schedule"])
-        if not activity_day:
-            return ""
-            
-        existing_activities = activities_by_day.get(activity_day, [])
-        return existing_activities[0] if existing_activities else ""
+        self.load_activities()
+        return self._same_day_conflict(activity_name, user_email)
 
 # Instância global do gerenciador de dados
 data_manager = DataManager()
@@ -0,0 +1,81 @@
+import asyncio
+import json
+from typing import AsyncIterator, Dict, Any, Set
+
+# Intervalo entre comentários de keepalive (mantém proxies e o navegador conectados)
+KEEPALIVE_SECONDS = 15.0
+
+# Evento enviado a um cliente lento cuja fila estourou: ele deve recarregar a listagem
+RESYNC_EVENT = {"type": "resync"}
+
+
+def format_sse(event: Dict[str, Any]) -> bytes:
+    """Codifica um evento no formato Server-Sent Events"""
+    data = json.dumps(event, ensure_ascii=False, separators=(",", ":"))
+    lines = [f"event: {event.get('type', 'message')}"]
+    if "version" in event:
+        lines.append(f"id: {event['version']}")
+    lines.append(f"data: {data}")
+    return ("\n".join(lines) + "\n\n").encode("utf-8")
+
+
+class EventBroadcaster:
+    """Distribui eventos de mudança para os clientes SSE conectados
+
+    Cada cliente tem uma fila asyncio limitada, consumida pela sua própria
+    resposta em streaming (sem uma thread por conexão). Quando um cliente lento
+    enche a fila, o backlog dele é descartado e substituído por um único evento
+    `resync`, para que a memória não cresça com conexões paradas.
+    """
+
+    def __init__(self, queue_size: int = 64):
+        self.queue_size = queue_size
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        """Publica um evento; pode ser chamado de qualquer thread"""
+        loop = self._loop
+        if loop is None or not self._subscribers or loop.is_closed():
+            return
+        # Serializa uma única vez, independente do número de clientes
+        message = format_sse(event)
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._fanout(message)
+        else:
+            loop.call_soon_threadsafe(self._fanout, message)
+
+    def _fanout(self, message: bytes) -> None:
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(format_sse(RESYNC_EVENT))
+
+    async def stream(self, hello: Dict[str, Any] | None = None) -> AsyncIterator[bytes]:
+        """Gera o stream SSE de um cliente até ele desconectar"""
+        self._loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        try:
+            # Intervalo de reconexão sugerido ao EventSource
+            yield b"retry: 3000\n\n"
+            if hello is not None:
+                yield format_sse(hello)
+            while True:
+                try:
+                    yield await asyncio.wait_for(queue.get(), timeout=KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+        finally:
+            self._subscribers.discard(queue)
@@ -0,0 +1,254 @@
+import atexit
+import os
+import threading
+import time
+from contextlib import suppress
+from pathlib import Path
+from typing import Dict, Any, Hashable, List
+
+from .codec import JSONCodec, get_codec
+from .locks import FileLock
+from .metrics import STORAGE_BYTES_READ, STORAGE_BYTES_WRITTEN
+from .storage import StorageBackend, Change, MEMBER_LISTS, PUT_ACTIVITY, apply_change
+
+# Modos de durabilidade do journal
+FSYNC_PER_OP = "op"          # fsync a cada operação gravada
+FSYNC_PER_BATCH = "batch"    # um fsync por lote de mudanças (uma requisição)
+FSYNC_PERIODIC = "periodic"  # fsync feito pelo flusher em segundo plano
+DURABILITY_MODES = (FSYNC_PER_OP, FSYNC_PER_BATCH, FSYNC_PERIODIC)
+
+
+class JournaledStorage(StorageBackend):
+    """Write-behind: mutações vão para um journal append-only, compactado em segundo plano
+
+    Cada mudança vira uma linha JSON no journal; um flusher periódico incorpora o
+    journal ao snapshot do backend interno quando ele passa de `max_bytes` ou
+    quando `compact_interval` segundos se passaram. Na carga, o journal é
+    reaplicado sobre o último snapshot.
+    """
+
+    def __init__(self, inner: StorageBackend, journal_path: Path,
+                 durability: str = FSYNC_PER_BATCH, flush_interval: float = 1.0,
+                 compact_interval: float = 30.0, max_bytes: int = 1024 * 1024,
+                 codec: JSONCodec | None = None):
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"Unknown journal durability: {durability}")
+        self.inner = inner
+        self.codec = codec or getattr(inner, "codec", None) or get_codec()
+        self.journal_path = Path(journal_path)
+        # Journal sendo incorporado ao snapshot (sobrevive a uma falha no meio da compactação)
+        self.compacting_path = self.journal_path.with_name(self.journal_path.name + ".compacting")
+        self.durability = durability
+        self.flush_interval = flush_interval
+        self.compact_interval = compact_interval
+        self.max_bytes = max_bytes
+        self._journal_lock = threading.Lock()
+        self._compact_lock = threading.Lock()
+        self._file = None
+        self._dirty = False  # há linhas gravadas ainda sem fsync (modo periódico)
+        self._last_compaction = time.monotonic()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._flusher = None
+        # Assinatura após a última compactação deste processo -> assinatura anterior a ela
+        self._compacted: Dict[Hashable, Hashable] = {}
+
+    # -- Leitura ---------------------------------------------------------
+
+    def _read_journal(self, path: Path) -> List[Change]:
+        changes = []
+        size = 0
+        try:
+            with open(path, 'rb') as f:
+                for line in f:
+                    size += len(line)
+                    try:
+                        changes.append(self.codec.loads(line))
+                    except ValueError:
+                        # Linha incompleta (falha durante a escrita): ignora
+                        continue
+        except FileNotFoundError:
+            pass
+        STORAGE_BYTES_READ.labels(path.name).inc(size)
+        return changes
+
+    def load_activities(self) -> Dict[str, Any]:
+        with self._compact_lock:
+            activities = self.inner.load_activities()
+            for path in (self.compacting_path, self.journal_path):
+                for change in self._read_journal(path):
+                    apply_change(activities, change)
+            return activities
+
+    # -- Escrita ---------------------------------------------------------
+
+    def _open_journal(self):
+        if self._file is not None:
+            # Outro processo pode ter rotacionado o journal durante uma compactação
+            try:
+                stale = os.stat(self.journal_path).st_ino != os.fstat(self._file.fileno()).st_ino
+            except FileNotFoundError:
+                stale = True
+            if stale:
+                self._file.close()
+                self._file = None
+        if self._file is None:
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.journal_path, 'ab')
+            if self._file.tell() > 0:
+                with open(self.journal_path, 'rb') as f:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        # Isola uma linha incompleta deixada por uma falha anterior
+                        self._file.write(b"\n")
+        return self._file
+
+    def apply_changes(self, activities: Dict[str, Any], changes: List[Change]) -> None:
+        with self._journal_lock:
+            f = self._open_journal()
+            written = 0
+            for change in changes:
+                written += f.write(self._encode(change))
+                if self.durability == FSYNC_PER_OP:
+                    f.flush()
+                    os.fsync(f.fileno())
+            f.flush()
+            if self.durability == FSYNC_PER_BATCH:
+                os.fsync(f.fileno())
+            elif self.durability == FSYNC_PERIODIC:
+                self._dirty = True
+            size = f.tell()
+        STORAGE_BYTES_WRITTEN.labels(self.journal_path.name).inc(written)
+        self._ensure_flusher()
+        if size >= self.max_bytes:
+            self._wakeup.set()
+
+    def _encode(self, change: Change) -> bytes:
+        op, activity_name, *args = change
+        if op == PUT_ACTIVITY:
+            # Participantes e fila de espera têm operações próprias; só os metadados vão para o journal
+            args = [{k: v for k, v in args[0].items() if k not in MEMBER_LISTS}]
+        return self.codec.dumps([op, activity_name, *args]) + b"\n"
+
+    def save_activities(self, activities: Dict[str, Any]) -> None:
+        # Um snapshot completo torna o journal inteiro obsoleto
+        with self._compact_lock, self._journal_lock:
+            self.inner.save_activities(activities)
+            self._truncate_journal()
+            with suppress(FileNotFoundError):
+                os.unlink(self.compacting_path)
+
+    def _truncate_journal(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        with suppress(FileNotFoundError):
+            os.unlink(self.journal_path)
+        self._dirty = False
+
+    # -- Compactação -----------------------------------------------------
+
+    def compact(self) -> None:
+        """Incorpora o journal ao snapshot do backend interno"""
+        with self.lock(), self._compact_lock:
+            with self._journal_lock:
+                before = self.signature()
+                # Rotaciona o journal: novas mudanças seguem para um arquivo novo
+                if self._file is not None:
+                    self._file.flush()
+                    os.fsync(self._file.fileno())
+                    self._file.close()
+                    self._file = None
+                self._dirty = False
+                if self.journal_path.exists():
+                    if self.compacting_path.exists():
+                        # Sobra de uma compactação interrompida: junta os dois journals
+                        with open(self.compacting_path, 'ab') as dst, open(self.journal_path, 'rb') as src:
+                            dst.write(src.read())
+                        os.unlink(self.journal_path)
+                    else:
+                        os.replace(self.journal_path, self.compacting_path)
+            if self.compacting_path.exists():
+                # Só as atividades do journal: no backend por atividade, os demais arquivos ficam intactos
+                changes = self._read_journal(self.compacting_path)
+                activities = self.inner.load_for_changes(changes)
+                for change in changes:
+                    apply_change(activities, change)
+                self.inner.apply_changes(activities, changes)
+                os.unlink(self.compacting_path)
+                with self._journal_lock:
+                    # O conteúdo não mudou: a nova assinatura física continua valendo a anterior,
+                    # e o DataManager deste processo não recarrega à toa
+                    self._compacted = {self._physical_signature(): before}
+            self._last_compaction = time.monotonic()
+
+    def _ensure_flusher(self) -> None:
+        if self._flusher is None:
+            with self._journal_lock:
+                if self._flusher is None:
+                    self._flusher = threading.Thread(
+                        target=self._run_flusher, name="journal-flusher", daemon=True
+                    )
+                    self._flusher.start()
+                    atexit.register(self.close)
+
+    def _run_flusher(self) -> None:
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+                if self._journal_size() >= self.max_bytes or (
+                    self._journal_size() > 0
+                    and time.monotonic() - self._last_compaction >= self.compact_interval
+                ):
+                    self.compact()
+            except Exception as e:
+                print(f"Error in journal flusher: {str(e)}")
+
+    def _journal_size(self) -> int:
+        try:
+            return os.stat(self.journal_path).st_size
+        except FileNotFoundError:
+            return 0
+
+    def flush(self) -> None:
+        """Garante em disco as linhas ainda sem fsync (modo periódico)"""
+        with self._journal_lock:
+            if self._dirty and self._file is not None:
+                os.fsync(self._file.fileno())
+                self._dirty = False
+
+    def close(self) -> None:
+        """Para o flusher e compacta o que restou no journal"""
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        self._wakeup.set()
+        if self._flusher is not None and self._flusher is not threading.current_thread():
+            self._flusher.join()
+        self.compact()
+
+    # -- Delegação -------------------------------------------------------
+
+    def load_users(self) -> Dict[str, Any]:
+        return self.inner.load_users()
+
+    def save_users(self, users: Dict[str, Any]) -> None:
+        self.inner.save_users(users)
+
+    def lock(self) -> FileLock:
+        return self.inner.lock()
+
+    def signature(self) -> Hashable:
+        """Muda a cada gravação, mas não quando este processo só compactou o journal"""
+        physical = self._physical_signature()
+        return self._compacted.get(physical, physical)
+
+    def _physical_signature(self) -> Hashable:
+        try:
+            st = os.stat(self.journal_path)
+            journal = (st.st_ino, st.st_size)
+        except FileNotFoundError:
+            journal = None
+        return (self.inner.signature(), journal)
@@ -0,0 +1,117 @@
+import os
+import threading
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Hashable, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows: o lock entre processos vira apenas um lock entre threads
+    fcntl = None
+
+
+class ReadWriteLock:
+    """Lock de leitura/escrita: várias leituras simultâneas ou uma única escrita
+
+    Escritas pendentes têm prioridade, para que criações/remoções de atividades
+    não fiquem esperando indefinidamente atrás de inscrições. Não é reentrante.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
+
+
+class StripedLock:
+    """Conjunto fixo de locks indexado por chave (ex.: nome da atividade, e-mail)
+
+    Chaves diferentes podem compartilhar o mesmo lock, mas a memória fica
+    limitada ao número de faixas em vez de crescer com cada chave vista.
+    """
+
+    def __init__(self, stripes: int = 64):
+        self._locks = [threading.Lock() for _ in range(stripes)]
+
+    def __call__(self, key: Hashable | None):
+        if key is None:
+            return nullcontext()
+        return self._locks[hash(key) % len(self._locks)]
+
+
+class FileLock:
+    """Lock exclusivo entre processos (flock) sobre um arquivo de lock
+
+    Também serializa as threads do próprio processo, já que o flock é
+    associado ao descritor de arquivo aberto. É reentrante na mesma thread.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd = None
+
+    def acquire(self) -> None:
+        self._thread_lock.acquire()
+        self._depth += 1
+        if self._depth > 1:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+        except BaseException:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+            self._depth -= 1
+            self._thread_lock.release()
+            raise
+
+    def release(self) -> None:
+        self._depth -= 1
+        if self._depth == 0:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+        self._thread_lock.release()
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
@@ -0,0 +1,104 @@
+"""Comandos de manutenção dos dados das mentorias
+
+Uso (a partir da raiz do projeto):
+    python -m src.manage import-sqlite [--data-dir src/data] [--db src/data/mentoria.db]
+    python -m src.manage shard-json [--data-dir src/data]
+    python -m src.manage export-json --out export/ [--data-dir src/data] [--compact]
+    python -m src.manage check-projection [--data-dir src/data | --url http://localhost:8000 --token <session>]
+"""
+import argparse
+import json
+import urllib.request
+from pathlib import Path
+
+from .data_manager import DataManager, create_storage
+from .storage import export_json, import_json_to_sqlite, migrate_json_to_shards
+
+DEFAULT_DATA_DIR = Path(__file__).parent / "data"
+
+
+def cmd_import_sqlite(args: argparse.Namespace) -> int:
+    db_path = Path(args.db) if args.db else Path(args.data_dir) / "mentoria.db"
+    counts = import_json_to_sqlite(Path(args.data_dir), db_path)
+    print(
+        f"Imported {counts['activities']} activities, {counts['participants']} participants "
+        f"and {counts['users']} users into {db_path}"
+    )
+    return 0
+
+
+def cmd_shard_json(args: argparse.Namespace) -> int:
+    data_dir = Path(args.data_dir)
+    counts = migrate_json_to_shards(data_dir)
+    print(
+        f"Split {counts['activities']} activities ({counts['participants']} participants) "
+        f"into {data_dir / 'activities'}; set MENTORIA_STORAGE=sharded to use them"
+    )
+    return 0
+
+
+def cmd_export_json(args: argparse.Namespace) -> int:
+    # Lê do backend configurado (MENTORIA_STORAGE etc.), inclusive o journal pendente
+    counts = export_json(create_storage(Path(args.data_dir)), Path(args.out), pretty=not args.compact)
+    print(f"Exported {counts['activities']} activities ({counts['participants']} participants) to {args.out}")
+    return 0
+
+
+def cmd_check_projection(args: argparse.Namespace) -> int:
+    if args.url:
+        # Projeção do servidor em execução, mantida incrementalmente desde a carga
+        request = urllib.request.Request(
+            args.url.rstrip("/") + "/admin/projection-check",
+            headers={"Authorization": f"Bearer {args.token}"} if args.token else {}
+        )
+        with urllib.request.urlopen(request) as response:
+            problems = json.load(response)["problems"]
+    else:
+        # Sem servidor: confere os dados gravados (inscrições repetidas, fila) com a projeção montada deles
+        manager = DataManager(Path(args.data_dir))
+        problems = manager.check_projection(manager.storage.load_activities())
+    for problem in problems:
+        print(problem)
+    print(f"{len(problems)} inconsistencies found" if problems else "Projection is consistent")
+    return 1 if problems else 0
+
+
+def main(argv: list | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Mentorship data maintenance commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subparsers.add_parser(
+        "import-sqlite", help="Import data/*.json into a SQLite database (one-shot)"
+    )
+    import_parser.add_argument("--data-dir", default=str(DEFAULT_DATA_DIR))
+    import_parser.add_argument("--db", default=None, help="Target database (default: <data-dir>/mentoria.db)")
+    import_parser.set_defaults(func=cmd_import_sqlite)
+
+    shard_parser = subparsers.add_parser(
+        "shard-json", help="Split data/activities.json into one file per activity (one-shot)"
+    )
+    shard_parser.add_argument("--data-dir", default=str(DEFAULT_DATA_DIR))
+    shard_parser.set_defaults(func=cmd_shard_json)
+
+    export_parser = subparsers.add_parser(
+        "export-json", help="Export activities and users as indented JSON files"
+    )
+    export_parser.add_argument("--data-dir", default=str(DEFAULT_DATA_DIR))
+    export_parser.add_argument("--out", required=True, help="Target directory")
+    export_parser.add_argument("--compact", action="store_true", help="Write compact JSON instead")
+    export_parser.set_defaults(func=cmd_export_json)
+
+    check_parser = subparsers.add_parser(
+        "check-projection", help="Verify the per-user enrollment projection against the stored activities"
+    )
+    check_parser.add_argument("--data-dir", default=str(DEFAULT_DATA_DIR))
+    check_parser.add_argument("--url", default=None, help="Check a running server instead (one worker per call)")
+    check_parser.add_argument("--token", default=None, help="Session token of a user with manage_participants")
+    check_parser.set_defaults(func=cmd_check_projection)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
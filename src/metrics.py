@@ -0,0 +1,351 @@
+import functools
+import os
+import re
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter as Tally, defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Any, Iterator, List, Sequence, Tuple
+
+# Limites (em segundos) dos histogramas de latência
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str, **kwargs: str):
+        """Série de um conjunto de rótulos (guarde o retorno para evitar a busca a cada uso)"""
+        if kwargs:
+            values = tuple(kwargs[name] for name in self.labelnames)
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for key, child in sorted(self._children.items()):
+            lines.extend(self._render_child(key, child))
+        return lines
+
+
+class _CounterChild:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class Counter(_Metric):
+    """Contador monotônico"""
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1) -> None:
+        self.labels().inc(amount)
+
+    def _render_child(self, key, child) -> List[str]:
+        return [f"{self.name}{_labels(self.labelnames, key)} {_number(child.value)}"]
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum", "_lock")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        i = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+
+class Histogram(_Metric):
+    """Histograma com limites fixos (exposto com buckets cumulativos, _sum e _count)"""
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.bounds = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.bounds)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def _render_child(self, key, child) -> List[str]:
+        with child._lock:
+            counts, total = list(child.counts), child.sum
+        lines = []
+        cumulative = 0
+        for bound, count in zip((*self.bounds, float("inf")), counts):
+            cumulative += count
+            le = f'le="{_number(bound)}"'
+            lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}")
+        labels = _labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_number(total)}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Conjunto de métricas exportadas no formato texto do Prometheus
+
+    Além das métricas registradas, aceita coletores: funções chamadas a cada
+    leitura que devolvem (nome, tipo, ajuda, {rótulos: valor}), usadas para
+    valores que já existem em outro lugar (ex.: os contadores do cache).
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], List[Tuple[str, str, str, Dict[Tuple, float]]]]] = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def register_collector(self, collector: Callable[[], List[Tuple[str, str, str, Dict[Tuple, float]]]]) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        for collector in list(self._collectors):
+            try:
+                families = collector()
+            except Exception as e:
+                print(f"Error in metrics collector: {str(e)}")
+                continue
+            for name, kind, help, samples in families:
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples.items():
+                    rendered = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+                    lines.append(f"{name}{{{rendered}}} {_number(value)}" if rendered else f"{name} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+# Registro global, exposto em GET /metrics
+REGISTRY = MetricsRegistry()
+
+DATA_MANAGER_SECONDS = REGISTRY.histogram(
+    "mentoria_data_manager_seconds", "Duration of DataManager operations", ["method"]
+)
+LOCK_WAIT_SECONDS = REGISTRY.histogram(
+    "mentoria_lock_wait_seconds", "Time spent waiting to acquire DataManager locks", ["lock"]
+)
+STORAGE_BYTES_READ = REGISTRY.counter(
+    "mentoria_storage_bytes_read_total", "Bytes read from storage files", ["file"]
+)
+STORAGE_BYTES_WRITTEN = REGISTRY.counter(
+    "mentoria_storage_bytes_written_total", "Bytes written to storage files", ["file"]
+)
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "mentoria_http_request_duration_seconds", "HTTP request latency by route", ["method", "route", "status"]
+)
+HTTP_RESPONSE_BYTES = REGISTRY.counter(
+    "mentoria_http_response_bytes_total", "HTTP response body bytes by route", ["method", "route"]
+)
+
+
+def timed(method: str) -> Callable:
+    """Decorador: registra a duração de cada chamada em mentoria_data_manager_seconds"""
+    child = DATA_MANAGER_SECONDS.labels(method)
+
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                child.observe(time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def wait_timed(child: _HistogramChild, lock) -> Iterator[None]:
+    """Entra no gerenciador de contexto `lock` registrando em `child` o tempo de espera"""
+    start = time.perf_counter()
+    with lock:
+        child.observe(time.perf_counter() - start)
+        yield
+
+
+class MetricsMiddleware:
+    """Middleware ASGI: latência, status e bytes de resposta por rota
+
+    Usa o template da rota (ex.: /activities/{activity_name}/signup), não a URL,
+    para que o número de séries não cresça com os nomes das atividades.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "<unmatched>"
+            method = scope.get("method", "")
+            HTTP_REQUEST_SECONDS.labels(method, path, str(status)).observe(time.perf_counter() - start)
+            HTTP_RESPONSE_BYTES.labels(method, path).inc(size)
+
+
+class SamplingProfiler:
+    """Profiler por amostragem, opcional: pilhas agregadas por rota no formato "folded"
+
+    Uma thread lê as pilhas de todas as threads a cada `interval` segundos. A
+    amostra é atribuída à rota cujo endpoint aparece na pilha (endpoints async
+    rodam todos na thread do event loop); pilhas com código do projeto mas sem
+    endpoint (threadpool, journal, gravador) vão para "<background>". Os
+    arquivos .folded abrem em speedscope ou flamegraph.pl. Desligado, não custa
+    nada: não há thread nem gancho no caminho das requisições.
+    """
+
+    def __init__(self, interval: float = 0.005, root: Path | None = None):
+        self.interval = interval
+        self.root = str(root or Path(__file__).resolve().parent)
+        self._routes: Dict[Any, str] = {}
+        self._samples: Dict[str, Tally] = defaultdict(Tally)
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def register_routes(self, routes) -> None:
+        """Associa o código de cada endpoint ao rótulo "MÉTODO /rota" """
+        for route in routes:
+            endpoint = getattr(route, "endpoint", None)
+            code = getattr(endpoint, "__code__", None)
+            if code is not None:
+                methods = ",".join(sorted(getattr(route, "methods", None) or ()))
+                self._routes[code] = f"{methods} {route.path}".strip()
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        while not self._stopped.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id != me:
+                    self._sample(frame)
+
+    def _sample(self, frame) -> None:
+        stack = []
+        route = None
+        ours = False
+        while frame is not None:
+            code = frame.f_code
+            route = self._routes.get(code, route)
+            ours = ours or code.co_filename.startswith(self.root)
+            stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)})")
+            frame = frame.f_back
+        if ours:
+            self._samples[route or "<background>"][";".join(reversed(stack))] += 1
+
+    def folded(self) -> Dict[str, str]:
+        """Pilhas agregadas de cada rota, no formato "f1;f2;f3 contagem" """
+        return {
+            route: "".join(f"{stack} {count}\n" for stack, count in samples.most_common())
+            for route, samples in list(self._samples.items())
+        }
+
+    def dump(self, output_dir: Path) -> List[Path]:
+        """Grava um arquivo .folded por rota em `output_dir`"""
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        written = []
+        for route, text in self.folded().items():
+            path = output_dir / (re.sub(r"[^A-Za-z0-9_.-]+", "_", route).strip("_") + ".folded")
+            path.write_text(text, encoding="utf-8")
+            written.append(path)
+        return written
@@ -0,0 +1,171 @@
+import sys
+from array import array
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Dict, Any, Iterator, List, Tuple
+
+# Campos fixos de uma atividade (os demais vão para Activity.extra)
+ACTIVITY_KEYS = ("description", "schedule", "max_participants")
+
+
+@dataclass(frozen=True, slots=True)
+class Participant:
+    name: str
+    email: str
+
+    def to_dict(self) -> Dict[str, str]:
+        return {"name": self.name, "email": self.email}
+
+
+class ParticipantStore:
+    """Participantes (nome, e-mail) identificados por inteiros
+
+    Cada par (nome, e-mail) é guardado uma única vez, com o e-mail internado;
+    as atividades guardam apenas os IDs. IDs não são reaproveitados: um
+    participante cancelado continua na tabela até a próxima recarga.
+    """
+
+    __slots__ = ("_names", "_emails", "_ids", "_aliases")
+
+    def __init__(self):
+        self._names: List[str] = []
+        self._emails: List[str] = []
+        self._ids: Dict[str, int] = {}  # e-mail -> ID do primeiro nome visto
+        self._aliases: Dict[Tuple[str, str], int] = {}  # o mesmo e-mail com outro nome (raro)
+
+    def intern(self, name: str, email: str) -> int:
+        """ID do participante (cadastrado na primeira vez)"""
+        pid = self._ids.get(email)
+        if pid is None:
+            pid = self._ids[email] = self._add(name, email)
+        elif self._names[pid] != name:
+            pid = self._aliases.get((name, email))
+            if pid is None:
+                pid = self._aliases[(name, email)] = self._add(name, email)
+        return pid
+
+    def _add(self, name: str, email: str) -> int:
+        # Valida antes de alterar: as duas listas precisam crescer juntas
+        if not isinstance(name, str) or not isinstance(email, str):
+            raise TypeError("Participant name and email must be strings")
+        email = sys.intern(email)
+        self._names.append(name)
+        self._emails.append(email)
+        return len(self._emails) - 1
+
+    def intern_dict(self, participant: Any) -> int:
+        # Participantes no formato legado (apenas e-mail) usam o e-mail como nome
+        if not isinstance(participant, dict):
+            return self.intern(participant, participant)
+        return self.intern(participant.get("name", ""), participant.get("email", ""))
+
+    def email(self, pid: int) -> str:
+        return self._emails[pid]
+
+    def name(self, pid: int) -> str:
+        return self._names[pid]
+
+    def get(self, pid: int) -> Participant:
+        return Participant(self._names[pid], self._emails[pid])
+
+    def to_dict(self, pid: int) -> Dict[str, str]:
+        return {"name": self._names[pid], "email": self._emails[pid]}
+
+    def __len__(self) -> int:
+        return len(self._emails)
+
+
+@dataclass(slots=True)
+class Activity:
+    """Atividade em memória: metadados, IDs dos inscritos e fila de espera (IDs, em ordem)
+
+    A fila também é um array: um deque vazio já ocupa mais de 600 bytes por atividade.
+    """
+    description: str = ""
+    schedule: str = ""
+    max_participants: int = 0
+    participants: array = field(default_factory=lambda: array("I"))
+    waitlist: array = field(default_factory=lambda: array("I"))
+    # Campos desconhecidos do arquivo de origem, preservados na gravação
+    extra: Dict[str, Any] | None = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], store: ParticipantStore) -> "Activity":
+        extra = {k: v for k, v in data.items() if k not in ACTIVITY_KEYS and k not in ("participants", "waitlist")}
+        return cls(
+            description=data.get("description", ""),
+            schedule=data.get("schedule", ""),
+            max_participants=data.get("max_participants", 0),
+            participants=array("I", (store.intern_dict(p) for p in data.get("participants", ()))),
+            waitlist=array("I", (store.intern_dict(w) for w in data.get("waitlist", ()))),
+            extra=extra or None
+        )
+
+    def update(self, updates: Dict[str, Any]) -> None:
+        """Altera os metadados (equivalente ao dict.update do formato anterior)"""
+        for key, value in updates.items():
+            if key in ACTIVITY_KEYS:
+                setattr(self, key, value)
+            elif key not in ("participants", "waitlist"):
+                self.extra = {**(self.extra or {}), key: value}
+
+    def metadata(self) -> Dict[str, Any]:
+        """Metadados no formato de dict (sem participantes nem fila)"""
+        data = {
+            "description": self.description,
+            "schedule": self.schedule,
+            "max_participants": self.max_participants
+        }
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def to_dict(self, store: ParticipantStore) -> Dict[str, Any]:
+        """Formato dos arquivos JSON (a fila só aparece quando não está vazia)"""
+        data = self.metadata()
+        data["participants"] = [store.to_dict(pid) for pid in self.participants]
+        if self.waitlist:
+            data["waitlist"] = [store.to_dict(pid) for pid in self.waitlist]
+        return data
+
+    def to_public_dict(self, store: ParticipantStore) -> Dict[str, Any]:
+        """Formato da listagem da API: a fila de espera aparece só como contagem"""
+        data = self.metadata()
+        data["participants"] = [store.to_dict(pid) for pid in self.participants]
+        data["waitlist_count"] = len(self.waitlist)
+        return data
+
+
+class ActivitiesView(Mapping):
+    """Visão somente leitura das atividades no formato de dict, convertida a cada acesso
+
+    Adaptador entre os registros compactos e quem espera o formato anterior
+    (armazenamento, listagens e chamadores externos do DataManager).
+    """
+
+    __slots__ = ("_activities", "_store")
+
+    def __init__(self, activities: Dict[str, Activity], store: ParticipantStore):
+        self._activities = activities
+        self._store = store
+
+    def __getitem__(self, activity_name: str) -> Dict[str, Any]:
+        return self._activities[activity_name].to_dict(self._store)
+
+    def __contains__(self, activity_name: object) -> bool:
+        return activity_name in self._activities
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._activities)
+
+    def __len__(self) -> int:
+        return len(self._activities)
+
+
+def to_jsonable(value: Any) -> Any:
+    """`default` do json.dump para as visões e os arrays dos registros"""
+    if isinstance(value, Mapping):
+        return dict(value)
+    if isinstance(value, array):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
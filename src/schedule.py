@@ -0,0 +1,154 @@
+import re
+from bisect import bisect_left, insort
+from enum import IntEnum
+from typing import Dict, Any, List, NamedTuple, Set, Tuple
+
+MINUTES_PER_DAY = 24 * 60
+
+
+class Weekday(IntEnum):
+    """Dia da semana de uma mentoria (segunda = 0, como em datetime.weekday())"""
+    MONDAY = 0
+    TUESDAY = 1
+    WEDNESDAY = 2
+    THURSDAY = 3
+    FRIDAY = 4
+    SATURDAY = 5
+    SUNDAY = 6
+
+    @property
+    def key(self) -> str:
+        """Chave em português usada nas respostas agrupadas por dia"""
+        return ("segunda", "terca", "quarta", "quinta", "sexta", "sabado", "domingo")[self]
+
+
+class Slot(NamedTuple):
+    """Horário estruturado de uma atividade: dia da semana e minutos desde 00:00"""
+    weekday: Weekday
+    start: int
+    end: int
+
+    def overlaps(self, other: "Slot") -> bool:
+        return self.weekday == other.weekday and self.start < other.end and other.start < self.end
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "weekday": self.weekday.name.lower(),
+            "start": f"{self.start // 60:02d}:{self.start % 60:02d}",
+            "end": f"{self.end // 60:02d}:{self.end % 60:02d}"
+        }
+
+
+# Nomes e abreviações aceitos (português e inglês); plurais e "-feira(s)" são opcionais
+_DAY_NAMES = {
+    "segunda": Weekday.MONDAY, "seg": Weekday.MONDAY,
+    "terça": Weekday.TUESDAY, "terca": Weekday.TUESDAY, "ter": Weekday.TUESDAY,
+    "quarta": Weekday.WEDNESDAY, "qua": Weekday.WEDNESDAY,
+    "quinta": Weekday.THURSDAY, "qui": Weekday.THURSDAY,
+    "sexta": Weekday.FRIDAY, "sex": Weekday.FRIDAY,
+    "sábado": Weekday.SATURDAY, "sabado": Weekday.SATURDAY, "sáb": Weekday.SATURDAY, "sab": Weekday.SATURDAY,
+    "domingo": Weekday.SUNDAY, "dom": Weekday.SUNDAY,
+    "monday": Weekday.MONDAY, "mon": Weekday.MONDAY,
+    "tuesday": Weekday.TUESDAY, "tues": Weekday.TUESDAY, "tue": Weekday.TUESDAY,
+    "wednesday": Weekday.WEDNESDAY, "wed": Weekday.WEDNESDAY,
+    "thursday": Weekday.THURSDAY, "thurs": Weekday.THURSDAY, "thu": Weekday.THURSDAY,
+    "friday": Weekday.FRIDAY, "fri": Weekday.FRIDAY,
+    "saturday": Weekday.SATURDAY, "sat": Weekday.SATURDAY,
+    "sunday": Weekday.SUNDAY, "sun": Weekday.SUNDAY,
+}
+
+_DAY_PATTERN = re.compile(
+    r"\b(" + "|".join(sorted(_DAY_NAMES, key=len, reverse=True)) + r")s?(?:-feiras?)?\b",
+    re.IGNORECASE
+)
+
+# 19:00, 19h, 19h30, 7pm, 7:30 p.m.
+_TIME_PATTERN = re.compile(r"(?<![\d:])(\d{1,2})(?:([:h])(\d{2})?)?(?:\s*([ap])\.?m\b\.?)?", re.IGNORECASE)
+
+
+def parse_weekday(text: str) -> Weekday | None:
+    """Extrai o primeiro dia da semana mencionado no texto"""
+    match = _DAY_PATTERN.search(text or "")
+    return _DAY_NAMES[match.group(1).lower()] if match else None
+
+
+def _parse_times(text: str) -> List[int]:
+    minutes = []
+    for match in _TIME_PATTERN.finditer(text):
+        hour, separator, minute, meridiem = match.groups()
+        if not separator and not meridiem:
+            # Número solto (ex.: "2 encontros"), não é um horário
+            continue
+        hour, minute = int(hour), int(minute or 0)
+        if meridiem:
+            hour = hour % 12 + (12 if meridiem.lower() == "p" else 0)
+        if hour < 24 and minute < 60:
+            minutes.append(hour * 60 + minute)
+    return minutes
+
+
+def parse_schedule(schedule: str) -> Slot | None:
+    """Converte o horário em texto em um Slot (None se não houver dia da semana)
+
+    Sem horário, o slot ocupa o dia inteiro; sem término (ou terminando depois
+    da meia-noite), vai até o fim do dia.
+    """
+    weekday = parse_weekday(schedule)
+    if weekday is None:
+        return None
+    times = _parse_times(schedule)
+    start = times[0] if times else 0
+    end = times[1] if len(times) > 1 and times[1] > start else MINUTES_PER_DAY
+    return Slot(weekday, start, end)
+
+
+class ScheduleIndex:
+    """Índice de intervalos por dia da semana
+
+    Cada dia guarda uma lista ordenada de (início, fim, atividade); a consulta de
+    sobreposição faz bisect na faixa de inícios que ainda podem alcançar o
+    intervalo pedido (limitada pela maior duração já indexada naquele dia).
+    """
+
+    def __init__(self):
+        self._days: Dict[Weekday, List[Tuple[int, int, str]]] = {}
+        self._longest: Dict[Weekday, int] = {}
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._days.values())
+
+    def add(self, activity_name: str, slot: Slot) -> None:
+        insort(self._days.setdefault(slot.weekday, []), (slot.start, slot.end, activity_name))
+        self._longest[slot.weekday] = max(self._longest.get(slot.weekday, 0), slot.end - slot.start)
+
+    def remove(self, activity_name: str, slot: Slot) -> None:
+        entries = self._days.get(slot.weekday)
+        if not entries:
+            return
+        entry = (slot.start, slot.end, activity_name)
+        i = bisect_left(entries, entry)
+        if i < len(entries) and entries[i] == entry:
+            del entries[i]
+        if not entries:
+            del self._days[slot.weekday]
+            del self._longest[slot.weekday]
+
+    def entries(self) -> Set[Tuple[str, Slot]]:
+        """Todas as entradas como (atividade, horário)"""
+        return {
+            (name, Slot(weekday, start, end))
+            for weekday, entries in self._days.items() for start, end, name in entries
+        }
+
+    def on_day(self, weekday: Weekday) -> List[str]:
+        """Atividades indexadas no dia, em ordem de início"""
+        return [name for _, _, name in self._days.get(weekday, ())]
+
+    def overlapping(self, slot: Slot) -> List[str]:
+        """Atividades cujo intervalo se sobrepõe ao slot (O(log n + k))"""
+        entries = self._days.get(slot.weekday)
+        if not entries:
+            return []
+        lo = bisect_left(entries, (slot.start - self._longest[slot.weekday],))
+        hi = bisect_left(entries, (slot.end,))
+        return [name for start, end, name in entries[lo:hi] if end > slot.start]
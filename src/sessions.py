@@ -0,0 +1,69 @@
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import time
+
+SESSION_COOKIE = "mentoria_session"
+
+# Validade padrão da sessão: 30 dias
+DEFAULT_MAX_AGE = 30 * 24 * 60 * 60
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode("ascii").rstrip("=")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.b64decode(text + "=" * (-len(text) % 4), altchars=b"-_", validate=True)
+
+
+def load_secret(multiprocess: bool = False) -> bytes:
+    """Chave de assinatura das sessões (MENTORIA_SECRET_KEY)
+
+    Sem a variável, usa uma chave aleatória por processo: as sessões não
+    sobrevivem a um reinício nem são aceitas por outros workers. Por isso, com
+    vários workers (multiprocess=True) a variável é obrigatória.
+    """
+    secret = os.environ.get("MENTORIA_SECRET_KEY")
+    if secret:
+        return secret.encode("utf-8")
+    if multiprocess:
+        raise ValueError("MENTORIA_SECRET_KEY must be set when MENTORIA_MULTIPROCESS is enabled")
+    return secrets.token_bytes(32)
+
+
+class SessionSigner:
+    """Emite e valida tokens de sessão assinados com HMAC-SHA256
+
+    O token é "<dados>.<assinatura>", com os dados (chave do usuário e horário de
+    emissão) em base64url. Serve tanto como cookie quanto como Bearer token.
+    """
+
+    def __init__(self, secret: bytes, max_age: int = DEFAULT_MAX_AGE):
+        self.secret = secret
+        self.max_age = max_age
+
+    def _signature(self, payload: str) -> str:
+        return _b64encode(hmac.new(self.secret, payload.encode("utf-8"), hashlib.sha256).digest())
+
+    def sign(self, user_key: str) -> str:
+        payload = _b64encode(json.dumps([user_key, int(time.time())]).encode("utf-8"))
+        return f"{payload}.{self._signature(payload)}"
+
+    def unsign(self, token: str) -> str | None:
+        """Chave do usuário de um token válido e não expirado (None caso contrário)"""
+        payload, _, signature = token.partition(".")
+        expected = self._signature(payload)
+        if not payload or not hmac.compare_digest(signature.encode("utf-8"), expected.encode("utf-8")):
+            return None
+        try:
+            user_key, issued_at = json.loads(_b64decode(payload))
+        except (binascii.Error, ValueError, TypeError):
+            return None
+        if not isinstance(user_key, str) or time.time() - issued_at > self.max_age:
+            return None
+        return user_key
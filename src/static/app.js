@@ -7,6 +7,11 @@ class MentorshipDashboard {
         this.searchTerm = '';
         this.currentUser = null;
         this.userPermissions = [];
+        this.activitiesEtag = null;
+        this.dataVersion = 0;
+        this.eventSource = null;
+        this.activityUpdates = {};
+        this.updateWaiters = [];
         this.init();
     }
 
@@ -17,6 +22,7 @@ class MentorshipDashboard {
         await this.loadUserData(); // Wait for user data to load
         console.log('User data loaded, loading activities...');
         await this.loadActivities(); // Only load activities after user data
+        this.connectLiveUpdates();
         console.log('Dashboard initialization complete');
     }
 
@@ -57,15 +63,35 @@ class MentorshipDashboard {
         });
     }
 
+    async fetchActivities(etag) {
+        // Conditional request: the server answers 304 when nothing changed since `etag`
+        const headers = etag ? { 'If-None-Match': etag } : {};
+        const response = await fetch('/activities', { headers, cache: 'no-store' });
+        // Sent on 304 too: a reload may bump the version without changing the content
+        const version = parseInt(response.headers.get('X-Data-Version') || '0', 10);
+        if (response.status === 304) {
+            return { notModified: true, etag, version };
+        }
+        if (!response.ok) {
+            throw new Error('Failed to fetch activities');
+        }
+        return {
+            notModified: false,
+            etag: response.headers.get('ETag'),
+            version,
+            activities: await response.json()
+        };
+    }
+
     async loadActivities() {
         try {
-            const timestamp = new Date().getTime();
-            const response = await fetch(`/activities?_t=${timestamp}`);
-            if (!response.ok) {
-                throw new Error('Failed to fetch activities');
+            const result = await this.fetchActivities(this.activitiesEtag);
+            if (!result.notModified) {
+                this.activities = result.activities;
+                this.activitiesEtag = result.etag;
             }
-            
-            this.activities = await response.json();
+            this.dataVersion = result.version;
+            this.resolveUpdateWaiters();
             this.updateStats();
             this.filterAndDisplayActivities();
             
@@ -83,13 +109,14 @@ class MentorshipDashboard {
     async refreshSingleActivity(activityName) {
         console.log('Refreshing single activity:', activityName);
         try {
-            const timestamp = new Date().getTime();
-            const response = await fetch(`/activities?_t=${timestamp}`);
-            if (!response.ok) {
-                throw new Error('Failed to fetch activities');
+            // Only the ETag of a full load describes this.activities as a whole
+            const result = await this.fetchActivities(this.activitiesEtag);
+            if (result.notModified) {
+                console.log('Activities not modified, nothing to refresh');
+                return;
             }
             
-            const allActivities = await response.json();
+            const allActivities = result.activities;
             console.log('Fetched all activities:', allActivities);
             
             if (allActivities[activityName]) {
@@ -117,6 +144,134 @@ class MentorshipDashboard {
         }
     }
 
+    connectLiveUpdates() {
+        if (!window.EventSource) {
+            return;
+        }
+        // The browser reconnects on its own; the hello event sent on every connection triggers a resync if needed
+        this.eventSource = new EventSource('/activities/stream');
+        const handler = (e) => this.applyLiveEvent(JSON.parse(e.data));
+        ['hello', 'resync', 'enrolled', 'canceled', 'waitlist', 'activity', 'deleted'].forEach(type => {
+            this.eventSource.addEventListener(type, handler);
+        });
+    }
+
+    isLive() {
+        return this.eventSource !== null && this.eventSource.readyState === EventSource.OPEN;
+    }
+
+    applyLiveEvent(event) {
+        if (event.type === 'hello' || event.type === 'resync') {
+            if (event.type === 'resync' || event.version !== this.dataVersion) {
+                this.loadActivities();
+            }
+            return;
+        }
+        if (event.version < this.dataVersion) {
+            return; // Already reflected in the data we have
+        }
+        if (event.version > this.dataVersion + 1) {
+            this.loadActivities(); // Missed some events
+            return;
+        }
+
+        const name = event.activity;
+        const activity = this.activities[name];
+        switch (event.type) {
+            case 'enrolled':
+                if (activity && !activity.participants.some(p => p.email === event.participant.email)) {
+                    activity.participants.push(event.participant);
+                }
+                break;
+            case 'canceled':
+                if (activity) {
+                    activity.participants = activity.participants.filter(p => p.email !== event.email);
+                }
+                break;
+            case 'waitlist':
+                if (activity) {
+                    activity.waitlist_count = event.waitlist_count;
+                }
+                break;
+            case 'activity':
+                this.activities[name] = {
+                    ...(activity || { participants: [], waitlist_count: 0 }),
+                    description: event.description,
+                    schedule: event.schedule,
+                    max_participants: event.max_participants
+                };
+                break;
+            case 'deleted':
+                delete this.activities[name];
+                break;
+        }
+
+        const updated = this.activities[name];
+        if (updated && updated.participants.length !== event.participants_count) {
+            this.loadActivities(); // Local copy drifted from the server
+            return;
+        }
+
+        this.dataVersion = Math.max(this.dataVersion, event.version);
+        this.activityUpdates[name] = event.version;
+        this.renderActivityChange(name);
+        this.resolveUpdateWaiters(name);
+    }
+
+    renderActivityChange(name) {
+        // Re-render only the affected card instead of the whole grid
+        this.updateStats();
+        const activity = this.activities[name];
+        const card = document.querySelector(`[data-activity="${encodeURIComponent(name)}"]`);
+        const shouldShow = activity !== undefined && this.matchesFilters(name, activity);
+        if (card && shouldShow) {
+            this.filteredActivities[name] = activity;
+            card.outerHTML = this.createActivityCard(name, activity);
+        } else if (Boolean(card) !== shouldShow) {
+            this.filterAndDisplayActivities();
+        }
+
+        if (window.dashboardAnalytics) {
+            dashboardAnalytics.updateMetrics(this.activities);
+            this.updateQuickInsights();
+        }
+    }
+
+    waitForActivityUpdate(activityName, sinceVersion, timeoutMs = 2000) {
+        if ((this.activityUpdates[activityName] || 0) > sinceVersion) {
+            return Promise.resolve(true);
+        }
+        return new Promise(resolve => {
+            const waiter = { activityName, sinceVersion, resolve };
+            this.updateWaiters.push(waiter);
+            setTimeout(() => {
+                this.updateWaiters = this.updateWaiters.filter(w => w !== waiter);
+                resolve(false);
+            }, timeoutMs);
+        });
+    }
+
+    resolveUpdateWaiters(activityName = null) {
+        this.updateWaiters = this.updateWaiters.filter(waiter => {
+            const version = activityName === null
+                ? this.dataVersion
+                : (waiter.activityName === activityName ? this.activityUpdates[activityName] : 0);
+            if (version > waiter.sinceVersion) {
+                waiter.resolve(true);
+                return false;
+            }
+            return true;
+        });
+    }
+
+    async syncAfterChange(activityName, sinceVersion, fallback) {
+        // With a live stream the change arrives as a delta; otherwise fall back to refetching
+        if (this.isLive() && await this.waitForActivityUpdate(activityName, sinceVersion)) {
+            return;
+        }
+        await fallback();
+    }
+
     updateStats() {
         const activities = Object.values(this.activities);
         
@@ -162,26 +317,31 @@ class MentorshipDashboard {
         this.filteredActivities = {};
 
         Object.entries(this.activities).forEach(([name, activity]) => {
-            // Apply search filter
-            if (this.searchTerm && !name.toLowerCase().includes(this.searchTerm)) {
-                return;
+            if (this.matchesFilters(name, activity)) {
+                this.filteredActivities[name] = activity;
             }
-
-            // Apply availability filter
-            const spotsLeft = activity.max_participants - activity.participants.length;
-            if (this.currentFilter === 'available' && spotsLeft <= 0) {
-                return;
-            }
-            if (this.currentFilter === 'full' && spotsLeft > 0) {
-                return;
-            }
-
-            this.filteredActivities[name] = activity;
         });
 
         this.displayActivities();
     }
 
+    matchesFilters(name, activity) {
+        // Apply search filter
+        if (this.searchTerm && !name.toLowerCase().includes(this.searchTerm)) {
+            return false;
+        }
+
+        // Apply availability filter
+        const spotsLeft = activity.max_participants - activity.participants.length;
+        if (this.currentFilter === 'available' && spotsLeft <= 0) {
+            return false;
+        }
+        if (this.currentFilter === 'full' && spotsLeft > 0) {
+            return false;
+        }
+        return true;
+    }
+
     displayActivities() {
         const grid = document.getElementById('activities-grid');
         
@@ -211,7 +371,7 @@ class MentorshipDashboard {
         const statusText = isFull ? 'Full' : `${spotsLeft} spots`;
         
         return `
-            <div class="bg-white rounded-lg shadow-md hover:shadow-lg transition-shadow duration-300 overflow-hidden">
+            <div data-activity="${encodeURIComponent(name)}" class="bg-white rounded-lg shadow-md hover:shadow-lg transition-shadow duration-300 overflow-hidden">
                 <div class="p-6">
                     <div class="flex justify-between items-start mb-4">
                         <h3 class="text-xl font-bold text-gray-800 line-clamp-2">${name}</h3>
@@ -236,6 +396,13 @@ class MentorshipDashboard {
                             <span>${activity.participants.length}/${activity.max_participants} participants</span>
                         </div>
                         
+                        ${activity.waitlist_count > 0 ? `
+                        <div class="flex items-center text-sm text-gray-700">
+                            <i class="fas fa-hourglass-half mr-2 text-yellow-500"></i>
+                            <span>${activity.waitlist_count} on the waitlist</span>
+                        </div>
+                        ` : ''}
+                        
                         <!-- Progress Bar -->
                         <div class="w-full bg-gray-200 rounded-full h-2">
                             <div class="h-2 rounded-full ${isFull ? 'bg-red-500' : 'bg-green-500'}" 
@@ -295,6 +462,7 @@ class MentorshipDashboard {
                         <p><strong>Description:</strong> ${activity.description}</p>
                         <p><strong>Schedule:</strong> ${activity.schedule}</p>
                         <p><strong>Spots:</strong> ${activity.participants.length}/${activity.max_participants}</p>
+                        <p><strong>Waitlist:</strong> ${activity.waitlist_count || 0} waiting</p>
                         <p><strong>Status:</strong> 
                                                         <span class="inline-flex items-center px-2 py-1 rounded-full text-sm font-medium ${isFull ? 'bg-red-100 text-red-800' : 'bg-green-100 text-green-800'}">
                                 ${isFull ? 'Full' : `${spotsLeft} spots available`}
@@ -346,7 +514,7 @@ class MentorshipDashboard {
                         ${this.userPermissions.includes('self_manage') ? 'My Enrollment' : 'New Enrollment'}
                     </h3>
                     ${this.userPermissions.includes('manage_participants') || this.userPermissions.includes('create') || this.userPermissions.includes('self_manage') ? `
-                        <form onsubmit="dashboard.signupParticipant(event, '${activityName}')" class="space-y-4">
+                        <form onsubmit="dashboard.${isFull ? 'joinWaitlist' : 'signupParticipant'}(event, '${activityName}')" class="space-y-4">
                             ${this.userPermissions.includes('self_manage') ? `
                                 <!-- For participants, show pre-filled data -->
                                 <div>
@@ -371,8 +539,7 @@ class MentorshipDashboard {
                                     </label>
                                     <input type="text" id="participant-name" required 
                                            placeholder="Full name"
-                                           class="w-full px-3 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-primary focus:border-transparent"
-                                           ${isFull ? 'disabled' : ''}>
+                                           class="w-full px-3 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-primary focus:border-transparent">
                                 </div>
                                 <div>
                                     <label for="participant-email" class="block text-sm font-medium text-gray-700 mb-1">
@@ -380,16 +547,21 @@ class MentorshipDashboard {
                                     </label>
                                     <input type="email" id="participant-email" required 
                                            placeholder="participant@womakerscode.org"
-                                           class="w-full px-3 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-primary focus:border-transparent"
-                                           ${isFull ? 'disabled' : ''}>
+                                           class="w-full px-3 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-primary focus:border-transparent">
                                 </div>
                             `}
                             <button type="submit" 
-                                    class="w-full py-2 px-4 rounded-lg font-medium transition-colors ${isFull ? 'bg-gray-300 text-gray-500 cursor-not-allowed' : 'bg-primary text-white hover:bg-purple-700'}"
-                                    ${isFull ? 'disabled' : ''}>
-                                <i class="fas fa-user-plus mr-2"></i>
-                                ${isFull ? 'Mentorship Full' : (this.userPermissions.includes('self_manage') ? 'Enroll Me' : 'Enroll Participant')}
+                                    class="w-full py-2 px-4 rounded-lg font-medium transition-colors ${isFull ? 'bg-yellow-500 text-white hover:bg-yellow-600' : 'bg-primary text-white hover:bg-purple-700'}">
+                                <i class="fas ${isFull ? 'fa-hourglass-half' : 'fa-user-plus'} mr-2"></i>
+                                ${isFull ? (this.userPermissions.includes('self_manage') ? 'Mentorship Full - Join Waitlist' : 'Mentorship Full - Add to Waitlist') : (this.userPermissions.includes('self_manage') ? 'Enroll Me' : 'Enroll Participant')}
                             </button>
+                            ${activity.waitlist_count > 0 && (this.userPermissions.includes('self_manage') || this.userPermissions.includes('manage_participants') || this.userPermissions.includes('delete')) ? `
+                                <button type="button" onclick="dashboard.leaveWaitlist('${activityName}')" 
+                                        class="w-full text-sm text-red-500 hover:text-red-700">
+                                    <i class="fas fa-sign-out-alt mr-1"></i>
+                                    ${this.userPermissions.includes('self_manage') ? 'Leave Waitlist' : 'Remove Email from Waitlist'}
+                                </button>
+                            ` : ''}
                         </form>
                     ` : `
                         <div class="text-center py-4 text-gray-600">
@@ -596,6 +768,7 @@ class MentorshipDashboard {
         console.log('Sending form data:', formData);
 
         try {
+            const sinceVersion = this.dataVersion;
             const response = await fetch('/activities', {
                 method: 'POST',
                 headers: {
@@ -612,7 +785,7 @@ class MentorshipDashboard {
                 console.log('Creation successful, showing success message');
                 this.showSuccess(result.message);
                 this.closeModal();
-                await this.loadActivities(); // Refresh the activities list
+                await this.syncAfterChange(formData.name, sinceVersion, () => this.loadActivities());
             } else {
                 console.log('Creation failed, showing error message');
                 this.showError(result.detail || 'Error creating mentorship');
@@ -637,6 +810,7 @@ class MentorshipDashboard {
             const encodedActivityName = encodeURIComponent(activityName);
             console.log('Making DELETE request to:', `/activities/${encodedActivityName}`);
             
+            const sinceVersion = this.dataVersion;
             const response = await fetch(`/activities/${encodedActivityName}`, {
                 method: 'DELETE',
                 headers: {
@@ -652,7 +826,7 @@ class MentorshipDashboard {
                 console.log('Deletion successful, showing success message');
                 this.showSuccess(result.message);
                 this.closeModal();
-                await this.loadActivities(); // Refresh the activities list
+                await this.syncAfterChange(activityName, sinceVersion, () => this.loadActivities());
             } else {
                 console.log('Deletion failed, showing error message');
                 this.showError(result.detail || 'Error deleting mentorship');
@@ -735,6 +909,7 @@ class MentorshipDashboard {
             console.log('Making POST request to:', url);
             console.log('Request body:', requestBody);
             
+            const sinceVersion = this.dataVersion;
             const response = await fetch(url, { 
                 method: 'POST',
                 headers: {
@@ -752,7 +927,7 @@ class MentorshipDashboard {
                 this.showSuccess(result.message);
                 
                 // Refresh the activity data and then the modal
-                await this.refreshSingleActivity(activityName);
+                await this.syncAfterChange(activityName, sinceVersion, () => this.refreshSingleActivity(activityName));
                 this.openActivityModal(activityName); // Refresh modal with updated data
                 
                 // Clear form only if not self-management
@@ -795,6 +970,7 @@ class MentorshipDashboard {
             
             console.log('Attempting to cancel participant:', { activityName, email, url });
             
+            const sinceVersion = this.dataVersion;
             const response = await fetch(url, {
                 method: 'DELETE',
                 headers: {
@@ -811,7 +987,7 @@ class MentorshipDashboard {
                 this.showSuccess(result.message);
                 
                 // Refresh the activity data and then the modal
-                await this.refreshSingleActivity(activityName);
+                await this.syncAfterChange(activityName, sinceVersion, () => this.refreshSingleActivity(activityName));
                 this.openActivityModal(activityName); // Refresh modal with updated data
             } else {
                 this.showError(result.detail || 'Error canceling enrollment');
@@ -822,6 +998,77 @@ class MentorshipDashboard {
         }
     }
 
+    waitlistUrl(activityName, params) {
+        // self_manage users are identified by the session; other profiles send the participant in the query
+        let url = `/activities/${encodeURIComponent(activityName)}/waitlist`;
+        if (!this.userPermissions.includes('self_manage')) {
+            url += '?' + new URLSearchParams(params).toString();
+        }
+        return url;
+    }
+
+    async joinWaitlist(event, activityName) {
+        event.preventDefault();
+        let params = {};
+        if (!this.userPermissions.includes('self_manage')) {
+            const name = document.getElementById('participant-name')?.value;
+            const email = document.getElementById('participant-email')?.value;
+            if (!name || !email) {
+                this.showError('Name and email are required');
+                return;
+            }
+            params = { name, email };
+        }
+
+        try {
+            const sinceVersion = this.dataVersion;
+            const response = await fetch(this.waitlistUrl(activityName, params), { method: 'POST' });
+            const result = await response.json();
+
+            if (response.ok) {
+                // A seat may have opened in the meantime: the server then enrolls right away
+                this.showSuccess(result.message);
+                await this.syncAfterChange(activityName, sinceVersion, () => this.refreshSingleActivity(activityName));
+                this.openActivityModal(activityName);
+            } else {
+                this.showError(result.detail || 'Error joining the waitlist');
+            }
+        } catch (error) {
+            console.error('Error joining waitlist:', error);
+            this.showError('Error joining the waitlist. Please try again.');
+        }
+    }
+
+    async leaveWaitlist(activityName) {
+        let params = {};
+        if (!this.userPermissions.includes('self_manage')) {
+            const email = document.getElementById('participant-email')?.value || prompt('Email to remove from the waitlist:');
+            if (!email) {
+                return;
+            }
+            params = { email };
+        } else if (!confirm(`Are you sure you want to leave the waitlist of the mentorship "${activityName}"?`)) {
+            return;
+        }
+
+        try {
+            const sinceVersion = this.dataVersion;
+            const response = await fetch(this.waitlistUrl(activityName, params), { method: 'DELETE' });
+            const result = await response.json();
+
+            if (response.ok) {
+                this.showSuccess(result.message);
+                await this.syncAfterChange(activityName, sinceVersion, () => this.refreshSingleActivity(activityName));
+                this.openActivityModal(activityName);
+            } else {
+                this.showError(result.detail || 'Error leaving the waitlist');
+            }
+        } catch (error) {
+            console.error('Error leaving waitlist:', error);
+            this.showError('Error leaving the waitlist. Please try again.');
+        }
+    }
+
     async loadUserData() {
         console.log('Loading user data...');
         try {
@@ -0,0 +1,551 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+import unicodedata
+from contextlib import suppress
+from pathlib import Path
+from typing import Dict, Any, Hashable, List, Tuple
+
+from .codec import JSONCodec, get_codec
+from .locks import FileLock
+from .metrics import STORAGE_BYTES_READ, STORAGE_BYTES_WRITTEN
+
+# Operações elementares que o DataManager registra a cada mutação.
+# Cada mudança é uma tupla (operação, nome_da_atividade, *argumentos):
+#   (ADD_PARTICIPANT, atividade, {"name": ..., "email": ...})
+#   (REMOVE_PARTICIPANT, atividade, email)
+#   (PUT_ACTIVITY, atividade, dados_da_atividade)
+#   (DELETE_ACTIVITY, atividade)
+#   (ADD_WAITER, atividade, {"name": ..., "email": ...})  -> fim da fila de espera
+#   (REMOVE_WAITER, atividade, email)
+ADD_PARTICIPANT = "add_participant"
+REMOVE_PARTICIPANT = "remove_participant"
+PUT_ACTIVITY = "put_activity"
+DELETE_ACTIVITY = "delete_activity"
+ADD_WAITER = "add_waiter"
+REMOVE_WAITER = "remove_waiter"
+
+# Listas de uma atividade que têm operações próprias (não vão no PUT_ACTIVITY)
+MEMBER_LISTS = ("participants", "waitlist")
+
+Change = Tuple[Any, ...]
+
+DEFAULT_USERS = {"profiles": {}, "current_user": {}}
+
+
+def _participant_email(participant: Any) -> str:
+    # Snapshots antigos podem conter participantes no formato legado (apenas e-mail)
+    return participant.get("email") if isinstance(participant, dict) else participant
+
+
+def apply_change(activities: Dict[str, Any], change: Change) -> None:
+    """Aplica uma mudança a um snapshot em memória
+
+    Cada operação é idempotente (reaplicá-la sobre um estado que já a contém não
+    altera o resultado), o que permite reexecutar journals após uma falha.
+    """
+    op, activity_name, *args = change
+    if op == ADD_PARTICIPANT:
+        activity = activities.get(activity_name)
+        participant = args[0]
+        if activity is not None and all(
+            _participant_email(p) != participant["email"] for p in activity["participants"]
+        ):
+            activity["participants"].append(dict(participant))
+    elif op == REMOVE_PARTICIPANT:
+        activity = activities.get(activity_name)
+        if activity is not None:
+            activity["participants"] = [
+                p for p in activity["participants"] if _participant_email(p) != args[0]
+            ]
+    elif op == PUT_ACTIVITY:
+        fields = {k: v for k, v in args[0].items() if k not in MEMBER_LISTS}
+        activities.setdefault(activity_name, {"participants": []}).update(fields)
+    elif op == DELETE_ACTIVITY:
+        activities.pop(activity_name, None)
+    elif op == ADD_WAITER:
+        activity = activities.get(activity_name)
+        if activity is not None:
+            waitlist = activity.setdefault("waitlist", [])
+            if all(w["email"] != args[0]["email"] for w in waitlist):
+                waitlist.append(dict(args[0]))
+    elif op == REMOVE_WAITER:
+        activity = activities.get(activity_name)
+        if activity is not None and "waitlist" in activity:
+            activity["waitlist"] = [w for w in activity["waitlist"] if w["email"] != args[0]]
+    else:
+        raise ValueError(f"Unknown storage operation: {op}")
+
+
+class StorageBackend:
+    """Interface de persistência usada pelo DataManager"""
+
+    def load_activities(self) -> Dict[str, Any]:
+        """Carrega todas as atividades"""
+        raise NotImplementedError
+
+    def save_activities(self, activities: Dict[str, Any]) -> None:
+        """Grava o snapshot completo das atividades"""
+        raise NotImplementedError
+
+    def apply_changes(self, activities: Dict[str, Any], changes: List[Change]) -> None:
+        """Persiste um lote de mudanças (por padrão regrava o snapshot completo)"""
+        self.save_activities(activities)
+
+    def load_for_changes(self, changes: List[Change]) -> Dict[str, Any]:
+        """Atividades que apply_changes precisa para gravar `changes` (por padrão, todas)"""
+        return self.load_activities()
+
+    def load_users(self) -> Dict[str, Any]:
+        """Carrega os dados de usuários"""
+        raise NotImplementedError
+
+    def save_users(self, users: Dict[str, Any]) -> None:
+        """Grava os dados de usuários"""
+        raise NotImplementedError
+
+    def lock(self) -> FileLock:
+        """Lock exclusivo entre os processos que compartilham este armazenamento"""
+        raise NotImplementedError
+
+    def signature(self) -> Hashable:
+        """Identifica a versão gravada das atividades (muda quando qualquer processo grava)"""
+        raise NotImplementedError
+
+
+class JSONStorage(StorageBackend):
+    """Armazena atividades e usuários em arquivos JSON (activities.json / users.json)
+
+    Os arquivos são gravados compactos; com pretty=True, indentados para leitura.
+    """
+
+    def __init__(self, data_dir: Path, codec: JSONCodec | None = None, pretty: bool = False):
+        self.data_dir = Path(data_dir)
+        self.codec = codec or get_codec()
+        self.pretty = pretty
+        self.activities_file = self.data_dir / "activities.json"
+        self.users_file = self.data_dir / "users.json"
+        self._lock = FileLock(self.data_dir / ".mentoria.lock")
+
+    def _read(self, path: Path, default: Dict[str, Any], label: str | None = None) -> Dict[str, Any]:
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return default
+        STORAGE_BYTES_READ.labels(label or path.name).inc(len(data))
+        return self.codec.loads(data)
+
+    def _write(self, path: Path, data: Dict[str, Any], label: str | None = None) -> None:
+        # O DataManager entrega as atividades como visão (records.ActivitiesView); o codec a converte
+        body = self.codec.dumps(data, pretty=self.pretty)
+        # Certifica que o diretório existe
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Grava em um arquivo temporário e renomeia: leitores nunca veem um JSON pela metade
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(body)
+                f.flush()
+                os.fsync(f.fileno())
+            STORAGE_BYTES_WRITTEN.labels(label or path.name).inc(len(body))
+            try:
+                os.chmod(tmp_path, os.stat(path).st_mode & 0o777)
+            except FileNotFoundError:
+                os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, path)
+        except BaseException:
+            with suppress(FileNotFoundError):
+                os.unlink(tmp_path)
+            raise
+
+    def load_activities(self) -> Dict[str, Any]:
+        return self._read(self.activities_file, {})
+
+    def save_activities(self, activities: Dict[str, Any]) -> None:
+        self._write(self.activities_file, activities)
+
+    def load_users(self) -> Dict[str, Any]:
+        return self._read(self.users_file, dict(DEFAULT_USERS))
+
+    def save_users(self, users: Dict[str, Any]) -> None:
+        self._write(self.users_file, users)
+
+    def lock(self) -> FileLock:
+        return self._lock
+
+    def signature(self) -> Hashable:
+        try:
+            st = os.stat(self.activities_file)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def shard_filename(activity_name: str) -> str:
+    """Nome estável e seguro do arquivo de uma atividade (trecho legível + hash do nome)"""
+    ascii_name = unicodedata.normalize("NFKD", activity_name).encode("ascii", "ignore").decode("ascii")
+    slug = re.sub(r"[^a-z0-9]+", "-", ascii_name.lower()).strip("-")[:40] or "activity"
+    digest = hashlib.blake2b(activity_name.encode("utf-8"), digest_size=6).hexdigest()
+    return f"{slug}-{digest}.json"
+
+
+class ShardedJSONStorage(JSONStorage):
+    """Um arquivo JSON por atividade (activities/*.json) mais um manifesto com os nomes
+
+    Cada lote de mudanças regrava só os arquivos das atividades afetadas (e o
+    manifesto, se alguma foi criada ou removida); remover uma atividade apaga o
+    seu arquivo. O arquivo `revision`, regravado a cada lote, serve de
+    assinatura barata para os outros processos. Usuários continuam em users.json.
+
+    A divisão economiza gravações, não leituras: load_activities lê todos os
+    arquivos, porque o DataManager indexa o catálogo inteiro (a regra de uma
+    mentoria por dia depende das inscrições de todas as turmas). Só a
+    compactação do journal (load_for_changes) lê apenas as atividades afetadas.
+    """
+
+    def __init__(self, data_dir: Path, codec: JSONCodec | None = None, pretty: bool = False):
+        super().__init__(data_dir, codec, pretty)
+        self.shards_dir = self.data_dir / "activities"
+        self.manifest_file = self.shards_dir / "manifest.json"
+        self.revision_file = self.shards_dir / "revision"
+        self._manifest: Dict[str, str] | None = None  # atividade -> arquivo
+
+    def _load_manifest(self) -> Dict[str, str]:
+        self._manifest = self._read(self.manifest_file, {}).get("shards", {})
+        return self._manifest
+
+    def _save_manifest(self) -> None:
+        self._write(self.manifest_file, {"version": 1, "shards": self._manifest})
+
+    def _bump_revision(self) -> None:
+        # Substituição atômica: muda inode e mtime mesmo quando o conteúdo se repete
+        self.shards_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.shards_dir, prefix=".revision.", suffix=".tmp")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(f"{time.time_ns()}\n")
+        os.replace(tmp_path, self.revision_file)
+
+    def load_activities(self) -> Dict[str, Any]:
+        return self._read_shards(self._load_manifest())
+
+    def load_for_changes(self, changes: List[Change]) -> Dict[str, Any]:
+        manifest = self._load_manifest()
+        touched = dict.fromkeys(change[1] for change in changes)
+        return self._read_shards({name: manifest[name] for name in touched if name in manifest})
+
+    def _read_shards(self, filenames: Dict[str, str]) -> Dict[str, Any]:
+        activities = {}
+        for activity_name, filename in filenames.items():
+            shard = self._read(self.shards_dir / filename, None, label="activity shards")
+            if shard is not None:
+                activities[activity_name] = shard["activity"]
+        return activities
+
+    def _write_shard(self, activity_name: str, activity: Dict[str, Any]) -> None:
+        filename = self._manifest.setdefault(activity_name, shard_filename(activity_name))
+        self._write(self.shards_dir / filename, {"name": activity_name, "activity": activity},
+                    label="activity shards")
+
+    def save_activities(self, activities: Dict[str, Any]) -> None:
+        self._manifest = {}
+        for activity_name, activity in activities.items():
+            self._write_shard(activity_name, activity)
+        self._save_manifest()
+        # Arquivos de atividades que não existem mais
+        current = set(self._manifest.values())
+        for path in self.shards_dir.glob("*.json"):
+            if path.name not in current and path != self.manifest_file:
+                with suppress(FileNotFoundError):
+                    os.unlink(path)
+        self._bump_revision()
+
+    def apply_changes(self, activities: Dict[str, Any], changes: List[Change]) -> None:
+        if self._manifest is None:
+            self._load_manifest()
+        touched = dict.fromkeys(change[1] for change in changes)
+        created = [name for name in touched if name in activities and name not in self._manifest]
+        removed = [name for name in touched if name not in activities and name in self._manifest]
+        for activity_name in touched:
+            if activity_name in activities:
+                self._write_shard(activity_name, activities[activity_name])
+        if created or removed:
+            # O manifesto é gravado antes de apagar: uma falha no meio deixa só um arquivo órfão
+            filenames = [self._manifest.pop(name) for name in removed]
+            self._save_manifest()
+            for filename in filenames:
+                with suppress(FileNotFoundError):
+                    os.unlink(self.shards_dir / filename)
+        self._bump_revision()
+
+    def signature(self) -> Hashable:
+        try:
+            st = os.stat(self.revision_file)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS activities (
+    name TEXT PRIMARY KEY,
+    description TEXT NOT NULL DEFAULT '',
+    schedule TEXT NOT NULL DEFAULT '',
+    max_participants INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS participants (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    activity TEXT NOT NULL REFERENCES activities(name)
+        ON DELETE CASCADE ON UPDATE CASCADE,
+    email TEXT NOT NULL,
+    name TEXT,
+    UNIQUE (activity, email)
+);
+CREATE INDEX IF NOT EXISTS idx_participants_email ON participants(email);
+CREATE TABLE IF NOT EXISTS waitlist (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    activity TEXT NOT NULL REFERENCES activities(name)
+        ON DELETE CASCADE ON UPDATE CASCADE,
+    email TEXT NOT NULL,
+    name TEXT NOT NULL DEFAULT '',
+    UNIQUE (activity, email)
+);
+CREATE TABLE IF NOT EXISTS profiles (
+    key TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS users (
+    key TEXT PRIMARY KEY,
+    name TEXT NOT NULL DEFAULT '',
+    email TEXT NOT NULL DEFAULT '',
+    profile TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class SQLiteStorage(StorageBackend):
+    """Armazena os dados em um banco SQLite (modo WAL) com tabelas indexadas"""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._local = threading.local()
+        self._lock = FileLock(self.db_path.with_name(self.db_path.name + ".lock"))
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Retorna a conexão da thread atual (o threadpool do FastAPI usa várias threads)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    def lock(self) -> FileLock:
+        return self._lock
+
+    def signature(self) -> Hashable:
+        row = self._connection().execute("SELECT value FROM settings WHERE key = 'revision'").fetchone()
+        return row[0] if row else None
+
+    def _bump_revision(self, conn: sqlite3.Connection) -> None:
+        conn.execute(
+            """
+            INSERT INTO settings (key, value) VALUES ('revision', '1')
+            ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1
+            """
+        )
+
+    def load_activities(self) -> Dict[str, Any]:
+        conn = self._connection()
+        activities = {}
+        for name, description, schedule, max_participants in conn.execute(
+            "SELECT name, description, schedule, max_participants FROM activities ORDER BY rowid"
+        ):
+            activities[name] = {
+                "description": description,
+                "schedule": schedule,
+                "max_participants": max_participants,
+                "participants": [],
+                "waitlist": []
+            }
+        for activity, email, name in conn.execute(
+            "SELECT activity, email, name FROM participants ORDER BY id"
+        ):
+            # Participantes legados (apenas e-mail) são gravados sem nome
+            participant = email if name is None else {"name": name, "email": email}
+            activities[activity]["participants"].append(participant)
+        # A ordem de inserção (id) é a ordem da fila
+        for activity, email, name in conn.execute(
+            "SELECT activity, email, name FROM waitlist ORDER BY id"
+        ):
+            activities[activity]["waitlist"].append({"name": name, "email": email})
+        return activities
+
+    def save_activities(self, activities: Dict[str, Any]) -> None:
+        with self._connection() as conn:
+            conn.execute("DELETE FROM activities")
+            conn.execute("DELETE FROM participants")
+            conn.execute("DELETE FROM waitlist")
+            for activity_name, activity in activities.items():
+                self._put_activity(conn, activity_name, activity)
+                for participant in activity.get("participants", []):
+                    self._add_participant(conn, activity_name, participant)
+                for waiter in activity.get("waitlist", []):
+                    self._add_waiter(conn, activity_name, waiter)
+            self._bump_revision(conn)
+
+    def apply_changes(self, activities: Dict[str, Any], changes: List[Change]) -> None:
+        # Um único commit por lote: uma inscrição vira um INSERT de uma linha
+        with self._connection() as conn:
+            for op, activity_name, *args in changes:
+                if op == ADD_PARTICIPANT:
+                    self._add_participant(conn, activity_name, args[0])
+                elif op == REMOVE_PARTICIPANT:
+                    conn.execute(
+                        "DELETE FROM participants WHERE activity = ? AND email = ?",
+                        (activity_name, args[0])
+                    )
+                elif op == PUT_ACTIVITY:
+                    self._put_activity(conn, activity_name, args[0])
+                elif op == DELETE_ACTIVITY:
+                    conn.execute("DELETE FROM activities WHERE name = ?", (activity_name,))
+                elif op == ADD_WAITER:
+                    self._add_waiter(conn, activity_name, args[0])
+                elif op == REMOVE_WAITER:
+                    conn.execute(
+                        "DELETE FROM waitlist WHERE activity = ? AND email = ?",
+                        (activity_name, args[0])
+                    )
+                else:
+                    raise ValueError(f"Unknown storage operation: {op}")
+            self._bump_revision(conn)
+
+    def _put_activity(self, conn: sqlite3.Connection, activity_name: str, activity: Dict[str, Any]) -> None:
+        conn.execute(
+            """
+            INSERT INTO activities (name, description, schedule, max_participants)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(name) DO UPDATE SET
+                description = excluded.description,
+                schedule = excluded.schedule,
+                max_participants = excluded.max_participants
+            """,
+            (
+                activity_name,
+                activity.get("description", ""),
+                activity.get("schedule", ""),
+                activity.get("max_participants", 0)
+            )
+        )
+
+    def _add_participant(self, conn: sqlite3.Connection, activity_name: str, participant: Any) -> None:
+        if isinstance(participant, dict):
+            email, name = participant.get("email", ""), participant.get("name", "")
+        else:
+            email, name = participant, None
+        conn.execute(
+            "INSERT OR IGNORE INTO participants (activity, email, name) VALUES (?, ?, ?)",
+            (activity_name, email, name)
+        )
+
+    def _add_waiter(self, conn: sqlite3.Connection, activity_name: str, waiter: Dict[str, str]) -> None:
+        conn.execute(
+            "INSERT OR IGNORE INTO waitlist (activity, email, name) VALUES (?, ?, ?)",
+            (activity_name, waiter.get("email", ""), waiter.get("name", ""))
+        )
+
+    def load_users(self) -> Dict[str, Any]:
+        conn = self._connection()
+        profiles = {
+            key: json.loads(data)
+            for key, data in conn.execute("SELECT key, data FROM profiles ORDER BY rowid")
+        }
+        users = {
+            key: {"name": name, "email": email, "profile": profile}
+            for key, name, email, profile in conn.execute(
+                "SELECT key, name, email, profile FROM users ORDER BY rowid"
+            )
+        }
+        row = conn.execute("SELECT value FROM settings WHERE key = 'current_user'").fetchone()
+        if not profiles and not users and row is None:
+            return dict(DEFAULT_USERS)
+        return {
+            "profiles": profiles,
+            "users": users,
+            "current_user": json.loads(row[0]) if row else {}
+        }
+
+    def save_users(self, users: Dict[str, Any]) -> None:
+        with self._connection() as conn:
+            conn.execute("DELETE FROM profiles")
+            conn.execute("DELETE FROM users")
+            conn.executemany(
+                "INSERT INTO profiles (key, data) VALUES (?, ?)",
+                [
+                    (key, json.dumps(profile, ensure_ascii=False))
+                    for key, profile in users.get("profiles", {}).items()
+                ]
+            )
+            conn.executemany(
+                "INSERT INTO users (key, name, email, profile) VALUES (?, ?, ?, ?)",
+                [
+                    (key, user.get("name", ""), user.get("email", ""), user.get("profile", ""))
+                    for key, user in users.get("users", {}).items()
+                ]
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO settings (key, value) VALUES ('current_user', ?)",
+                (json.dumps(users.get("current_user", {}), ensure_ascii=False),)
+            )
+
+
+def import_json_to_sqlite(data_dir: Path, db_path: Path) -> Dict[str, int]:
+    """Importa (uma única vez) os arquivos data/*.json para um banco SQLite"""
+    source = JSONStorage(data_dir)
+    target = SQLiteStorage(db_path)
+    activities = source.load_activities()
+    users = source.load_users()
+    target.save_activities(activities)
+    target.save_users(users)
+    return {
+        "activities": len(activities),
+        "participants": sum(len(a.get("participants", [])) for a in activities.values()),
+        "users": len(users.get("users", {}))
+    }
+
+
+def export_json(source: StorageBackend, target_dir: Path, pretty: bool = True) -> Dict[str, int]:
+    """Exporta atividades e usuários de qualquer backend para target_dir/*.json (indentados por padrão)"""
+    activities = source.load_activities()
+    target = JSONStorage(target_dir, pretty=pretty)
+    target.save_activities(activities)
+    target.save_users(source.load_users())
+    return {
+        "activities": len(activities),
+        "participants": sum(len(a.get("participants", [])) for a in activities.values())
+    }
+
+
+def migrate_json_to_shards(data_dir: Path) -> Dict[str, int]:
+    """Divide data/activities.json em um arquivo por atividade (o arquivo original é mantido)"""
+    activities = JSONStorage(data_dir).load_activities()
+    target = ShardedJSONStorage(data_dir)
+    target.save_activities(activities)
+    return {
+        "activities": len(activities),
+        "participants": sum(len(a.get("participants", [])) for a in activities.values())
+    }
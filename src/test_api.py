@@ -0,0 +1,128 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from . import app as app_module
+from .app import choose_encoding, etag_matches
+from .async_manager import AsyncDataManager
+from .data_manager import DataManager
+from .storage import JSONStorage
+
+ACTIVITIES = {
+    f"Mentoria {i}": {
+        "description": f"Mentoria número {i}",
+        "schedule": f"{day}-feiras, 10:00 - 11:00",
+        "max_participants": 1,
+        "participants": [{"name": f"P{i}", "email": f"p{i}@example.com"}] if i % 2 else []
+    }
+    for i, day in enumerate(["Segundas", "Terças", "Quartas", "Quintas", "Sextas"])
+}
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """The real endpoints of app.py on a DataManager in a temporary directory"""
+    storage = JSONStorage(tmp_path)
+    storage.save_activities(ACTIVITIES)
+    manager = DataManager(tmp_path, storage=storage, multiprocess=False)
+    monkeypatch.setattr(app_module, "data_manager", manager)
+    monkeypatch.setattr(app_module, "store", AsyncDataManager(manager))
+    with TestClient(app_module.app) as client:
+        yield client
+
+
+def test_query_paginates_across_pages(client):
+    names, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/activities", params=params).json()
+        assert len(page["activities"]) <= 2
+        names += list(page["activities"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert names == sorted(ACTIVITIES)
+
+
+def test_query_has_no_cursor_after_the_last_match(client):
+    # "Mentoria 1" fills the page and nothing after it matches the search
+    page = client.get("/activities", params={"q": "número 1", "limit": 1}).json()
+    assert list(page["activities"]) == ["Mentoria 1"]
+    assert page["next_cursor"] is None
+
+    page = client.get("/activities", params={"available": "false", "limit": 1}).json()
+    assert list(page["activities"]) == ["Mentoria 1"]
+    last = client.get("/activities", params={"available": "false", "limit": 1, "cursor": page["next_cursor"]}).json()
+    assert list(last["activities"]) == ["Mentoria 3"] and last["next_cursor"] is None
+
+
+def test_query_rejects_a_bad_cursor(client):
+    response = client.get("/activities", params={"cursor": "not a cursor!"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+def test_query_filters_full_activities(client):
+    full = client.get("/activities", params={"available": "false"}).json()["activities"]
+    assert sorted(full) == ["Mentoria 1", "Mentoria 3"]
+    with_seats = client.get("/activities", params={"available": "true", "day": "segunda"}).json()["activities"]
+    assert list(with_seats) == ["Mentoria 0"]
+
+
+def test_query_projects_fields(client):
+    page = client.get("/activities", params={"fields": "participants_count,waitlist_count", "limit": 1}).json()
+    assert page["activities"] == {"Mentoria 0": {"participants_count": 0, "waitlist_count": 0}}
+
+    for fields in ("description,unknown", "waitlist"):
+        response = client.get("/activities", params={"fields": fields})
+        assert response.status_code == 400
+        assert response.json()["detail"].startswith("Invalid fields")
+
+
+def test_etag_matches_lists_weak_tags_and_star():
+    assert etag_matches('"a", W/"b"', '"b"')
+    assert etag_matches(' "a" ,"b" ', '"a"')
+    assert etag_matches("*", '"a"')
+    assert not etag_matches('"a", W/"b"', '"c"')
+    assert not etag_matches(None, '"a"') and not etag_matches("", '"a"')
+
+
+def test_choose_encoding_honours_q_zero():
+    available = {"gzip": b"", "br": b""}
+    assert choose_encoding("gzip, br", available) == "br"
+    assert choose_encoding("br;q=0, gzip", available) == "gzip"
+    assert choose_encoding("br; q=0.0, gzip;q=0", available) is None
+    assert choose_encoding("*", {"gzip": b""}) == "gzip"
+    assert choose_encoding("identity", available) is None and choose_encoding(None, available) is None
+
+
+def test_conditional_get_returns_304_with_the_etag(client):
+    first = client.get("/activities")
+    etag = first.headers["ETag"]
+
+    cached = client.get("/activities", headers={"If-None-Match": f'W/{etag}, "other"'})
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+    assert cached.content == b""
+
+    gzipped = client.get("/activities", headers={"Accept-Encoding": "gzip"})
+    assert gzipped.headers["Content-Encoding"] == "gzip"
+    assert gzipped.json() == first.json()
+    assert "Content-Encoding" not in client.get("/activities", headers={"Accept-Encoding": "gzip;q=0"}).headers
+
+
+def test_etag_follows_content_not_version(client):
+    etag = client.get("/activities").headers["ETag"]
+    version = app_module.data_manager.data_version
+
+    # A reload bumps the version without changing the content: clients keep their copy
+    app_module.data_manager.refresh_activities()
+    assert app_module.data_manager.data_version > version
+    cached = client.get("/activities", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    # The client catches up with the new version without downloading the listing
+    assert cached.headers["X-Data-Version"] == str(app_module.data_manager.data_version)
+
+    app_module.data_manager.try_enroll("Mentoria 0", "Ana", "ana@example.com")
+    changed = client.get("/activities", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
@@ -0,0 +1,105 @@
+import pytest
+
+from .data_manager import DataManager, EnrollmentStatus
+from .storage import JSONStorage
+
+
+class CountingStorage(JSONStorage):
+    def __init__(self, data_dir):
+        super().__init__(data_dir)
+        self.writes = 0
+
+    def apply_changes(self, activities, changes):
+        self.writes += 1
+        super().apply_changes(activities, changes)
+
+
+def make_manager(tmp_path):
+    JSONStorage(tmp_path).save_activities({
+        "Monday": {"description": "", "schedule": "Mondays, 10:00 - 11:00", "max_participants": 2, "participants": []},
+        "Also Monday": {"description": "", "schedule": "Segundas-feiras, 19:00 - 20:00", "max_participants": 5, "participants": []},
+    })
+    storage = CountingStorage(tmp_path)
+    return DataManager(tmp_path, storage=storage), storage
+
+
+def test_bulk_enroll_validates_every_row_and_writes_once(tmp_path):
+    manager, storage = make_manager(tmp_path)
+
+    results = manager.bulk_enroll([
+        ("Monday", "Ana", "ana@example.com"),
+        ("Monday", "Ana", "ana@example.com"),
+        ("Also Monday", "Ana", "ana@example.com"),
+        ("Monday", "Bia", "bia@example.com"),
+        ("Monday", "Carla", "carla@example.com"),
+        ("Missing", "Dora", "dora@example.com"),
+        ("Monday", "", "eva@example.com"),
+    ])
+
+    assert [r.status for r in results] == [
+        EnrollmentStatus.OK,
+        EnrollmentStatus.ALREADY_REGISTERED,
+        EnrollmentStatus.SAME_DAY_CONFLICT,
+        EnrollmentStatus.OK,
+        EnrollmentStatus.ACTIVITY_FULL,
+        EnrollmentStatus.ACTIVITY_NOT_FOUND,
+        EnrollmentStatus.INVALID,
+    ]
+    assert storage.writes == 1
+    persisted = JSONStorage(tmp_path).load_activities()
+    assert [p["email"] for p in persisted["Monday"]["participants"]] == ["ana@example.com", "bia@example.com"]
+
+
+def test_import_activities_creates_and_upserts_in_one_write(tmp_path):
+    manager, storage = make_manager(tmp_path)
+
+    results = manager.import_activities({
+        "Monday": {"description": "Updated", "schedule": "Mondays, 10:00 - 11:00", "max_participants": 3},
+        "Friday": {"description": "", "schedule": "Fri 18:00-19:00", "max_participants": 10},
+    }, upsert=True)
+
+    assert results == {"Monday": ("updated", ""), "Friday": ("created", "")}
+    assert storage.writes == 1
+    persisted = JSONStorage(tmp_path).load_activities()
+    assert persisted["Monday"]["max_participants"] == 3
+    assert persisted["Friday"]["participants"] == []
+
+
+def test_import_enrolls_participants_through_the_signup_checks(tmp_path):
+    manager, storage = make_manager(tmp_path)
+    manager.try_enroll("Monday", "Dora", "dora@example.com")
+
+    results = manager.import_activities({
+        "Twice": {"description": "", "schedule": "Fridays, 10:00 - 11:00", "max_participants": 1,
+                  "participants": [{"name": "C", "email": "c@example.com"}, {"name": "C", "email": "c@example.com"}]},
+        "Full": {"description": "", "schedule": "Fridays, 12:00 - 13:00", "max_participants": 1,
+                 "participants": [{"name": "C", "email": "c@example.com"}, {"name": "D", "email": "d@example.com"}]},
+        "Same Day": {"description": "", "schedule": "Mondays, 18:00 - 19:00", "max_participants": 5,
+                     "participants": [{"name": "Dora", "email": "dora@example.com"}]},
+        "Ok": {"description": "", "schedule": "Fridays, 15:00 - 16:00", "max_participants": 2,
+               "participants": [{"name": "C", "email": "c@example.com"}]},
+    })
+
+    assert {name: status for name, (status, _) in results.items()} == {
+        "Twice": "rejected", "Full": "rejected", "Same Day": "rejected", "Ok": "created"
+    }
+    assert "same_day_conflict ('Monday')" in results["Same Day"][1]
+    persisted = JSONStorage(tmp_path).load_activities()
+    assert set(persisted) == {"Monday", "Also Monday", "Ok"}
+    assert manager.check_projection() == []
+
+
+def test_malformed_import_changes_nothing(tmp_path):
+    manager, storage = make_manager(tmp_path)
+    writes = storage.writes
+
+    with pytest.raises(ValueError):
+        manager.import_activities({
+            "Fine": {"description": "", "schedule": "Fridays, 10:00 - 11:00", "max_participants": 3},
+            "Broken": {"description": "", "schedule": "Fridays, 12:00 - 13:00", "max_participants": 3,
+                       "participants": [1, 2]},
+        })
+
+    assert "Fine" not in manager.get_activities() and storage.writes == writes
+    assert manager.try_enroll("Monday", "Ana", "ana@example.com").ok
+    assert manager.get_activity("Monday")["participants"] == [{"name": "Ana", "email": "ana@example.com"}]
@@ -0,0 +1,33 @@
+import pytest
+
+from .codec import available_codecs, get_codec
+from .records import Activity, ActivitiesView, ParticipantStore
+from .storage import JSONStorage
+
+ACTIVITIES = {
+    "Comunicação": {"description": "", "schedule": "Mondays, 10:00 - 11:00", "max_participants": 2,
+                    "participants": [{"name": "Ana", "email": "ana@example.com"}]},
+}
+
+
+@pytest.mark.parametrize("name", available_codecs())
+def test_codecs_round_trip_records_and_reject_invalid_json(name):
+    codec = get_codec(name)
+    store = ParticipantStore()
+    view = ActivitiesView({k: Activity.from_dict(v, store) for k, v in ACTIVITIES.items()}, store)
+
+    compact = codec.dumps(view)
+    assert "Comunicação".encode("utf-8") in compact and b"\n" not in compact
+    assert codec.loads(compact) == ACTIVITIES
+    assert codec.loads(codec.dumps(view, pretty=True)) == ACTIVITIES
+    with pytest.raises(ValueError):
+        codec.loads(b'["truncated", ')
+
+
+def test_storage_writes_compact_unless_pretty(tmp_path):
+    JSONStorage(tmp_path / "compact").save_activities(ACTIVITIES)
+    JSONStorage(tmp_path / "pretty", pretty=True).save_activities(ACTIVITIES)
+
+    assert b"\n" not in (tmp_path / "compact" / "activities.json").read_bytes()
+    assert (tmp_path / "pretty" / "activities.json").read_bytes().count(b"\n") > 5
+    assert JSONStorage(tmp_path / "pretty").load_activities() == ACTIVITIES
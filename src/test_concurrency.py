@@ -0,0 +1,194 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from .async_manager import AsyncDataManager
+from .data_manager import DataManager, EnrollmentStatus
+from .journal import JournaledStorage
+from .storage import JSONStorage, ShardedJSONStorage, SQLiteStorage
+
+SIGNUPS = 300
+CAPACITY = 5
+
+
+def make_storage(kind, data_dir):
+    if kind == "sqlite":
+        return SQLiteStorage(data_dir / "mentoria.db")
+    if kind == "journal":
+        return JournaledStorage(JSONStorage(data_dir), data_dir / "activities.journal")
+    if kind == "sharded":
+        return ShardedJSONStorage(data_dir)
+    return JSONStorage(data_dir)
+
+
+def seed(storage):
+    storage.save_activities({
+        "Stress Test": {
+            "description": "Concurrency stress test",
+            "schedule": "Sextas-feiras, 10:00 - 11:00",
+            "max_participants": CAPACITY,
+            "participants": []
+        }
+    })
+
+
+def signup_storm(managers):
+    """Fires SIGNUPS concurrent signups, spread across the given managers"""
+    def signup(i):
+        manager = managers[i % len(managers)]
+        return manager.try_enroll("Stress Test", f"Student {i}", f"student{i}@example.com").status
+
+    with ThreadPoolExecutor(max_workers=64) as pool:
+        return list(pool.map(signup, range(SIGNUPS)))
+
+
+@pytest.mark.parametrize("kind", ["json", "sqlite", "journal", "sharded"])
+def test_concurrent_signups_never_overbook(tmp_path, kind):
+    seed(make_storage(kind, tmp_path))
+    manager = DataManager(tmp_path, storage=make_storage(kind, tmp_path), multiprocess=False)
+
+    results = signup_storm([manager])
+
+    assert results.count(EnrollmentStatus.OK) == CAPACITY
+    assert results.count(EnrollmentStatus.ACTIVITY_FULL) == SIGNUPS - CAPACITY
+    persisted = make_storage(kind, tmp_path).load_activities()
+    assert len(persisted["Stress Test"]["participants"]) == CAPACITY
+
+
+@pytest.mark.parametrize("kind", ["json", "sqlite", "journal", "sharded"])
+def test_workers_sharing_data_dir_never_overbook(tmp_path, kind):
+    # Each manager has its own in-memory state, like separate uvicorn workers
+    seed(make_storage(kind, tmp_path))
+    workers = [
+        DataManager(tmp_path, storage=make_storage(kind, tmp_path), multiprocess=True)
+        for _ in range(3)
+    ]
+
+    results = signup_storm(workers)
+
+    assert results.count(EnrollmentStatus.OK) == CAPACITY
+    persisted = make_storage(kind, tmp_path).load_activities()
+    assert len(persisted["Stress Test"]["participants"]) == CAPACITY
+
+
+def test_snapshot_is_replaced_atomically(tmp_path):
+    storage = JSONStorage(tmp_path)
+    seed(storage)
+    manager = DataManager(tmp_path, storage=storage)
+
+    manager.try_enroll("Stress Test", "Ana", "ana@example.com")
+
+    # No temporary files are left behind and the file is always valid JSON
+    assert [p.name for p in tmp_path.glob("*.tmp")] == []
+    with open(tmp_path / "activities.json", encoding="utf-8") as f:
+        assert json.load(f)["Stress Test"]["participants"] == [{"name": "Ana", "email": "ana@example.com"}]
+
+
+def test_async_writer_coalesces_without_overbooking(tmp_path):
+    seed(JSONStorage(tmp_path))
+    store = AsyncDataManager(DataManager(tmp_path, storage=JSONStorage(tmp_path), multiprocess=False))
+
+    async def storm():
+        results = await asyncio.gather(*(
+            store.enroll("Stress Test", f"Student {i}", f"student{i}@example.com") for i in range(SIGNUPS)
+        ))
+        await store.close()
+        return [r.status for r in results]
+
+    results = asyncio.run(storm())
+
+    assert results.count(EnrollmentStatus.OK) == CAPACITY
+    assert store.writer_stats()["batches"] < SIGNUPS
+    persisted = JSONStorage(tmp_path).load_activities()
+    assert len(persisted["Stress Test"]["participants"]) == CAPACITY
+
+
+class FailingStorage(JSONStorage):
+    """JSONStorage whose next batch fails, like a full disk"""
+    fail = False
+
+    def apply_changes(self, activities, changes):
+        if self.fail:
+            self.fail = False
+            raise OSError("No space left on device")
+        super().apply_changes(activities, changes)
+
+
+def test_failed_batch_write_restores_the_persisted_state(tmp_path):
+    seed(JSONStorage(tmp_path))
+    storage = FailingStorage(tmp_path)
+    manager = DataManager(tmp_path, storage=storage, multiprocess=False)
+    store = AsyncDataManager(manager)
+    manager.load_activities()
+
+    async def burst():
+        storage.fail = True
+        results = await asyncio.gather(*(
+            store.enroll("Stress Test", f"Student {i}", f"student{i}@example.com") for i in range(3)
+        ), return_exceptions=True)
+        await store.close()
+        return results
+
+    assert all(isinstance(result, OSError) for result in asyncio.run(burst()))
+    assert manager.get_activities(revalidate=False)["Stress Test"]["participants"] == []
+    assert not manager.is_participant_registered("Stress Test", "student0@example.com")
+    assert manager.try_enroll("Stress Test", "Student 0", "student0@example.com").ok
+
+
+def test_sharded_storage_rewrites_only_touched_activities(tmp_path):
+    seed(ShardedJSONStorage(tmp_path))
+    manager = DataManager(tmp_path, storage=ShardedJSONStorage(tmp_path), multiprocess=False)
+    manager.create_activity("Other", {"description": "", "schedule": "Mondays, 10:00", "max_participants": 3})
+    def inodes():
+        return {path.name.split("-")[0]: path.stat().st_ino for path in (tmp_path / "activities").glob("*.json")}
+    before = inodes()
+
+    manager.try_enroll("Other", "Ana", "ana@example.com")
+    enrolled = inodes()
+    assert enrolled["other"] != before["other"]
+    assert enrolled["stress"] == before["stress"] and enrolled["manifest.json"] == before["manifest.json"]
+
+    manager.delete_activity("Stress Test")
+    assert "stress" not in inodes()
+    assert list(ShardedJSONStorage(tmp_path).load_activities()) == ["Other"]
+
+
+def test_journal_compaction_rewrites_only_touched_shards(tmp_path):
+    ShardedJSONStorage(tmp_path).save_activities({
+        "Stress Test": {"description": "", "schedule": "Fridays, 10:00", "max_participants": 3, "participants": []},
+        "Other": {"description": "", "schedule": "Mondays, 10:00", "max_participants": 3, "participants": []}
+    })
+    storage = JournaledStorage(ShardedJSONStorage(tmp_path), tmp_path / "activities.journal")
+    manager = DataManager(tmp_path, storage=storage, multiprocess=False)
+    stress = next((tmp_path / "activities").glob("stress-*.json")).stat().st_ino
+
+    manager.try_enroll("Other", "Ana", "ana@example.com")
+    storage.compact()
+
+    assert next((tmp_path / "activities").glob("stress-*.json")).stat().st_ino == stress
+    persisted = ShardedJSONStorage(tmp_path).load_activities()
+    assert persisted["Other"]["participants"] == [{"name": "Ana", "email": "ana@example.com"}]
+    assert persisted["Stress Test"]["participants"] == []
+
+
+def test_own_compaction_does_not_trigger_a_reload(tmp_path):
+    seed(JSONStorage(tmp_path))
+    storage = JournaledStorage(JSONStorage(tmp_path), tmp_path / "activities.journal")
+    manager = DataManager(tmp_path, storage=storage, multiprocess=False)
+    manager.load_activities()
+    events = []
+    manager.subscribe(lambda event: events.append(event["type"]))
+
+    manager.try_enroll("Stress Test", "Ana", "ana@example.com")
+    storage.compact()
+    manager.get_activities()
+    assert manager.cache_stats()["reloads"] == 0 and events == ["enrolled"]
+
+    # A write by another process after the compaction is still noticed
+    other = JournaledStorage(JSONStorage(tmp_path), tmp_path / "activities.journal")
+    DataManager(tmp_path, storage=other, multiprocess=False).try_enroll("Stress Test", "Bia", "bia@example.com")
+    other.close()
+    assert len(manager.get_activities()["Stress Test"]["participants"]) == 2
+    storage.close()
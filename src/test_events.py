@@ -0,0 +1,86 @@
+import asyncio
+import json
+import threading
+
+from .data_manager import MAX_EVENTS_PER_BATCH, DataManager
+from .events import EventBroadcaster
+from .storage import JSONStorage
+
+
+def parse(message: bytes) -> dict:
+    data = next(line for line in message.decode("utf-8").splitlines() if line.startswith("data: "))
+    return json.loads(data[len("data: "):])
+
+
+async def subscribe(broadcaster: EventBroadcaster):
+    """Opens a stream and consumes the retry hint and the hello event"""
+    stream = broadcaster.stream({"type": "hello", "version": 0})
+    assert await anext(stream) == b"retry: 3000\n\n"
+    assert parse(await anext(stream))["type"] == "hello"
+    return stream
+
+
+def test_slow_client_gets_a_single_resync():
+    async def scenario():
+        broadcaster = EventBroadcaster(queue_size=2)
+        stream = await subscribe(broadcaster)
+        for version in range(1, 5):
+            broadcaster.publish({"type": "enrolled", "version": version})
+        received = [parse(await anext(stream)) for _ in range(2)]
+        await stream.aclose()
+        return received
+
+    # The third event overflowed the queue: events 1-3 became one resync, then event 4 fit
+    assert asyncio.run(scenario()) == [{"type": "resync"}, {"type": "enrolled", "version": 4}]
+
+
+def test_publish_from_another_thread():
+    async def scenario():
+        broadcaster = EventBroadcaster()
+        stream = await subscribe(broadcaster)
+        publisher = threading.Thread(target=broadcaster.publish, args=({"type": "canceled", "version": 7},))
+        publisher.start()
+        publisher.join()
+        event = parse(await asyncio.wait_for(anext(stream), timeout=1))
+        await stream.aclose()
+        return event
+
+    assert asyncio.run(scenario()) == {"type": "canceled", "version": 7}
+
+
+def test_disconnect_unsubscribes():
+    async def scenario():
+        broadcaster = EventBroadcaster()
+        stream = await subscribe(broadcaster)
+        subscribed = broadcaster.subscriber_count
+        await stream.aclose()
+        # Nothing left to deliver to: publishing is a no-op
+        broadcaster.publish({"type": "deleted", "version": 1})
+        return subscribed, broadcaster.subscriber_count
+
+    assert asyncio.run(scenario()) == (1, 0)
+
+
+def test_batched_events_carry_the_count_after_each_change(tmp_path):
+    storage = JSONStorage(tmp_path)
+    storage.save_activities({
+        f"Room {i}": {"description": "", "schedule": f"Mondays, {8 + i % 10}:00", "max_participants": 50,
+                      "participants": []}
+        for i in range(MAX_EVENTS_PER_BATCH + 1)
+    })
+    manager = DataManager(tmp_path, storage=storage, multiprocess=False)
+    manager.load_activities()
+    events = []
+    manager.subscribe(events.append)
+
+    # One writer batch with 40 signups to the same activity and a cancellation in the middle
+    signups = [("enroll", ("Room 0", f"S{i}", f"s{i}@example.com")) for i in range(40)]
+    manager.apply_mutations(signups[:20] + [("cancel", ("Room 0", "s0@example.com"))] + signups[20:])
+    counts = [event["participants_count"] for event in events]
+    assert counts == list(range(1, 21)) + [19] + list(range(20, 40))
+
+    # Past the limit of distinct activities the batch becomes a single resync
+    events.clear()
+    manager.apply_mutations([("enroll", (f"Room {i}", "Ana", f"ana{i}@example.com"))
+                             for i in range(MAX_EVENTS_PER_BATCH + 1)])
+    assert [event["type"] for event in events] == ["resync"]
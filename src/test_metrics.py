@@ -0,0 +1,69 @@
+import threading
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from .metrics import MetricsMiddleware, MetricsRegistry, SamplingProfiler, REGISTRY
+
+
+def test_registry_renders_prometheus_text():
+    registry = MetricsRegistry()
+    requests = registry.counter("test_requests_total", "Requests", ["route"])
+    latency = registry.histogram("test_latency_seconds", "Latency", buckets=(0.1, 1.0))
+    requests.labels(route='/a"b').inc()
+    requests.labels(route='/a"b').inc(2)
+    latency.observe(0.05)
+    latency.observe(0.5)
+    registry.register_collector(lambda: [("test_gauge", "gauge", "Gauge", {(("kind", "x"),): 7})])
+
+    lines = registry.render().splitlines()
+    assert "# TYPE test_requests_total counter" in lines
+    assert 'test_requests_total{route="/a\\"b"} 3.0' in lines
+    assert 'test_latency_seconds_bucket{le="0.1"} 1' in lines
+    assert 'test_latency_seconds_bucket{le="+Inf"} 2' in lines
+    assert "test_latency_seconds_count 2" in lines
+    assert 'test_gauge{kind="x"} 7' in lines
+
+
+def test_middleware_labels_by_route_template():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: str):
+        return {"id": item_id}
+
+    client = TestClient(app)
+    for item_id in ("a", "b", "c"):
+        assert client.get(f"/items/{item_id}").status_code == 200
+    client.get("/missing")
+
+    text = REGISTRY.render()
+    assert 'mentoria_http_request_duration_seconds_count{method="GET",route="/items/{item_id}",status="200"} 3' in text
+    assert 'route="<unmatched>",status="404"' in text
+
+
+def test_profiler_attributes_samples_to_routes():
+    def endpoint():
+        deadline = time.monotonic() + 0.2
+        while time.monotonic() < deadline:
+            pass
+
+    class Route:
+        path = "/busy"
+        methods = {"GET"}
+
+    route = Route()
+    route.endpoint = endpoint
+    profiler = SamplingProfiler(interval=0.001)
+    profiler.register_routes([route])
+    profiler.start()
+    worker = threading.Thread(target=endpoint)
+    worker.start()
+    worker.join()
+    profiler.stop()
+
+    folded = profiler.folded()
+    assert "GET /busy" in folded
+    assert "endpoint (test_metrics.py)" in folded["GET /busy"]
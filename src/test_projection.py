@@ -0,0 +1,41 @@
+from .data_manager import DataManager
+from .storage import JSONStorage
+
+ACTIVITIES = {
+    "Monday": {"description": "", "schedule": "Mondays, 10:00 - 11:00", "max_participants": 1,
+               "participants": [{"name": "Ana", "email": "ana@example.com"}]},
+    "Tuesday": {"description": "", "schedule": "Tuesdays, 10:00 - 11:00", "max_participants": 5, "participants": []},
+}
+
+
+def test_projection_stays_consistent_through_mutations(tmp_path):
+    JSONStorage(tmp_path).save_activities(ACTIVITIES)
+    manager = DataManager(tmp_path, storage=JSONStorage(tmp_path), multiprocess=False)
+
+    manager.try_enroll("Tuesday", "Ana", "ana@example.com")
+    manager.join_waitlist("Monday", "Bia", "bia@example.com")
+    manager.try_cancel("Monday", "ana@example.com")  # promotes Bia
+    manager.update_activity("Tuesday", {"schedule": "Mondays, 18:00 - 19:00"})
+    manager.import_activities({"Friday": {"description": "", "schedule": "Fridays, 9:00 - 10:00",
+                                          "max_participants": 2,
+                                          "participants": [{"name": "Ana", "email": "ana@example.com"}]}})
+    manager.delete_activity("Monday")
+
+    assert manager.get_participant_activities_by_day("ana@example.com") == {"segunda": ["Tuesday"], "sexta": ["Friday"]}
+    assert manager.check_projection() == []
+    assert manager.check_projection(JSONStorage(tmp_path).load_activities()) == []
+
+    # Drift between the projection and the primary data is reported
+    manager._enrollments["ana@example.com"].pop("Friday")
+    assert manager.check_projection() == ["ana@example.com: projection ['Tuesday'] != data ['Friday', 'Tuesday']"]
+
+
+def test_duplicate_enrollments_are_reported(tmp_path):
+    JSONStorage(tmp_path).save_activities(ACTIVITIES)
+    manager = DataManager(tmp_path, storage=JSONStorage(tmp_path), multiprocess=False)
+    manager.load_activities()
+    monday = manager._activities["Monday"]
+    monday.participants.append(monday.participants[0])
+
+    assert manager.check_projection() == ["Monday: ana@example.com enrolled 2 times"]
+    assert manager.projection_problems == 1
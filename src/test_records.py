@@ -0,0 +1,53 @@
+import json
+
+import pytest
+
+from .data_manager import DataManager
+from .records import Activity, ActivitiesView, ParticipantStore, to_jsonable
+from .storage import JSONStorage
+
+
+def test_records_round_trip_to_the_dict_format():
+    data = {
+        "Chess": {"description": "d", "schedule": "Mondays, 10:00 - 11:00", "max_participants": 2, "room": "B",
+                  "participants": [{"name": "Ana", "email": "ana@example.com"}, "legacy@example.com"],
+                  "waitlist": [{"name": "Ana B.", "email": "ana@example.com"}]},
+        "Drama": {"description": "", "schedule": "Fridays, 10:00 - 11:00", "max_participants": 5,
+                  "participants": [{"name": "Ana", "email": "ana@example.com"}]},
+    }
+    store = ParticipantStore()
+    activities = {name: Activity.from_dict(activity, store) for name, activity in data.items()}
+
+    # Same (name, email) shares one ID; a different name for the same email keeps its own
+    assert activities["Chess"].participants[0] == activities["Drama"].participants[0]
+    assert activities["Chess"].waitlist[0] != activities["Chess"].participants[0]
+    assert len(store) == 3
+
+    view = ActivitiesView(activities, store)
+    assert view["Chess"] == {**data["Chess"], "participants": [
+        {"name": "Ana", "email": "ana@example.com"},
+        {"name": "legacy@example.com", "email": "legacy@example.com"}
+    ]}
+    # Empty waitlists are left out of the files; the public listing only shows the count
+    assert "waitlist" not in json.loads(json.dumps(view, default=to_jsonable))["Drama"]
+    assert activities["Chess"].to_public_dict(store)["waitlist_count"] == 1
+    assert "waitlist" not in activities["Chess"].to_public_dict(store)
+
+
+def test_rejected_participant_leaves_the_store_aligned():
+    store = ParticipantStore()
+    with pytest.raises(TypeError):
+        store.intern(1, 2)
+    pid = store.intern("Ana", "ana@example.com")
+    assert store.to_dict(pid) == {"name": "Ana", "email": "ana@example.com"}
+
+
+def test_refresh_returns_the_dict_view(tmp_path):
+    storage = JSONStorage(tmp_path)
+    storage.save_activities({"Chess": {"description": "d", "schedule": "Mondays, 10:00 - 11:00", "max_participants": 2,
+                                       "participants": [{"name": "Ana", "email": "ana@example.com"}]}})
+    manager = DataManager(storage=storage, multiprocess=False)
+
+    refreshed = manager.refresh_activities()
+    assert refreshed["Chess"]["participants"] == [{"name": "Ana", "email": "ana@example.com"}]
+    assert refreshed is manager.load_activities()
@@ -0,0 +1,46 @@
+import pytest
+
+from .data_manager import DataManager, EnrollmentStatus
+from .schedule import ScheduleIndex, Slot, Weekday, parse_schedule
+from .storage import JSONStorage
+
+
+@pytest.mark.parametrize("schedule, expected", [
+    ("Quartas-feiras, 19:00 - 20:30", Slot(Weekday.WEDNESDAY, 1140, 1230)),
+    ("Mondays das 17:00 às 19:30", Slot(Weekday.MONDAY, 1020, 1170)),
+    ("Sábado 9h-11h30", Slot(Weekday.SATURDAY, 540, 690)),
+    ("Fri 7pm - 8:30pm", Slot(Weekday.FRIDAY, 1140, 1230)),
+    ("segunda-feira", Slot(Weekday.MONDAY, 0, 1440)),
+    ("A combinar, 19:00", None),
+])
+def test_parse_schedule(schedule, expected):
+    assert parse_schedule(schedule) == expected
+
+
+def test_schedule_index_overlap():
+    index = ScheduleIndex()
+    index.add("Morning", Slot(Weekday.MONDAY, 540, 600))
+    index.add("Evening", Slot(Weekday.MONDAY, 1140, 1230))
+    index.add("Other day", Slot(Weekday.TUESDAY, 1140, 1230))
+
+    assert index.overlapping(Slot(Weekday.MONDAY, 1200, 1260)) == ["Evening"]
+    assert index.overlapping(Slot(Weekday.MONDAY, 600, 1140)) == []
+    index.remove("Evening", Slot(Weekday.MONDAY, 1140, 1230))
+    assert index.on_day(Weekday.MONDAY) == ["Morning"]
+
+
+def test_same_day_rule_applies_to_english_schedules(tmp_path):
+    JSONStorage(tmp_path).save_activities({
+        name: {"description": "", "schedule": schedule, "max_participants": 5, "participants": []}
+        for name, schedule in [
+            ("CVs", "Mondays das 17:00 às 19:30"),
+            ("Interviews", "Segundas-feiras, 20:00 - 21:00"),
+        ]
+    })
+    manager = DataManager(tmp_path, storage=JSONStorage(tmp_path))
+
+    assert manager.try_enroll("CVs", "Ana", "ana@example.com").ok
+    result = manager.try_enroll("Interviews", "Ana", "ana@example.com")
+
+    assert result.status is EnrollmentStatus.SAME_DAY_CONFLICT
+    assert result.conflicting_activity == "CVs"
@@ -0,0 +1,49 @@
+import pytest
+
+from .sessions import SessionSigner, load_secret
+from .users import UserDirectory
+
+USERS = {
+    "profiles": {
+        "coordenadora": {"name": "Admin", "permissions": ["create", "read", "delete"]},
+        "participante": {"name": "Student", "permissions": ["read", "self_manage"]}
+    },
+    "users": {
+        "coordenadora": {"name": "Maria", "email": "maria@example.com", "profile": "coordenadora"},
+        "participante": {"name": "Larissa", "email": "larissa@example.com", "profile": "participante"}
+    },
+    "current_user": {"name": "Larissa", "email": "larissa@example.com", "profile": "participante"}
+}
+
+
+def test_session_tokens_are_signed():
+    signer = SessionSigner(b"secret")
+    token = signer.sign("coordenadora")
+
+    assert signer.unsign(token) == "coordenadora"
+    assert SessionSigner(b"other secret").unsign(token) is None
+    payload, _, signature = token.partition(".")
+    assert signer.unsign(payload[:-1] + "A." + signature) is None
+    assert SessionSigner(b"secret", max_age=-1).unsign(token) is None
+
+
+def test_multiprocess_requires_a_secret_key(monkeypatch):
+    monkeypatch.delenv("MENTORIA_SECRET_KEY", raising=False)
+    assert len(load_secret()) == 32
+    with pytest.raises(ValueError):
+        load_secret(multiprocess=True)
+
+    monkeypatch.setenv("MENTORIA_SECRET_KEY", "shared")
+    assert load_secret(multiprocess=True) == b"shared"
+
+
+def test_directory_resolves_identity_per_user():
+    directory = UserDirectory.from_data(USERS)
+
+    admin = directory.identity("coordenadora")
+    assert admin.permissions == frozenset({"create", "read", "delete"})
+    assert admin.has_permission("delete")
+    # Without a (valid) session, the user from the file's current_user is used
+    assert directory.identity(None).key == "participante"
+    assert directory.identity("unknown").permissions == frozenset({"read", "self_manage"})
+    assert directory.user_key_for_profile("missing") is None
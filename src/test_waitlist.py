@@ -0,0 +1,76 @@
+from .data_manager import DataManager, EnrollmentStatus
+from .journal import JournaledStorage
+from .storage import JSONStorage, SQLiteStorage
+
+ACTIVITIES = {
+    "Monday": {"description": "", "schedule": "Mondays, 10:00 - 11:00", "max_participants": 1,
+               "participants": [{"name": "Ana", "email": "ana@example.com"}]},
+    "Monday Evening": {"description": "", "schedule": "Mondays, 19:00 - 20:00", "max_participants": 5,
+                       "participants": [{"name": "Bia", "email": "bia@example.com"}]},
+}
+
+
+def make_manager(storage):
+    storage.save_activities(ACTIVITIES)
+    return DataManager(storage=storage, multiprocess=False)
+
+
+def test_cancel_promotes_first_eligible_waiter(tmp_path):
+    manager = make_manager(JSONStorage(tmp_path))
+
+    assert manager.join_waitlist("Monday", "Bia", "bia@example.com").status is EnrollmentStatus.SAME_DAY_CONFLICT
+    assert manager.join_waitlist("Monday", "Carla", "carla@example.com").position == 1
+    assert manager.join_waitlist("Monday", "Dora", "dora@example.com").position == 2
+    assert manager.join_waitlist("Monday", "Dora", "dora@example.com").status is EnrollmentStatus.ALREADY_WAITLISTED
+    # Carla gets a same-day activity meanwhile: Dora is promoted, Carla keeps her place
+    assert manager.try_enroll("Monday Evening", "Carla", "carla@example.com").ok
+
+    assert manager.try_cancel("Monday", "ana@example.com").ok
+
+    persisted = JSONStorage(tmp_path).load_activities()["Monday"]
+    assert [p["email"] for p in persisted["participants"]] == ["dora@example.com"]
+    assert [w["email"] for w in persisted["waitlist"]] == ["carla@example.com"]
+    assert manager.get_waitlist_position("Monday", "carla@example.com") == 1
+
+
+def test_capacity_growth_promotes_in_order(tmp_path):
+    manager = make_manager(SQLiteStorage(tmp_path / "mentoria.db"))
+    for i in range(3):
+        manager.join_waitlist("Monday", f"W{i}", f"w{i}@example.com")
+    assert manager.leave_waitlist("Monday", "w1@example.com").ok
+
+    manager.update_activity("Monday", {"max_participants": 2})
+
+    reloaded = DataManager(storage=SQLiteStorage(tmp_path / "mentoria.db"), multiprocess=False)
+    monday = reloaded.get_activity("Monday")
+    assert [p["email"] for p in monday["participants"]] == ["ana@example.com", "w0@example.com"]
+    assert [w["email"] for w in monday["waitlist"]] == ["w2@example.com"]
+
+
+def test_waitlist_survives_journal_replay(tmp_path):
+    storage = JournaledStorage(JSONStorage(tmp_path), tmp_path / "activities.journal")
+    manager = make_manager(storage)
+    manager.join_waitlist("Monday", "Carla", "carla@example.com")
+    manager.join_waitlist("Monday", "Dora", "dora@example.com")
+    manager.try_cancel("Monday", "ana@example.com")
+    storage.close()
+
+    replayed = JournaledStorage(JSONStorage(tmp_path), tmp_path / "activities.journal").load_activities()
+    assert [p["email"] for p in replayed["Monday"]["participants"]] == ["carla@example.com"]
+    assert [w["email"] for w in replayed["Monday"]["waitlist"]] == ["dora@example.com"]
+
+
+
+def test_bulk_signup_takes_waiter_off_the_queue(tmp_path):
+    manager = make_manager(JSONStorage(tmp_path))
+    manager.join_waitlist("Monday", "Carla", "carla@example.com")
+    manager.try_enroll("Monday Evening", "Carla", "carla@example.com")
+    manager.try_cancel("Monday", "ana@example.com")  # Carla is skipped: the seat stays free
+    manager.try_cancel("Monday Evening", "carla@example.com")
+
+    assert manager.bulk_enroll([("Monday", "Carla", "carla@example.com")])[0].ok
+    assert manager.get_waitlist_position("Monday", "carla@example.com") == 0
+
+    manager.update_activity("Monday", {"max_participants": 5})
+    assert [p["email"] for p in manager.get_activity("Monday")["participants"]] == ["carla@example.com"]
+    assert "waitlist" not in manager.get_activity("Monday")
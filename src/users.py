@@ -0,0 +1,64 @@
+from types import MappingProxyType
+from typing import Dict, Any, FrozenSet, Mapping, NamedTuple
+
+# Permissões de quem tem um perfil desconhecido
+DEFAULT_PERMISSIONS: FrozenSet[str] = frozenset({"read"})
+
+
+class Identity(NamedTuple):
+    """Usuário de uma requisição e suas permissões"""
+    key: str | None
+    user: Mapping[str, Any]
+    permissions: FrozenSet[str]
+
+    def has_permission(self, permission: str) -> bool:
+        return permission in self.permissions
+
+
+class UserDirectory(NamedTuple):
+    """Usuários e perfis carregados uma única vez, com a tabela de permissões pré-calculada
+
+    Imutável: os mapeamentos são somente leitura e as permissões de cada perfil são
+    um frozenset, então a checagem de permissão é uma consulta O(1) sem I/O e a
+    mesma instância pode ser compartilhada entre requisições concorrentes.
+    """
+    profiles: Mapping[str, Mapping[str, Any]]
+    users: Mapping[str, Mapping[str, Any]]
+    permissions: Mapping[str, FrozenSet[str]]
+    default_key: str | None
+
+    @classmethod
+    def from_data(cls, users_data: Dict[str, Any]) -> "UserDirectory":
+        profiles = {
+            name: MappingProxyType(dict(profile))
+            for name, profile in users_data.get("profiles", {}).items()
+        }
+        users = {key: MappingProxyType(dict(user)) for key, user in users_data.get("users", {}).items()}
+        permissions = {
+            name: frozenset(profile.get("permissions", DEFAULT_PERMISSIONS))
+            for name, profile in profiles.items()
+        }
+        # O antigo "current_user" do arquivo passa a ser só a identidade de quem não tem sessão
+        default = users_data.get("current_user", {})
+        default_key = next(
+            (key for key, user in users.items() if user.get("email") == default.get("email")),
+            None
+        )
+        if default_key is None and default:
+            users["_default"] = MappingProxyType(dict(default))
+            default_key = "_default"
+        return cls(MappingProxyType(profiles), MappingProxyType(users), MappingProxyType(permissions), default_key)
+
+    def identity(self, key: str | None = None) -> Identity:
+        """Identidade do usuário `key` (ou a padrão, se a chave for desconhecida)"""
+        if key not in self.users:
+            key = self.default_key
+        user = self.users.get(key, MappingProxyType({}))
+        profile = user.get("profile", "participant")
+        return Identity(key, user, self.permissions.get(profile, DEFAULT_PERMISSIONS))
+
+    def user_key_for_profile(self, profile_name: str) -> str | None:
+        """Usuário de demonstração associado a um perfil (None se o perfil não existe)"""
+        if profile_name in self.profiles and profile_name in self.users:
+            return profile_name
+        return None